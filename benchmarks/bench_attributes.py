@@ -0,0 +1,48 @@
+#!/usr/bin/env python
+"""
+Measure the cost of reading a resource object's fields as attributes, as
+items, and directly from its ``fields`` dictionary (which is what attribute
+access amounted to before fields were converted lazily).  ``.extra`` is a
+field that the resource class doesn't document and so is looked up via
+``Resource.__getattr__`` instead of a descriptor.
+
+Usage: python benchmarks/bench_attributes.py [count]
+"""
+
+from   __future__ import print_function
+import sys
+import timeit
+from   doapi      import doapi
+
+DROPLET = {
+    "id": 3164494,
+    "name": "example.com",
+    "memory": 512,
+    "extra": 1,
+    "status": "active",
+    "created_at": "2014-11-14T16:36:31Z",
+    "region": {"slug": "nyc3", "name": "New York 3", "available": True,
+               "sizes": ["512mb", "1gb"], "features": ["private_networking"]},
+    "size": {"slug": "512mb", "memory": 512, "vcpus": 1, "disk": 20,
+             "regions": ["nyc3"]},
+}
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    drop = doapi('')._droplet(DROPLET)
+    # Convert the nested fields up front so that only lookups are measured
+    drop.created_at, drop.region, drop.size  # pylint: disable=pointless-statement
+    for label, stmt in [
+        ('fields["memory"]', lambda: drop.fields["memory"]),
+        ('["memory"]', lambda: drop["memory"]),
+        ('.memory', lambda: drop.memory),
+        ('.extra', lambda: drop.extra),
+        ('.created_at', lambda: drop.created_at),
+        ('.region', lambda: drop.region),
+    ]:
+        best = min(timeit.repeat(stmt, repeat=3, number=count))
+        print('{0:<18} {1:8.3f} s  ({2:.0f} ns/access)'
+              .format(label, best, best / count * 1e9))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+"""
+Measure the time taken to construct droplet objects from freshly-decoded API
+responses, with and without a `doapi` manager (which shares the droplets'
+nested region & size lists), and the memory the droplets occupy afterwards
+
+Usage: python benchmarks/bench_construction.py [count]
+"""
+
+from   __future__ import print_function
+import json
+import sys
+import timeit
+import tracemalloc
+from   doapi      import Droplet, doapi
+
+SIZES = ["512mb", "1gb", "2gb", "4gb", "8gb", "16gb", "32gb", "48gb", "64gb"]
+
+DROPLET = {
+    "id": 3164494,
+    "name": "example.com",
+    "memory": 512,
+    "status": "active",
+    "created_at": "2014-11-14T16:36:31Z",
+    "region": {"slug": "nyc3", "name": "New York 3", "available": True,
+               "sizes": SIZES,
+               "features": ["private_networking", "backups", "ipv6",
+                            "metadata", "install_agent"]},
+    "size": {"slug": "512mb", "memory": 512, "vcpus": 1, "disk": 20,
+             "transfer": 1.0, "price_monthly": 5.0, "price_hourly": 0.00744,
+             "regions": ["ams2", "ams3", "blr1", "fra1", "lon1", "nyc1",
+                         "nyc2", "nyc3", "sfo1", "sfo2", "sgp1", "tor1"]},
+}
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    page = json.dumps([dict(DROPLET, id=i) for i in range(count)])
+    for label, build in [
+        ('no manager', lambda objs: [Droplet(o) for o in objs]),
+        ('manager', lambda objs: [api._droplet(o) for o in objs]),
+    ]:
+        api = doapi('')
+        best = min(timeit.repeat(lambda: build(json.loads(page)), repeat=3,
+                                 number=1))
+        decode = min(timeit.repeat(lambda: json.loads(page), repeat=3,
+                                   number=1))
+        api = doapi('')
+        tracemalloc.start()
+        drops = build(json.loads(page))
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del drops
+        print('{0:<12} {1:6.2f} us/droplet  {2:6.0f} bytes/droplet'
+              .format(label, (best - decode) / count * 1e6, size / count))
+
+if __name__ == '__main__':
+    main()
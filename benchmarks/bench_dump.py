@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+"""
+Compare the speed of the command-line client's streaming JSON output
+(`doapi.cli._util.dump`) against the previous implementation, which re-indented
+each element with a regex and flushed after every element
+
+Usage: python benchmarks/bench_dump.py [count]
+"""
+
+from   __future__ import print_function
+import io
+import os
+import re
+import sys
+import timeit
+from   doapi           import _codec
+from   doapi.cli._util import dump
+
+def old_dump(objs, fp):
+    fp.write('[')
+    first = True
+    for o in objs:
+        if first:
+            fp.write('\n')
+            first = False
+        else:
+            fp.write(',\n')
+        s = _codec.dumps_pretty(o)
+        fp.write(re.sub(r'^', '    ', s, flags=re.M))
+        fp.flush()
+    if not first:
+        fp.write('\n')
+    fp.write(']\n')
+
+def make_action(i):
+    return {
+        "id": 100000000 + i,
+        "status": "completed",
+        "type": "power_cycle",
+        "started_at": "2016-05-01T12:00:00Z",
+        "completed_at": "2016-05-01T12:00:25Z",
+        "resource_id": 3000000 + i,
+        "resource_type": "droplet",
+        "region": {
+            "name": "New York 1",
+            "slug": "nyc1",
+            "sizes": ["512mb", "1gb", "2gb"],
+            "features": ["private_networking", "backups", "ipv6"],
+            "available": True,
+        },
+        "region_slug": "nyc1",
+    }
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    actions = [make_action(i) for i in range(count)]
+    a, b = io.StringIO(), io.StringIO()
+    old_dump(iter(actions), a)
+    dump(iter(actions), fp=b)
+    assert a.getvalue() == b.getvalue()
+    print('JSON backend:', _codec.backend)
+    with io.open(os.devnull, 'w') as fp:
+        for name, func in [('old dump', old_dump), ('dump', dump)]:
+            best = min(timeit.repeat(lambda: func(iter(actions), fp=fp),
+                                     repeat=3, number=1))
+            print('{0:<10} {1:8.3f} s  ({2:.2f} us/object)'
+                  .format(name, best, best / count * 1e6))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,30 @@
+#!/usr/bin/env python
+"""
+Compare the speed of `doapi.base.fromISO8601` against `pyrfc3339.parse` on
+timestamps of the form returned by the DigitalOcean API
+
+Usage: python benchmarks/bench_timestamps.py [count]
+"""
+
+from   __future__ import print_function
+from   datetime   import datetime, timedelta
+import sys
+import timeit
+import pyrfc3339
+from   doapi.base import fromISO8601
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    start = datetime(2016, 1, 1)
+    stamps = [(start + timedelta(seconds=37*i)).strftime('%Y-%m-%dT%H:%M:%SZ')
+              for i in range(count)]
+    assert all(fromISO8601(s) == pyrfc3339.parse(s) for s in stamps[:1000])
+    for name, func in [('pyrfc3339.parse', pyrfc3339.parse),
+                       ('fromISO8601', fromISO8601)]:
+        best = min(timeit.repeat(lambda: [func(s) for s in stamps],
+                                 repeat=3, number=1))
+        print('{0:<16} {1:8.3f} s  ({2:.2f} us/timestamp)'
+              .format(name, best, best / count * 1e6))
+
+if __name__ == '__main__':
+    main()
@@ -2,11 +2,16 @@ from .base        import (DOEncoder, Resource, Region, Size, Account, Kernel,
                           Networks, NetworkInterface, BackupWindow, DOAPIError,
                           WaitTimeoutError)
 from .action      import Action, ActionError
+from .bulk        import BulkItem, BulkResult
 from .doapi       import doapi
 from .domain      import Domain, DomainRecord
 from .droplet     import Droplet
 from .floating_ip import FloatingIP
 from .image       import Image
+from .poller      import ActionPoller
+from .polling     import ActionStats, PollSchedule
+from .ratelimit   import RateLimiter
+from .retry       import RetryPolicy
 from .ssh_key     import SSHKey
 from .tag         import Tag
 
@@ -21,7 +26,11 @@ __all__ = [
     'Account',
     'Action',
     'ActionError',
+    'ActionPoller',
+    'ActionStats',
     'BackupWindow',
+    'BulkItem',
+    'BulkResult',
     'DOAPIError',
     'DOEncoder',
     'Domain',
@@ -32,8 +41,11 @@ __all__ = [
     'Kernel',
     'NetworkInterface',
     'Networks',
+    'PollSchedule',
+    'RateLimiter',
     'Region',
     'Resource',
+    'RetryPolicy',
     'SSHKey',
     'Size',
     'Tag',
@@ -0,0 +1,124 @@
+"""
+JSON encoding & decoding for API requests and command-line output.  The
+fastest available backend is used: orjson_ if installed, else ujson_, else the
+standard library's `json` module.  A specific backend can be selected by
+setting the :envvar:`DOAPI_JSON` environment variable to ``orjson``,
+``ujson``, or ``json`` or by calling `use`.
+
+Whatever the backend, values are encoded with the same semantics as
+`DOEncoder`: resource objects (and anything else with a ``for_json`` method)
+are converted with ``for_json``, `datetime.datetime` values are converted to
+ISO 8601 timestamps, and iterators are converted to lists.
+
+.. _orjson: https://github.com/ijl/orjson
+.. _ujson: https://github.com/ultrajson/ultrajson
+"""
+
+from   datetime import datetime
+import json
+import os
+from   .base    import DOEncoder, for_json
+
+try:
+    from collections.abc import Iterator
+except ImportError:  # Python 2
+    from collections import Iterator
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+    # Versions of ujson before 5.2 don't support the `default` hook.
+    ujson.dumps([], default=repr)
+except (ImportError, TypeError):
+    ujson = None
+
+#: The name of the backend in use
+backend = None
+
+def _default(obj):
+    # `default` hook for orjson & ujson implementing `DOEncoder`'s conversions
+    if hasattr(obj, 'for_json') or \
+            isinstance(obj, (datetime, Iterator)):
+        return for_json(obj)
+    raise TypeError('{0!r} is not JSON serializable'.format(obj))
+
+def _json_loads(s):
+    if isinstance(s, bytes) and not isinstance(s, str):
+        # Python 3.5 and lower can't decode bytes directly
+        s = s.decode('utf-8')
+    return json.loads(s)
+
+def _json_dumps(obj):
+    return json.dumps(obj, cls=DOEncoder, separators=(',', ':')) \
+               .encode('utf-8')
+
+def _json_dumps_pretty(obj):
+    return json.dumps(obj, cls=DOEncoder, sort_keys=True, indent=4,
+                      separators=(',', ': '))
+
+def _orjson_dumps(obj):
+    # orjson's own datetime format differs from `toISO8601`'s, so datetimes
+    # are passed through to `_default`.
+    try:
+        return orjson.dumps(obj, default=_default,
+                            option=orjson.OPT_PASSTHROUGH_DATETIME)
+    except TypeError:  # includes `orjson.JSONEncodeError`
+        # orjson rejects some values that `json` accepts, most notably dicts
+        # with non-string keys, so let `json` have a go at them.
+        return _json_dumps(obj)
+
+def _ujson_dumps(obj):
+    return ujson.dumps(obj, default=_default, ensure_ascii=False,
+                       escape_forward_slashes=False).encode('utf-8')
+
+def _ujson_dumps_pretty(obj):
+    # ujson ignores the `default` hook when `sort_keys` is set, so the value
+    # is first reduced to plain JSON types by a round trip through the
+    # compact codec.  With these options, ujson's output is identical to the
+    # standard library's.
+    return ujson.dumps(loads(dumps(obj)), sort_keys=True, indent=4,
+                       escape_forward_slashes=False)
+
+def use(name=None):
+    """
+    Select the JSON backend to use: ``"orjson"``, ``"ujson"``, ``"json"``, or
+    `None` to pick the fastest one installed
+
+    :raises ValueError: if ``name`` is not a known backend or is not installed
+    """
+    # pylint: disable=global-statement
+    global backend, loads, dumps, dumps_pretty
+    if name is None:
+        name = 'orjson' if orjson is not None else \
+               'ujson' if ujson is not None else 'json'
+    # orjson can only indent by two spaces, so pretty-printing uses ujson if
+    # it's also installed and otherwise the standard library.
+    pretty = _json_dumps_pretty if ujson is None else _ujson_dumps_pretty
+    if name == 'orjson' and orjson is not None:
+        loads, dumps, dumps_pretty = orjson.loads, _orjson_dumps, pretty
+    elif name == 'ujson' and ujson is not None:
+        loads, dumps, dumps_pretty = ujson.loads, _ujson_dumps, pretty
+    elif name == 'json':
+        loads, dumps, dumps_pretty = _json_loads, _json_dumps, \
+                                     _json_dumps_pretty
+    else:
+        raise ValueError('JSON backend not available: {0!r}'.format(name))
+    backend = name
+
+#: Decode a JSON document given as a `bytes` or text string
+loads = None
+#: Encode a value as compact JSON, returned as UTF-8 `bytes`
+dumps = None
+#: Encode a value as human-readable JSON (sorted keys, four-space indentation)
+#: and return it as a string
+dumps_pretty = None
+
+try:
+    use(os.environ.get('DOAPI_JSON') or None)
+except ValueError:
+    # Don't make the whole library unimportable over a bad setting.
+    use()
@@ -0,0 +1,177 @@
+"""
+Sources of successive response pages for `doapi.paginate`.  Each source is an
+iterator of decoded page bodies that starts fetching as soon as it is
+constructed and that must be closed when no longer needed.
+"""
+
+from   collections  import deque
+from   concurrent.futures import ThreadPoolExecutor
+from   itertools    import islice
+from   math         import ceil
+import sys
+import threading
+from   six          import reraise
+from   six.moves    import queue, range  # pylint: disable=redefined-builtin
+from   six.moves.urllib.parse import parse_qsl, urlencode, urlparse, \
+                                     urlunparse
+
+def next_url(page):
+    """
+    Return the URL of the page after ``page``, or `None` if there is none
+    """
+    try:
+        return page["links"]["pages"]["next"]
+    except (KeyError, TypeError):
+        return None
+
+def page_urls(page, per_page):
+    """
+    Given the first page of a paginated response and the number of values on
+    it, return a list of the URLs for all of the remaining pages, or `None` if
+    they cannot be determined
+    """
+    nexturl = next_url(page)
+    if nexturl is None:
+        return []
+    try:
+        last = urlparse(page["links"]["pages"]["last"])
+        last_page = int(dict(parse_qsl(last.query))["page"])
+    except (KeyError, TypeError, ValueError):
+        try:
+            total = int(page["meta"]["total"])
+        except (KeyError, TypeError, ValueError):
+            return None
+        if per_page < 1:
+            return None
+        last_page = int(ceil(total / float(per_page)))
+    parts = urlparse(nexturl)
+    query = parse_qsl(parts.query)
+    try:
+        first_page = int(dict(query)["page"])
+    except (KeyError, ValueError):
+        return None
+    urls = []
+    for n in range(first_page, last_page+1):
+        q = [(k, str(n) if k == 'page' else v) for k,v in query]
+        urls.append(urlunparse(parts._replace(query=urlencode(q))))
+    return urls
+
+
+class SequentialPages(object):
+    """ Follow ``next`` links one request at a time """
+
+    def __init__(self, request, page):
+        self.request = request
+        self.page = page
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        url = next_url(self.page)
+        if url is None:
+            raise StopIteration
+        self.page = self.request(url)
+        return self.page
+
+    next = __next__
+
+    def close(self):
+        pass
+
+
+class ParallelPages(object):
+    """
+    Fetch the pages at a precomputed list of URLs using a pool of ``workers``
+    threads, keeping at most ``workers`` pages in flight ahead of the consumer
+    """
+
+    def __init__(self, request, urls, workers):
+        self.request = request
+        self.urls = iter(urls)
+        self.pool = ThreadPoolExecutor(max_workers=workers)
+        self.pending = deque(self.pool.submit(request, url)
+                             for url in islice(self.urls, workers))
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if not self.pending:
+            raise StopIteration
+        page = self.pending.popleft().result()
+        url = next(self.urls, None)
+        if url is not None:
+            self.pending.append(self.pool.submit(self.request, url))
+        return page
+
+    next = __next__
+
+    def close(self):
+        for fut in self.pending:
+            fut.cancel()
+        self.pending.clear()
+        self.pool.shutdown(wait=False)
+
+
+class PrefetchPages(object):
+    """
+    Follow ``next`` links in a background thread, buffering up to ``depth``
+    pages that have been fetched but not yet consumed
+    """
+
+    _DONE = object()
+
+    def __init__(self, request, page, depth):
+        self.request = request
+        self.buffer = queue.Queue(maxsize=depth)
+        self.stopped = threading.Event()
+        self.finished = False
+        self.thread = threading.Thread(target=self._run, args=(page,))
+        self.thread.daemon = True
+        self.thread.start()
+
+    def _put(self, item):
+        while not self.stopped.is_set():
+            try:
+                self.buffer.put(item, timeout=0.1)
+            except queue.Full:
+                pass
+            else:
+                return True
+        return False
+
+    def _run(self, page):
+        try:
+            while not self.stopped.is_set():
+                url = next_url(page)
+                if url is None:
+                    break
+                page = self.request(url)
+                if not self._put((page, None)):
+                    return
+        except Exception:  # pylint: disable=broad-except
+            self._put((None, sys.exc_info()))
+            return
+        self._put((self._DONE, None))
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self.finished:
+            raise StopIteration
+        page, exc_info = self.buffer.get()
+        if exc_info is not None:
+            self.finished = True
+            reraise(*exc_info)
+        if page is self._DONE:
+            self.finished = True
+            raise StopIteration
+        return page
+
+    next = __next__
+
+    def close(self):
+        self.finished = True
+        self.stopped.set()
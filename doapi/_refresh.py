@@ -0,0 +1,162 @@
+"""
+Strategies used by `doapi._wait` for re-fetching the objects being waited on.
+A strategy is called once per polling round with the list of objects that have
+not yet reached their final state and returns an iterator of their new states
+in the same order.  Strategies that may list objects in bulk also have a
+``would_sweep`` method that takes a list of objects and returns whether calling
+the strategy on them would do so, in which case `doapi._wait` passes the
+strategy every outstanding object rather than just those due to be polled, as
+the listing refreshes them all for the same number of requests.
+"""
+
+from   math   import ceil
+from   .      import _paging
+
+#: The number of objects requested per page when listing many objects at once
+#: (the maximum allowed by the API)
+SWEEP_PER_PAGE = 200
+
+def fetch_each(objects):
+    """ Call the ``fetch`` method of each object in turn """
+    return (o.fetch() for o in objects)
+
+
+class DropletSweep(object):
+    """
+    Refresh droplets with either one request per droplet or a single listing of
+    all droplets, whichever takes fewer requests.  If all of the droplets
+    initially share a tag, the listing is restricted to that tag.
+    """
+
+    def __init__(self, doapi_manager, droplets):
+        self.doapi_manager = doapi_manager
+        self.params = {"per_page": SWEEP_PER_PAGE}
+        tags = None
+        for drop in droplets:
+            dtags = set(drop.get("tags") or ())
+            tags = dtags if tags is None else tags & dtags
+        if tags:
+            self.params["tag_name"] = min(tags)
+        #: The number of requests a listing is expected to take, or `None` if
+        #: not yet known
+        self.pages = None
+
+    def __call__(self, droplets):
+        droplets = list(droplets)
+        if self.would_sweep(droplets):
+            return self._sweep(droplets)
+        return fetch_each(droplets)
+
+    def would_sweep(self, droplets):
+        """
+        Return whether ``droplets`` would be refreshed with a listing rather
+        than individually
+        """
+        # A listing takes at least one request, and determining how many it
+        # will take costs another, so there's nothing to gain with just two
+        # droplets.
+        if len(droplets) <= 2:
+            return False
+        if self.pages is None:
+            self.pages = self._count_pages()
+        return len(droplets) > self.pages
+
+    def _count_pages(self):
+        api = self.doapi_manager
+        page = api.request('/v2/droplets', params=dict(self.params, per_page=1))
+        try:
+            total = int(page["meta"]["total"])
+        except (KeyError, TypeError, ValueError):
+            return float('inf')
+        return max(1, int(ceil(total / float(SWEEP_PER_PAGE))))
+
+    def _sweep(self, droplets):
+        api = self.doapi_manager
+        wanted = set(d.id for d in droplets)
+        found = {}
+        seen = 0
+        for obj in api.paginate('/v2/droplets', 'droplets', params=self.params,
+                                page_workers=0, prefetch=0):
+            seen += 1
+            if obj.get("id") in wanted:
+                found[obj["id"]] = api._droplet(obj)
+        self.pages = max(1, int(ceil(seen / float(SWEEP_PER_PAGE))))
+        for drop in droplets:
+            # Droplets missing from the listing (e.g., because they were
+            # deleted or untagged) are fetched individually so that errors are
+            # reported the same way as always.
+            yield found[drop.id] if drop.id in found else drop.fetch()
+
+
+class ActionSweep(object):
+    """
+    Refresh actions by scanning the account-wide action listing (which is
+    ordered newest first) until all of the actions have been seen or the
+    listing has moved past the oldest of them, falling back to fetching
+    individually any actions not found.
+
+    Another page is only requested while the pages scanned so far plus the
+    actions still missing come to fewer requests than fetching every action
+    individually would take, so a round never costs more than that (save for
+    the first page of the very first scan).  If a scan gives up before reaching
+    the oldest action it was looking for, later rounds looking that far back
+    fetch the actions individually without scanning, as the listing only gets
+    longer.
+    """
+
+    def __init__(self, doapi_manager):
+        self.doapi_manager = doapi_manager
+        #: The lowest action ID seen by the previous scan, or `None`
+        self.reached = None
+        #: Whether the previous scan gave up before reaching the oldest action
+        #: it was looking for
+        self.fell_short = False
+
+    def __call__(self, actions):
+        actions = list(actions)
+        if self.would_sweep(actions):
+            return self._sweep(actions)
+        return fetch_each(actions)
+
+    def would_sweep(self, actions):
+        """
+        Return whether ``actions`` would be refreshed by scanning the listing
+        rather than individually
+        """
+        return len(actions) >= 2 and not (
+            self.fell_short and self.reached is not None
+            and min(a.id for a in actions) < self.reached
+        )
+
+    def _sweep(self, actions):
+        api = self.doapi_manager
+        wanted = set(a.id for a in actions)
+        oldest = min(wanted)
+        found = {}
+        lowest = None
+        page = api.request('/v2/actions', params={"per_page": SWEEP_PER_PAGE})
+        pages = 1
+        while True:
+            done = False
+            for obj in page.get("actions", []):
+                aid = obj.get("id")
+                if aid is None:
+                    continue
+                if aid in wanted:
+                    found[aid] = api._action(obj)
+                lowest = aid if lowest is None else min(lowest, aid)
+                if aid < oldest:
+                    done = True
+            missing = len(wanted) - len(found)
+            url = _paging.next_url(page)
+            if done or not missing or url is None:
+                self.fell_short = False
+                break
+            if pages + missing >= len(actions):
+                self.fell_short = True
+                break
+            page = api.request(url)
+            pages += 1
+        self.reached = lowest
+        for act in actions:
+            yield found[act.id] if act.id in found else act.fetch()
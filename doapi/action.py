@@ -1,4 +1,5 @@
-from .base    import ResourceWithID, Region, DOAPIError, fromISO8601, int2ipv4
+from .base    import ResourceWithID, Region, DOAPIError, int2ipv4, \
+                      resource_field, timestamp_field
 
 class Action(ResourceWithID):
     """
@@ -48,6 +49,11 @@ class Action(ResourceWithID):
     :vartype type: string
     """
 
+    __slots__ = ()
+    _field_names = ("id", "completed_at", "region", "region_slug",
+                    "resource_id", "resource_type", "started_at", "status",
+                    "type")
+
     #: The status of actions that are currently still in progress
     STATUS_IN_PROGRESS = 'in-progress'
 
@@ -57,14 +63,18 @@ class Action(ResourceWithID):
     #: The status of actions that failed to complete successfully
     STATUS_ERRORED = 'errored'
 
+    _conversions = {
+        "region": resource_field(Region),
+        "started_at": timestamp_field,
+        "completed_at": timestamp_field,
+    }
+
+    _shared_fields = ("region",)
+
     def __init__(self, state=None, **extra):
-        # pylint: disable=access-member-before-definition
         super(Action, self).__init__(state, **extra)
-        if self.get('region') is not None and \
-                not isinstance(self.region, Region):
-            self.region = Region(self.region, doapi_manager=self.doapi_manager)
-        self.started_at = fromISO8601(self.get('started_at'))
-        self.completed_at = fromISO8601(self.get('completed_at'))
+        self.fields.setdefault('started_at', None)
+        self.fields.setdefault('completed_at', None)
 
     @property
     def completed(self):
@@ -157,6 +167,28 @@ class Action(ResourceWithID):
         return next(self.doapi_manager.wait_actions([self], wait_interval,
                                                             wait_time))
 
+    def as_future(self):
+        """
+        .. versionadded:: 0.3.0
+
+        Start waiting for the action to complete or error out in the
+        background, without blocking the calling thread.  The action is polled
+        by the `doapi` object's shared :attr:`~doapi.poller` together with all
+        other actions being waited on this way, so any number of actions can be
+        tracked with a single thread.  Because the resource methods that
+        perform actions return an `Action`, this can be chained onto them::
+
+            futures = [drop.snapshot(drop.name + '-backup').as_future()
+                       for drop in droplets]
+            for fut in concurrent.futures.as_completed(futures):
+                fut.result().raise_for_error()
+
+        :return: a future that will be resolved with the action's final state,
+            or with the exception raised while fetching it
+        :rtype: concurrent.futures.Future
+        """
+        return self.doapi_manager.poller.submit(self)
+
     def raise_for_error(self):
         """
         .. versionadded:: 0.2.0
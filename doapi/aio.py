@@ -0,0 +1,605 @@
+"""
+An `asyncio`-based client for the DigitalOcean API.  This module requires
+Python 3.6 or higher and the `aiohttp <https://aiohttp.readthedocs.io>`_
+package, which can be installed with ``pip install doapi[async]``.
+"""
+
+import asyncio
+from   collections  import deque
+from   itertools    import islice
+from   time         import time
+import aiohttp
+from   .            import _codec, _paging
+from   .base        import Account, DOAPIError, WaitTimeoutError, \
+                            fromISO8601
+from   .doapi       import doapi
+from   .polling     import PollSchedule
+from   .ratelimit   import RateLimiter
+from   .retry       import RetryPolicy
+
+__all__ = ['AsyncDoapi']
+
+class AsyncDoapi(object):
+    """
+    .. versionadded:: 0.3.0
+
+    A counterpart to the `doapi` class whose request-making methods are
+    coroutines, allowing a single event loop to drive many API calls at once.
+    Methods that fetch a sequence of resources are asynchronous generators,
+    and the "wait" methods poll all outstanding objects concurrently.
+
+    The resource objects returned by an `AsyncDoapi` are the same `Droplet`,
+    `Action`, `Image`, etc. objects returned by `doapi`; their
+    ``doapi_manager`` is the (blocking) `doapi` instance stored in
+    :attr:`manager`, so calling their methods directly will perform blocking
+    requests.
+
+    An `AsyncDoapi` should be closed with :meth:`close` when no longer needed,
+    or else used as an asynchronous context manager::
+
+        async with AsyncDoapi(api_token) as client:
+            async for drop in client.fetch_all_droplets():
+                ...
+
+    :param str api_token: the API token to use for authentication
+    :param string endpoint: the URL relative to which requests will be made
+    :param number timeout: the total number of seconds to allow for each
+        request, or a ``(connect, read)`` pair of timeouts
+    :type timeout: float, tuple, or `None`
+    :param number wait_interval: the default number of seconds that "wait"
+        operations will sleep for between requests
+    :param wait_time: the default number of seconds after which "wait"
+        operations will return, or `None` or a negative number to wait
+        indefinitely
+    :type wait_time: number or `None`
+    :param per_page: the default number of objects that :meth:`paginate` will
+        fetch on each request, or `None` to leave unspecified
+    :type per_page: integer or `None`
+    :param page_workers: the default number of pages that :meth:`paginate`
+        will fetch concurrently once the total number of results is known, or
+        `None` to fetch pages one at a time
+    :type page_workers: integer or `None`
+    :param session: an :class:`aiohttp.ClientSession` to perform requests
+        through; if not specified, one will be created on first use and closed
+        by :meth:`close`
+    :param rate_limiter: a `RateLimiter` for pacing requests to stay within
+        the API's rate limit, `True` to create a new one, or `None` to make
+        requests as fast as possible
+    :type rate_limiter: `RateLimiter`, `True`, or `None`
+    :param retry: a `RetryPolicy` describing how to retry requests that fail
+        with transient errors, `True` to use the default policy, or `None` to
+        never retry
+    :type retry: `RetryPolicy`, `True`, or `None`
+    :param poll_schedule: a `PollSchedule` for "wait" operations to follow
+        instead of polling every ``wait_interval`` seconds, `True` to use the
+        default schedule, or `None` to always use ``wait_interval``
+    :type poll_schedule: `PollSchedule`, `True`, or `None`
+    """
+
+    #: The official DigitalOcean API endpoint
+    DEFAULT_ENDPOINT = doapi.DEFAULT_ENDPOINT
+
+    def __init__(self, api_token, endpoint=DEFAULT_ENDPOINT, timeout=None,
+                 wait_interval=2, wait_time=None, per_page=None,
+                 page_workers=None, session=None, rate_limiter=None,
+                 retry=None, poll_schedule=None):
+        #: The API token used for authentication
+        self.api_token = api_token
+        #: The API endpoint URL relative to which requests will be made
+        self.endpoint = endpoint
+        #: The timeout to use when making requests
+        self.timeout = timeout
+        #: The default number of seconds that the "wait" methods will sleep
+        #: for between requests
+        self.wait_interval = wait_interval
+        #: The default number of seconds after which "wait" operations will
+        #: return, or `None` or a negative number to wait indefinitely
+        self.wait_time = wait_time
+        #: The default number of objects that :meth:`paginate` will fetch on
+        #: each request, or `None` to leave unspecified
+        self.per_page = per_page
+        #: The default number of pages that :meth:`paginate` will fetch
+        #: concurrently once the total number of results is known, or `None`
+        #: to fetch pages one at a time
+        self.page_workers = page_workers
+        #: The response object for the most recent request, or `None` if no
+        #: requests have been made yet
+        self.last_response = None
+        #: The ``meta`` field in the body of the most recent response, or
+        #: `None` if there was no such field, no requests have been made yet,
+        #: or the last response was an error
+        self.last_meta = None
+        if poll_schedule is True:
+            poll_schedule = PollSchedule()
+        #: The blocking `doapi` instance that owns the resource objects
+        #: returned by this client
+        self.manager = doapi(api_token, endpoint=endpoint, timeout=timeout,
+                             wait_interval=wait_interval, wait_time=wait_time,
+                             per_page=per_page, poll_schedule=poll_schedule)
+        #: The :class:`aiohttp.ClientSession` through which requests are
+        #: performed, or `None` if one has not been created yet
+        self.session = session
+        self._own_session = session is None
+        if rate_limiter is True:
+            rate_limiter = RateLimiter()
+        #: The `RateLimiter` used to pace requests, or `None` if requests are
+        #: not paced
+        self.rate_limiter = rate_limiter
+        if retry is True:
+            retry = RetryPolicy()
+        #: The `RetryPolicy` for requests that fail with transient errors, or
+        #: `None` if requests are never retried
+        self.retry = retry
+        #: The `PollSchedule` that "wait" operations follow when not given an
+        #: explicit ``wait_interval``, or `None` to always poll every
+        #: :attr:`wait_interval` seconds
+        self.poll_schedule = poll_schedule
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def close(self):
+        """
+        Close the session (if it was created by the `AsyncDoapi`) and the
+        blocking :attr:`manager`
+
+        :return: `None`
+        """
+        if self._own_session and self.session is not None:
+            await self.session.close()
+            self.session = None
+        self.manager.close()
+
+    def _get_session(self):
+        if self.session is None:
+            if isinstance(self.timeout, tuple):
+                connect, read = self.timeout
+                timeout = aiohttp.ClientTimeout(sock_connect=connect,
+                                                sock_read=read)
+            else:
+                timeout = aiohttp.ClientTimeout(total=self.timeout)
+            self.session = aiohttp.ClientSession(timeout=timeout)
+        return self.session
+
+    async def request(self, url, params=None, data=None, method='GET'):
+        """
+        Perform an HTTP request and return the response body as a decoded JSON
+        value.  See :meth:`doapi.request` for details.
+
+        :rtype: `list` or `dict` (depending on the request) or `None`
+        :raises ValueError: if ``method`` is an invalid value
+        :raises DOAPIError: if the API endpoint replies with an error
+        """
+        if url.startswith('/'):
+            url = self.endpoint + url
+        method = method.upper()
+        if method not in ('GET', 'POST', 'PUT', 'DELETE'):
+            raise ValueError('Unrecognized HTTP method: ' + repr(method))
+        attrs = {
+            "headers": {"Authorization": "Bearer " + self.api_token},
+            "params": {k: str(v) for k,v in (params or {}).items()},
+        }
+        if data is not None:
+            if not isinstance(data, str):
+                data = _codec.dumps(data)
+            attrs["data"] = data
+            attrs["headers"]["Content-Type"] = "application/json"
+        limiter = self.rate_limiter
+        retry = self.retry
+        attempt = 0
+        while True:
+            attempt += 1
+            if limiter is not None:
+                delay = limiter.reserve_slot()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            try:
+                async with self._get_session().request(method, url,
+                                                       **attrs) as r:
+                    response = _Response(r, await r.text())
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if retry is None or not retry.should_retry(method, attempt):
+                    raise
+                await asyncio.sleep(retry.delay(attempt))
+                continue
+            status = response.status_code
+            if limiter is not None:
+                limiter.update(response.headers, exhausted=status == 429)
+                if status == 429:
+                    if doapi._retry_rate_limited(retry, method, attempt):
+                        continue
+                    break
+            if retry is not None and retry.should_retry(method, attempt,
+                                                        status):
+                await asyncio.sleep(retry.delay(attempt, status,
+                                                response.headers))
+                continue
+            break
+        self.last_response = response
+        self.last_meta = None
+        if not response.ok:
+            raise DOAPIError(response)
+        if response.text.strip():
+            body = response.json()
+            try:
+                self.last_meta = body["meta"]
+            except (KeyError, TypeError):
+                pass
+            return body
+
+    @property
+    def last_rate_limit(self):
+        """
+        A `dict` of the rate limit information returned in the most recent
+        response, or `None` if no requests have been made yet.  See
+        :attr:`doapi.last_rate_limit` for details.
+        """
+        if self.last_response is None:
+            return None
+        else:
+            return {k:v for k,v in self.last_response.headers.items()
+                        if k.lower().startswith('ratelimit')}
+
+    async def paginate(self, url, key, params=None, page_workers=None):
+        """
+        Fetch a sequence of paginated resources from the API endpoint,
+        yielding each element of each page's ``key`` field.  See
+        :meth:`doapi.paginate` for details.
+
+        :rtype: asynchronous generator of decoded JSON values
+        :raises ValueError: if a response body is not an object or ``key`` is
+            not one of its keys
+        :raises DOAPIError: if the API endpoint replies with an error
+        """
+        if params is None:
+            params = {}
+        if self.per_page is not None and "per_page" not in params:
+            params = dict(params, per_page=self.per_page)
+        if page_workers is None:
+            page_workers = self.page_workers
+        page = await self.request(url, params=params)
+        objects = self.manager._page_objects(page, key)
+        for obj in objects:
+            yield obj
+        urls = None
+        if page_workers is not None and page_workers > 1:
+            urls = _paging.page_urls(page, len(objects))
+        if urls is None:
+            while True:
+                url = _paging.next_url(page)
+                if url is None:
+                    break
+                page = await self.request(url)
+                for obj in self.manager._page_objects(page, key):
+                    yield obj
+        else:
+            urls = iter(urls)
+            pending = deque(asyncio.ensure_future(self.request(u))
+                            for u in islice(urls, page_workers))
+            try:
+                while pending:
+                    page = await pending.popleft()
+                    url = next(urls, None)
+                    if url is not None:
+                        pending.append(asyncio.ensure_future(self.request(url)))
+                    for obj in self.manager._page_objects(page, key):
+                        yield obj
+            finally:
+                for task in pending:
+                    task.cancel()
+
+    async def _fetch(self, obj, key, construct):
+        obj = construct(obj)
+        return construct((await self.request(obj.url))[key])
+
+    async def fetch_droplet(self, obj):
+        """
+        Fetch a droplet by ID number
+
+        :param obj: the ID of the droplet, a `dict` with an ``"id"`` field,
+            or a `Droplet` object (to re-fetch the same droplet)
+        :type obj: integer, `dict`, or `Droplet`
+        :rtype: Droplet
+        :raises DOAPIError: if the API endpoint replies with an error
+        """
+        return await self._fetch(obj, "droplet", self.manager._droplet)
+
+    async def fetch_all_droplets(self, tag_name=None):
+        r"""
+        Yields all of the droplets belonging to the account
+
+        :param tag_name: if non-`None`, only droplets with the given tag are
+            returned
+        :type tag_name: string or `Tag`
+        :rtype: asynchronous generator of `Droplet`\ s
+        :raises DOAPIError: if the API endpoint replies with an error
+        """
+        params = {}
+        if tag_name is not None:
+            params["tag_name"] = str(tag_name)
+        async for obj in self.paginate('/v2/droplets', 'droplets',
+                                       params=params):
+            yield self.manager._droplet(obj)
+
+    async def wait_droplets(self, droplets, status=None, locked=None,
+                            wait_interval=None, wait_time=None):
+        r"""
+        Poll the server periodically until all droplets in ``droplets`` have
+        reached some final state, yielding each `Droplet`'s final value when
+        it's done.  See :meth:`doapi.wait_droplets` for details.
+
+        :rtype: asynchronous generator of `Droplet`\ s
+        :raises TypeError: if both or neither of ``status`` & ``locked`` are
+            defined
+        :raises DOAPIError: if the API endpoint replies with an error
+        :raises WaitTimeoutError: if ``wait_time`` is exceeded
+        """
+        if (status is None) == (locked is None):
+            raise TypeError('Exactly one of "status" and "locked" must be'
+                            ' specified')
+        droplets = map(self.manager._droplet, droplets)
+        if status is not None:
+            attr, value = "status", status
+        else:
+            attr, value = "locked", bool(locked)
+        async for drop in self._wait(droplets, self.fetch_droplet, attr, value,
+                                     wait_interval, wait_time):
+            yield drop
+
+    async def fetch_action(self, obj):
+        """
+        Fetch an action by ID number
+
+        :param obj: the ID of the action, a `dict` with an ``"id"`` field,
+            or an `Action` object (to re-fetch the same action)
+        :type obj: integer, `dict`, or `Action`
+        :rtype: Action
+        :raises DOAPIError: if the API endpoint replies with an error
+        """
+        return await self._fetch(obj, "action", self.manager._action)
+
+    async def fetch_last_action(self):
+        """
+        Fetch the most recent action performed on the account, or `None` if
+        no actions have been performed yet
+
+        :rtype: `Action` or `None`
+        :raises DOAPIError: if the API endpoint replies with an error
+        """
+        acts = (await self.request('/v2/actions'))["actions"]
+        return self.manager._action(acts[0]) if acts else None
+
+    async def fetch_all_actions(self):
+        r"""
+        Yields all of the actions associated with the account
+
+        :rtype: asynchronous generator of `Action`\ s
+        :raises DOAPIError: if the API endpoint replies with an error
+        """
+        async for obj in self.paginate('/v2/actions', 'actions'):
+            yield self.manager._action(obj)
+
+    async def fetch_all_in_progress_actions(self, max_age=None):
+        r"""
+        Yields all of the account's actions that are currently in progress.
+        See :meth:`doapi.fetch_all_in_progress_actions` for details.
+
+        :rtype: asynchronous generator of `Action`\ s
+        :raises DOAPIError: if the API endpoint replies with an error
+        """
+        cutoff = self.manager._action_cutoff(max_age)
+        objects = self.paginate('/v2/actions', 'actions',
+                                params={"per_page": doapi.MAX_PER_PAGE},
+                                page_workers=0)
+        try:
+            async for obj in objects:
+                if obj.get("status") == 'in-progress':
+                    yield self.manager._action(obj)
+                if cutoff is not None and obj.get("started_at") and \
+                        fromISO8601(obj["started_at"]) < cutoff:
+                    break
+        finally:
+            await objects.aclose()
+
+    async def wait_actions(self, actions, wait_interval=None, wait_time=None):
+        r"""
+        Poll the server periodically until all actions in ``actions`` have
+        either completed or errored out, yielding each `Action`'s final value
+        as it ends.  See :meth:`doapi.wait_actions` for details.
+
+        :rtype: asynchronous generator of `Action`\ s
+        :raises DOAPIError: if the API endpoint replies with an error
+        :raises WaitTimeoutError: if ``wait_time`` is exceeded
+        """
+        async for act in self._wait(map(self.manager._action, actions),
+                                    self.fetch_action, "done", True,
+                                    wait_interval, wait_time):
+            yield act
+
+    async def fetch_image(self, obj):
+        """
+        Fetch an image by ID number
+
+        :param obj: the ID of the image, a `dict` with an ``"id"`` field, or
+            an `Image` object (to re-fetch the same image)
+        :type obj: integer, `dict`, or `Image`
+        :rtype: Image
+        :raises DOAPIError: if the API endpoint replies with an error
+        """
+        return await self._fetch(obj, "image", self.manager._image)
+
+    async def fetch_image_by_slug(self, slug):
+        """
+        Fetch an image by its slug
+
+        :param str slug: the slug of the image to fetch
+        :rtype: Image
+        :raises DOAPIError: if the API endpoint replies with an error
+        """
+        return self.manager._image(
+            (await self.request('/v2/images/' + slug))["image"]
+        )
+
+    async def fetch_all_images(self, type=None, private=None):
+        # pylint: disable=redefined-builtin
+        r"""
+        Yields all of the images available to the account
+
+        :param type: the type of images to fetch: ``"distribution"``,
+            ``"application"``, or all (`None`); default: `None`
+        :type type: string or None
+        :param bool private: whether to only return the user's private images;
+            default: return all images
+        :rtype: asynchronous generator of `Image`\ s
+        :raises DOAPIError: if the API endpoint replies with an error
+        """
+        params = {}
+        if type is not None:
+            params["type"] = type
+        if private is not None:
+            params["private"] = 'true' if private else 'false'
+        async for obj in self.paginate('/v2/images', 'images', params=params):
+            yield self.manager._image(obj)
+
+    async def fetch_ssh_key(self, obj):
+        """
+        Fetch an SSH public key by ID number or fingerprint
+
+        :param obj: the ID or fingerprint of the SSH key, a `dict` with an
+            ``"id"`` or ``"fingerprint"`` field, or an `SSHKey` object (to
+            re-fetch the same SSH key)
+        :type obj: integer, string, `dict`, or `SSHKey`
+        :rtype: SSHKey
+        :raises DOAPIError: if the API endpoint replies with an error
+        """
+        return await self._fetch(obj, "ssh_key", self.manager._ssh_key)
+
+    async def fetch_all_ssh_keys(self):
+        r"""
+        Yields all of the SSH public keys belonging to the account
+
+        :rtype: asynchronous generator of `SSHKey`\ s
+        :raises DOAPIError: if the API endpoint replies with an error
+        """
+        async for obj in self.paginate('/v2/account/keys', 'ssh_keys'):
+            yield self.manager._ssh_key(obj)
+
+    async def fetch_floating_ip(self, obj):
+        """
+        Fetch a floating IP
+
+        :param obj: an IP address (as a string or 32-bit integer), a `dict`
+            with an ``"ip"`` field, or a `FloatingIP` object (to re-fetch the
+            same floating IP)
+        :type obj: string, integer, `dict`, or `FloatingIP`
+        :rtype: FloatingIP
+        :raises DOAPIError: if the API endpoint replies with an error
+        """
+        return await self._fetch(obj, "floating_ip", self.manager._floating_ip)
+
+    async def fetch_all_floating_ips(self):
+        r"""
+        Yields all of the floating IPs belonging to the account
+
+        :rtype: asynchronous generator of `FloatingIP`\ s
+        :raises DOAPIError: if the API endpoint replies with an error
+        """
+        async for obj in self.paginate('/v2/floating_ips', 'floating_ips'):
+            yield self.manager._floating_ip(obj)
+
+    async def fetch_account(self):
+        """
+        Returns an `Account` object representing the user's account
+
+        :rtype: Account
+        :raises DOAPIError: if the API endpoint replies with an error
+        """
+        body = await self.request('/v2/account')
+        return Account(body["account"], doapi_manager=self.manager)
+
+    async def _wait(self, objects, fetch, attr, value, wait_interval=None,
+                    wait_time=None):
+        """
+        Re-fetch all of the objects in ``objects`` concurrently with ``fetch``
+        every ``wait_interval`` seconds (or on :attr:`poll_schedule`'s
+        schedule) until the ``attr`` attribute of each one equals ``value``,
+        yielding the final state of each object as soon as it satisfies the
+        condition.  See :meth:`doapi._wait` for details.
+        """
+        objects = list(objects)
+        if not objects:
+            return
+        schedule = self.poll_schedule if wait_interval is None else None
+        if wait_interval is None:
+            wait_interval = self.wait_interval
+        if wait_time is None:
+            wait_time = self.wait_time
+        start_time = time()
+        if wait_time is None or wait_time < 0:
+            end_time = None
+        else:
+            end_time = start_time + wait_time
+        if schedule is None:
+            due = [start_time] * len(objects)
+        else:
+            due = [start_time + schedule.initial_delay(o) for o in objects]
+        if end_time is not None:
+            due = [min(t, end_time) for t in due]
+        while True:
+            loop_start = time()
+            polled = [i for i,t in enumerate(due) if t <= loop_start]
+            finished = set()
+            states = await asyncio.gather(*(fetch(objects[i]) for i in polled))
+            for i, obj in zip(polled, states):
+                if getattr(obj, attr, None) == value:
+                    finished.add(i)
+                    if schedule is not None:
+                        schedule.finished(obj)
+                    yield obj
+                else:
+                    objects[i] = obj
+                    if schedule is None:
+                        due[i] = loop_start + wait_interval
+                    else:
+                        due[i] = loop_start + \
+                                 schedule.delay(obj, loop_start - start_time)
+                    if end_time is not None:
+                        # Poll everything one last time at the deadline
+                        due[i] = min(due[i], end_time)
+            if finished:
+                objects = [o for i,o in enumerate(objects) if i not in finished]
+                due = [t for i,t in enumerate(due) if i not in finished]
+            if not objects or \
+                    (end_time is not None and loop_start >= end_time):
+                break
+            time_left = min(due) - time()
+            if time_left > 0:
+                await asyncio.sleep(time_left)
+        if objects:
+            raise WaitTimeoutError(objects, attr, value, wait_interval,
+                                   wait_time)
+
+
+class _Response(object):
+    """
+    A minimal stand-in for :class:`requests.Response` built from an
+    :class:`aiohttp.ClientResponse` and its body, providing the attributes
+    that `DOAPIError` and :attr:`AsyncDoapi.last_rate_limit` use
+    """
+
+    def __init__(self, response, text):
+        self.status_code = response.status
+        self.reason = response.reason
+        self.url = str(response.url)
+        self.headers = response.headers
+        self.text = text
+
+    @property
+    def ok(self):
+        return self.status_code < 400
+
+    def json(self):
+        return _codec.loads(self.text)
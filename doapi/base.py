@@ -1,5 +1,4 @@
 import abc
-import collections
 from   datetime  import datetime
 import json
 import numbers
@@ -9,14 +8,163 @@ import pyrfc3339
 from   six       import add_metaclass, iteritems
 from   six.moves import map  # pylint: disable=redefined-builtin
 
-class Resource(collections.MutableMapping):
+try:
+    from collections.abc import Iterator, MutableMapping
+except ImportError:  # Python 2
+    from collections import Iterator, MutableMapping
+
+# The `tzinfo` that `pyrfc3339.parse` attaches to UTC timestamps, used by the
+# fast path in `fromISO8601` so that its results are indistinguishable from
+# pyrfc3339's
+_UTC = pyrfc3339.parse('1970-01-01T00:00:00Z').tzinfo
+
+def _parse_utc(stamp):
+    # Parse a timestamp of the form ``YYYY-MM-DDTHH:MM:SSZ``
+    return datetime(int(stamp[0:4]), int(stamp[5:7]), int(stamp[8:10]),
+                    int(stamp[11:13]), int(stamp[14:16]), int(stamp[17:19]),
+                    tzinfo=_UTC)
+
+if hasattr(datetime, 'fromisoformat'):  # Python 3.7+
+    from datetime import timezone
+    if _UTC is timezone.utc:
+        # pyrfc3339 2.x uses the standard library's UTC, which
+        # `fromisoformat` will attach by itself
+        def _parse_utc(stamp):  # pylint: disable=function-redefined
+            return datetime.fromisoformat(stamp[:19] + '+00:00')
+    else:
+        def _parse_utc(stamp):  # pylint: disable=function-redefined
+            return datetime.fromisoformat(stamp[:19]).replace(tzinfo=_UTC)
+
+def fromISO8601(stamp):
+    if stamp is None or isinstance(stamp, datetime):
+        return stamp
+    # The API's timestamps always have the form ``YYYY-MM-DDTHH:MM:SSZ``, which
+    # can be parsed much faster than by pyrfc3339; anything else falls back to
+    # the general parser.
+    if len(stamp) == 20 and stamp[4] == stamp[7] == '-' and stamp[10] == 'T' \
+            and stamp[13] == stamp[16] == ':' and stamp[19] == 'Z':
+        try:
+            return _parse_utc(stamp)
+        except ValueError:
+            pass
+    return pyrfc3339.parse(stamp)
+
+def toISO8601(dt):
+    return pyrfc3339.generate(dt, accept_naive=True)
+
+def timestamp_field(resource, value):
+    # pylint: disable=unused-argument
+    """ A `Resource._conversions` entry for ISO 8601 timestamps """
+    return fromISO8601(value)
+
+def resource_field(cls, **meta):
+    """
+    Returns a `Resource._conversions` entry that wraps a `dict` field in a
+    ``cls`` object sharing the containing resource's `doapi` manager
+    """
+    def convert(resource, value):
+        if value is None or isinstance(value, cls):
+            return value
+        return cls(value, doapi_manager=resource.doapi_manager, **meta)
+    return convert
+
+def resource_list_field(cls, **meta):
+    r"""
+    Like `resource_field`, but for fields containing lists of `dict`\ s
+    """
+    convert_one = resource_field(cls, **meta)
+    def convert(resource, value):
+        if not value:
+            return value
+        return [convert_one(resource, v) for v in value]
+    return convert
+
+
+class _Field(object):
+    """
+    A descriptor for reading one of a resource class's documented fields as an
+    attribute.  Normal attribute lookup finds it on the class, which is
+    several times faster than failing to find the attribute and falling back
+    to `Resource.__getattr__`.
+    """
+
+    __slots__ = ('name', 'convert')
+
+    def __init__(self, name, convert=None):
+        self.name = name
+        self.convert = convert
+
+    def __get__(self, obj, cls=None):
+        if obj is None:
+            return self
+        fields = obj.fields
+        try:
+            value = fields[self.name]
+        except KeyError:
+            # Let `Resource.__getattr__` raise the error
+            raise AttributeError(self.name)
+        if self.convert is not None:
+            value = fields[self.name] = self.convert(obj, value)
+        return value
+
+
+class _ResourceMeta(abc.ABCMeta):
+    """
+    Metaclass for resource classes that gives each class a `_Field`
+    descriptor for every field listed in its (or its bases') `_field_names`
+    or `_conversions`
+    """
+
+    def __init__(cls, name, bases, namespace):
+        super(_ResourceMeta, cls).__init__(name, bases, namespace)
+        names = set(cls._conversions)
+        for klass in cls.__mro__:
+            names.update(vars(klass).get('_field_names', ()))
+        for attr in names:
+            current = getattr(cls, attr, None)
+            convert = cls._conversions.get(attr)
+            if current is None or (isinstance(current, _Field)
+                                   and current.convert is not convert):
+                setattr(cls, attr, _Field(attr, convert))
+            # Anything else (e.g., a method or property) keeps precedence over
+            # the field of the same name, as it did before.
+
+
+@add_metaclass(_ResourceMeta)
+class Resource(MutableMapping):
+    # Meta attributes are stored in slots rather than an instance `__dict__`
+    # in order to keep resource objects small; subclasses that add meta
+    # attributes must list them in both `__slots__` and `_meta_attrs`, and
+    # all other subclasses should set `__slots__` to an empty tuple.
+    __slots__ = ('fields', 'doapi_manager')
     _meta_attrs = ('fields', 'doapi_manager')
 
+    # A mapping from field names to functions for converting the fields' raw
+    # values to richer types (e.g., timestamps and nested resources).  Each
+    # function is called with the resource and the field's value the first
+    # time the field is accessed, and the result is stored back in ``fields``,
+    # so objects whose fields are never inspected don't pay for it; conversion
+    # functions must therefore leave already-converted values unchanged.
+    _conversions = {}
+
+    # The names of the fields documented for the resource type.  Each of
+    # these (along with each field in `_conversions`) is read through a
+    # `_Field` descriptor on the class; other fields the API returns are
+    # still available as attributes via `__getattr__`, just more slowly.
+    _field_names = ()
+
+    # The fields holding nested catalog objects (regions & sizes) that are
+    # embedded in large numbers of resources.  When the resource is
+    # constructed, each such field's raw `dict` is replaced with a copy from
+    # the `doapi` manager's `_intern` in which the lists of slugs are shared
+    # with other resources.
+    _shared_fields = ()
+
     def __init__(self, state=None, **extra):
         # Note that meta attributes in `state` are not recognized as such, but
         # they are in `extra`.
         for attr in self._meta_attrs:
-            self.__dict__[attr] = None
+            object.__setattr__(self, attr, None)
         self.fields = {}
         if isinstance(state, self.__class__):
             for attr in self._meta_attrs:
@@ -30,9 +178,19 @@ class Resource(collections.MutableMapping):
             self.fields.update(state)
         for k,v in iteritems(extra):
             setattr(self, k, v)
+        if self._shared_fields and self.doapi_manager is not None:
+            for key in self._shared_fields:
+                value = self.fields.get(key)
+                if isinstance(value, dict):
+                    self.fields[key] = self.doapi_manager._intern(value)
 
     def __eq__(self, other):
-        return type(self) is type(other) and vars(self) == vars(other)
+        # Compare fields via `iteritems` so that converted and unconverted
+        # values compare equal
+        return type(self) is type(other) and \
+            dict(iteritems(self)) == dict(iteritems(other)) and \
+            all(getattr(self, attr) == getattr(other, attr)
+                for attr in self._meta_attrs if attr != 'fields')
 
     def __ne__(self, other):
         return not (self == other)  # pylint: disable=unneeded-not
@@ -45,7 +203,11 @@ class Resource(collections.MutableMapping):
                                            for k,v in iteritems(self)))
 
     def __getitem__(self, key):
-        return self.fields[key]
+        value = self.fields[key]
+        convert = self._conversions.get(key)
+        if convert is not None:
+            value = self.fields[key] = convert(self, value)
+        return value
 
     def __setitem__(self, key, value):
         self.fields[key] = value
@@ -60,21 +222,34 @@ class Resource(collections.MutableMapping):
         return len(self.fields)
 
     def __getattr__(self, name):
+        # Only reached for fields that aren't in `_field_names` or
+        # `_conversions`.  This duplicates `__getitem__` rather than calling
+        # it, as going through the `MutableMapping` machinery doubles the cost
+        # of the lookup.
+        if name in self._meta_attrs:
+            # An unset slot, as in an object being reconstructed by `copy` or
+            # `pickle`; don't recurse through `self.fields`
+            raise AttributeError(name)
+        fields = self.fields
         try:
-            return self.fields[name]
+            value = fields[name]
         except KeyError:
             raise AttributeError('{0!r} object has no attribute {1!r}'\
                                  .format(self._class(), name))
+        convert = self._conversions.get(name)
+        if convert is not None:
+            value = fields[name] = convert(self, value)
+        return value
 
     def __setattr__(self, name, value):
-        if name in self.__dict__:
-            self.__dict__[name] = value
+        if name in self._meta_attrs:
+            object.__setattr__(self, name, value)
         else:
             self.fields[name] = value
 
     def __delattr__(self, name):
-        if name in self.__dict__:
-            del self.__dict__[name]
+        if name in self._meta_attrs:
+            object.__delattr__(self, name)
         else:
             del self.fields[name]
 
@@ -108,6 +283,8 @@ class ResourceWithID(Resource):
     to the integer.
     """
 
+    __slots__ = ()
+
     def __init__(self, state=None, **extra):
         if isinstance(state, numbers.Integral):
             state = {"id": state}
@@ -120,6 +297,11 @@ class ResourceWithID(Resource):
 
 @add_metaclass(abc.ABCMeta)
 class Actionable(Resource):
+    __slots__ = ()
+
+    # The number of actions per page requested by `fetch_current_action`
+    _current_action_page = 5
+
     @abc.abstractproperty
     def url(self):
         """ The endpoint for general operations on the individual resource """
@@ -224,27 +406,46 @@ class Actionable(Resource):
         Fetch the action currently in progress on the resource, or `None` if
         there is no such action
 
+        .. versionchanged:: 0.3.0
+            Only the resource's most recent actions are fetched, a few at a
+            time, rather than potentially paging through its entire history
+
         :rtype: `Action` or `None`
         :raises DOAPIError: if the API endpoint replies with an error
         """
-        lasttime = None
-        for a in self.fetch_all_actions():
-            # Return the first in-progress Action listed that started on (or
-            # after???) the first Action listed.  This is to handle creation of
-            # floating IPs assigned to a droplet, as that can cause the assign
-            # action to be listed after the reserve/create action, even though
-            # the assignment finishes later.
-            if lasttime is None:
-                lasttime = a.started_at
-            elif lasttime > a.started_at:
-                return None
-            if a.in_progress:
-                return a
-        return None
+        api = self.doapi_manager
+        # Only the actions that started at the same time as the most recent
+        # one matter, and there are rarely more than a couple of those, so
+        # small pages are requested one at a time (without fetching any ahead)
+        # until an older action shows up.
+        objects = api.paginate(self.action_url, 'actions',
+                               params={"per_page": self._current_action_page},
+                               page_workers=0, prefetch=0)
+        try:
+            lasttime = None
+            for obj in objects:
+                a = api._action(obj)
+                # Return the first in-progress Action listed that started on
+                # (or after???) the first Action listed.  This is to handle
+                # creation of floating IPs assigned to a droplet, as that can
+                # cause the assign action to be listed after the
+                # reserve/create action, even though the assignment finishes
+                # later.
+                if lasttime is None:
+                    lasttime = a.started_at
+                elif lasttime > a.started_at:
+                    return None
+                if a.in_progress:
+                    return a
+            return None
+        finally:
+            objects.close()
 
 
 @add_metaclass(abc.ABCMeta)
 class Taggable(Resource):
+    __slots__ = ()
+
     @abc.abstractmethod
     def _taggable(self):
         """
@@ -286,7 +487,7 @@ class DOEncoder(json.JSONEncoder):
     """
     def default(self, obj):  # pylint: disable=method-hidden
         if hasattr(obj, 'for_json') or \
-                isinstance(obj, (datetime, collections.Iterator)):
+                isinstance(obj, (datetime, Iterator)):
             return for_json(obj)
         else:
             return super(DOEncoder, self).default(obj)
@@ -301,7 +502,7 @@ def for_json(obj):  # private internal function
         return obj.for_json()
     elif isinstance(obj, datetime):
         return toISO8601(obj)
-    elif isinstance(obj, collections.Iterator):
+    elif isinstance(obj, Iterator):
         return list(obj)
     else:
         return obj
@@ -333,6 +534,9 @@ class Region(Resource):
     :vartype slug: string
     """
 
+    __slots__ = ()
+    _field_names = ("available", "features", "name", "sizes", "slug")
+
     def __str__(self):
         """ Convert the region to its slug representation """
         return self.slug
@@ -377,6 +581,10 @@ class Size(Resource):
     :vartype vcpus: int
     """
 
+    __slots__ = ()
+    _field_names = ("available", "disk", "memory", "price_hourly",
+                    "price_monthly", "regions", "slug", "transfer", "vcpus")
+
     def __str__(self):
         """ Convert the size to its slug representation """
         return self.slug
@@ -419,6 +627,10 @@ class Account(Resource):
     :vartype uuid: alphanumeric string
     """
 
+    __slots__ = ()
+    _field_names = ("droplet_limit", "email", "email_verified",
+                    "floating_ip_limit", "status", "status_message", "uuid")
+
     #: The status of an account that is currently active and warning-free
     STATUS_ACTIVE = 'active'
 
@@ -466,36 +678,8 @@ class Kernel(ResourceWithID):
     :vartype version: string
     """
 
-    pass
-
-
-class Networks(Resource):
-    r"""
-    A networks resource, representing a set of network interfaces configured
-    for a specific droplet.
-
-    A `Droplet`'s network information is stored in its ``networks`` attribute.
-
-    The DigitalOcean API implicitly specifies the following fields for networks
-    objects:
-
-    :var v4: a list of IPv4 interfaces allocated for a droplet
-    :vartype v4: list of `NetworkInterface`\ s
-
-    :var v6: a list of IPv6 interfaces allocated for a droplet
-    :vartype v6: list of `NetworkInterface`\ s
-    """
-    def __init__(self, state=None, **extra):
-        super(Networks, self).__init__(state, **extra)
-        meta = {
-            "doapi_manager": self.doapi_manager,
-        }
-        if self.get("v4"):
-            self.v4 = [NetworkInterface(obj, ip_version=4, **meta)
-                       for obj in self.v4]
-        if self.get("v6"):
-            self.v6 = [NetworkInterface(obj, ip_version=6, **meta)
-                       for obj in self.v6]
+    __slots__ = ()
+    _field_names = ("id", "name", "version")
 
 
 class NetworkInterface(Resource):
@@ -525,6 +709,8 @@ class NetworkInterface(Resource):
        The IP version used by the interface: ``4`` or ``6``
     """
 
+    __slots__ = ('ip_version',)
+    _field_names = ("gateway", "ip_address", "netmask", "type")
     _meta_attrs = Resource._meta_attrs + ('ip_version',)
 
     def __str__(self):
@@ -532,6 +718,32 @@ class NetworkInterface(Resource):
         return self.ip_address
 
 
+class Networks(Resource):
+    r"""
+    A networks resource, representing a set of network interfaces configured
+    for a specific droplet.
+
+    A `Droplet`'s network information is stored in its ``networks`` attribute.
+
+    The DigitalOcean API implicitly specifies the following fields for networks
+    objects:
+
+    :var v4: a list of IPv4 interfaces allocated for a droplet
+    :vartype v4: list of `NetworkInterface`\ s
+
+    :var v6: a list of IPv6 interfaces allocated for a droplet
+    :vartype v6: list of `NetworkInterface`\ s
+    """
+
+    __slots__ = ()
+    _field_names = ("v4", "v6")
+
+    _conversions = {
+        "v4": resource_list_field(NetworkInterface, ip_version=4),
+        "v6": resource_list_field(NetworkInterface, ip_version=6),
+    }
+
+
 class BackupWindow(Resource):
     """
     A backup window resource, representing an upcoming timeframe in which a
@@ -550,10 +762,15 @@ class BackupWindow(Resource):
     :vartype end: datetime.datetime
     """
 
+    __slots__ = ()
+    _field_names = ("start", "end")
+
+    _conversions = {"start": timestamp_field, "end": timestamp_field}
+
     def __init__(self, state=None, **extra):
         super(BackupWindow, self).__init__(state, **extra)
-        self.start = fromISO8601(self.get('start'))
-        self.end = fromISO8601(self.get('end'))
+        self.fields.setdefault('start', None)
+        self.fields.setdefault('end', None)
 
 
 class DOAPIError(Exception):
@@ -599,15 +816,6 @@ class DOAPIError(Exception):
                         setattr(self, k, v)
 
 
-def fromISO8601(stamp):
-    if stamp is None or isinstance(stamp, datetime):
-        return stamp
-    else:
-        return pyrfc3339.parse(stamp)
-
-def toISO8601(dt):
-    return pyrfc3339.generate(dt, accept_naive=True)
-
 def int2ipv4(n):
     return socket.inet_ntoa(struct.pack('!I', n))
 
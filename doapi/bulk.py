@@ -0,0 +1,75 @@
+from   collections import namedtuple
+
+#: The outcome of performing an action on a single resource as part of
+#: :meth:`doapi.bulk_act`: the resource, the resulting `Action` (or `None` on
+#: failure), and the exception raised (or `None` on success)
+BulkItem = namedtuple('BulkItem', 'resource action error')
+
+class BulkResult(object):
+    r"""
+    .. versionadded:: 0.3.0
+
+    The outcome of performing an action on multiple resources at once with
+    :meth:`doapi.bulk_act`
+
+    :var items: a list of `BulkItem`\ s, one for each resource, in the same
+        order as the resources were given
+    :vartype items: list of `BulkItem`\ s
+    """
+
+    def __init__(self, doapi_manager, items):
+        #: The `doapi` object that performed the actions
+        self.doapi_manager = doapi_manager
+        self.items = items
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    @property
+    def actions(self):
+        r"""
+        The `Action`\ s that were successfully started, in the same order as
+        their resources
+        """
+        return [it.action for it in self.items if it.error is None]
+
+    @property
+    def errors(self):
+        r"""
+        A list of ``(resource, exception)`` pairs for the resources that could
+        not be acted on
+        """
+        return [(it.resource, it.error) for it in self.items
+                                        if it.error is not None]
+
+    @property
+    def ok(self):
+        """ `True` iff every resource was acted on successfully """
+        return all(it.error is None for it in self.items)
+
+    def raise_for_error(self):
+        """
+        If acting on any resource failed, re-raise the first such exception.
+        Otherwise, do nothing.
+
+        :return: `None`
+        """
+        for it in self.items:
+            if it.error is not None:
+                raise it.error
+
+    def wait(self, wait_interval=None, wait_time=None):
+        r"""
+        Wait for all of the successfully started actions to finish, yielding
+        each `Action`'s final value as it ends.  See :meth:`doapi.wait_actions`
+        for details.
+
+        :rtype: generator of `Action`\ s
+        :raises DOAPIError: if the API endpoint replies with an error
+        :raises WaitTimeoutError: if ``wait_time`` is exceeded
+        """
+        return self.doapi_manager.wait_actions(self.actions, wait_interval,
+                                               wait_time)
@@ -1,12 +1,24 @@
 from   __future__  import print_function
 import argparse
-from   collections import defaultdict, Iterator
+from   collections import defaultdict
+import errno
+from   hashlib     import sha256
 import json
 import os
 import os.path
 import re
 import sys
-from   ..          import __version__, DOEncoder, doapi, WaitTimeoutError
+import tempfile
+import threading
+from   time        import time
+from   six         import reraise
+from   ..          import __version__, _codec, DOAPIError, doapi, \
+                          WaitTimeoutError
+
+try:
+    from collections.abc import Iterator
+except ImportError:  # Python 2
+    from collections import Iterator
 
 universal = argparse.ArgumentParser(add_help=False)
 tokenopts = universal.add_mutually_exclusive_group()
@@ -19,6 +31,16 @@ universal.add_argument('--timeout', type=float, metavar='SECONDS',
                        help='HTTP request timeout')
 universal.add_argument('--endpoint', metavar='URL',
                        help='where to make API requests')
+universal.add_argument('--cache-ttl', type=float, metavar='SECONDS',
+                       help='reuse droplet, image, and SSH key lists fetched by'
+                            ' earlier commands for up to SECONDS seconds'
+                            ' [default: $DOAPI_CACHE_TTL or 0 (disabled)]')
+universal.add_argument('--format', choices=['json', 'ndjson'],
+                       default='json',
+                       help='output a pretty-printed JSON document (default)'
+                            ' or one compact JSON object per line')
+universal.add_argument('--refresh-cache', action='store_true',
+                       help='ignore previously cached resource lists')
 universal.add_argument('-V', '--version', action='version',
                                           version='doapi ' + __version__)
 
@@ -33,11 +55,65 @@ waitopts.add_argument('-w', '--wait', action='store_true',
                       help='Wait for the operation to finish')
 
 
-class Cache(object):
-    ### TODO: When not all objects of a type have been fetched, labels that are
-    ### valid IDs (or fingerprints or potential slugs) should not cause
-    ### everything to be fetched (but the result should still be cached).
+class DiskCache(object):
+    """
+    Lists of resources saved between invocations of the command-line client so
+    that names can be resolved without refetching everything.  Each account
+    (identified by a hash of its API token and endpoint) gets its own
+    directory, containing one JSON file per resource type.
+    """
+
+    def __init__(self, client, ttl, directory=None):
+        if directory is None:
+            directory = default_cache_dir()
+        ident = sha256((client.endpoint + '\0' + client.api_token)
+                       .encode('utf-8')).hexdigest()
+        self.directory = os.path.join(directory, ident)
+        self.ttl = ttl
+
+    def path(self, key):
+        return os.path.join(self.directory, key + '.json')
+
+    def load(self, key):
+        """
+        Return the raw objects stored under ``key``, or `None` if there are
+        none or they are older than the TTL
+        """
+        try:
+            with open(self.path(key), 'rb') as fp:
+                data = _codec.loads(fp.read())
+            if time() - data["timestamp"] > self.ttl:
+                return None
+            return data["objects"]
+        except (IOError, OSError, ValueError, LookupError, TypeError):
+            return None
+
+    def save(self, key, objects):
+        try:
+            if not os.path.isdir(self.directory):
+                os.makedirs(self.directory, 0o700)
+            # Write to a temporary file and then move it into place so that
+            # concurrent invocations never see a partial file
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as fp:
+                fp.write(_codec.dumps({"timestamp": time(),
+                                       "objects": objects}))
+            if os.name == 'nt' and os.path.exists(self.path(key)):
+                os.remove(self.path(key))
+            os.rename(tmp, self.path(key))
+        except (IOError, OSError):
+            # Caching is only an optimization; never fail a command over it.
+            pass
+
+    def invalidate(self, key):
+        try:
+            os.remove(self.path(key))
+        except OSError as e:
+            if e.errno != errno.ENOENT:
+                raise
+
 
+class Cache(object):
     groupby = {
         "droplet": ("id", "name"),
         "sshkey": ("id", "fingerprint", "name"),
@@ -45,35 +121,137 @@ class Cache(object):
         ###"action": ("id",),
     }
 
-    def __init__(self, client):
+    def __init__(self, client, store=None, refresh=False):
         self.client = client
         self.caches = {}
+        #: A `DiskCache` for persisting fetched objects, or `None`
+        self.store = store
+        #: Whether to ignore (but still update) the contents of ``store``
+        self.refresh = refresh
+        #: The keys whose objects were loaded from ``store`` rather than
+        #: fetched by this process
+        self.stored = set()
+        #: Objects fetched individually by `fetch_direct`, keyed by type and
+        #: then by label
+        self.fetched = defaultdict(dict)
 
     def cache(self, objects, key):
-        if key not in self.caches:
+        if not self.load(key):
             objects = list(objects)
-            grouped = {key: objects}
-            for attr in self.groupby[key]:
-                grouped[attr] = defaultdict(list)
-                for obj in objects:
-                    if obj.get(attr) is not None:
-                        grouped[attr][obj[attr]].append(obj)
-            self.caches[key] = grouped
+            if self.store is not None:
+                self.store.save(key, objects)
+            self.index(key, objects)
+
+    def load(self, key):
+        """
+        Ensure that the objects for ``key`` are cached in memory if this can be
+        done without any requests, loading them from ``store`` if necessary.
+        Returns `True` iff the objects are now cached.
+        """
+        if key in self.caches:
+            return True
+        if self.store is None or self.refresh:
+            return False
+        stored = self.store.load(key)
+        if stored is None:
+            return False
+        mkobj = {
+            "droplet": self.client._droplet,
+            "sshkey": self.client._ssh_key,
+            "image": self.client._image,
+        }[key]
+        self.index(key, [mkobj(obj) for obj in stored])
+        self.stored.add(key)
+        return True
+
+    def index(self, key, objects):
+        grouped = {key: objects}
+        for attr in self.groupby[key]:
+            grouped[attr] = defaultdict(list)
+            for obj in objects:
+                if obj.get(attr) is not None:
+                    grouped[attr][obj[attr]].append(obj)
+        self.caches[key] = grouped
+
+    def fetch_direct(self, key, label):
+        """
+        Try to fetch the single object of type ``key`` identified by ``label``
+        with one request, without listing all objects of that type.  This is
+        only attempted for labels that look like an ID number, SSH key
+        fingerprint, or image slug, which (for the purposes of ``get`` with
+        ``multiple=False``) take precedence over names.  Returns `None` if the
+        label does not look like such an identifier or no such object exists.
+        """
+        if label in self.fetched[key]:
+            return self.fetched[key][label]
+        try:
+            idno = int(label)
+        except ValueError:
+            idno = None
+        if idno is not None:
+            fetcher = {
+                "droplet": self.client.fetch_droplet,
+                "sshkey": self.client.fetch_ssh_key,
+                "image": self.client.fetch_image,
+            }[key]
+            ident = idno
+        elif key == "sshkey" and re.match(r'^[0-9a-f]{2}(:[0-9a-f]{2}){15}$',
+                                          label):
+            fetcher, ident = self.client.fetch_ssh_key, label
+        elif key == "image" and re.match(r'^[a-z0-9][-a-z0-9.]*$', label):
+            fetcher, ident = self.client.fetch_image_by_slug, label
+        else:
+            return None
+        try:
+            obj = fetcher(ident)
+        except DOAPIError as e:
+            if e.response.status_code != 404:
+                raise
+            obj = None
+        self.fetched[key][label] = obj
+        return obj
+
+    def invalidate(self, *keys):
+        """
+        Forget the objects cached under ``keys`` (e.g., after creating,
+        deleting, or renaming one of them) both in memory and on disk
+        """
+        for key in keys:
+            self.caches.pop(key, None)
+            self.stored.discard(key)
+            if self.store is not None:
+                self.store.invalidate(key)
+
+    def recache(self, key):
+        """
+        If the objects for ``key`` were loaded from disk, discard them and
+        fetch them anew.  Returns `True` iff this happened.
+        """
+        if key in self.stored:
+            self.invalidate(key)
+            getattr(self, 'cache_' + key + 's')()
+            return True
+        return False
+
+    def fresh(self, key, objects):
+        """
+        Return ``objects`` as-is if they were fetched by this process, or else
+        refetch them so that stale data from disk is not shown to the user
+        """
+        if key in self.stored:
+            return [obj.fetch() for obj in objects]
+        return objects
 
     def get(self, key, label, multiple=True, mandatory=True, hasM=False):
-        grouped = self.caches[key]
-        matches = []
-        for attr in self.groupby[key]:
-            if attr == "id":
-                try:
-                    idno = int(label)
-                except ValueError:
-                    continue
-                else:
-                    matches.append(grouped[attr][idno])
-            else:
-                matches.append(grouped[attr][label])
-        matches = [m for m in matches if m != []]
+        if not multiple and not self.load(key):
+            obj = self.fetch_direct(key, label)
+            if obj is not None:
+                return obj
+        getattr(self, 'cache_' + key + 's')()
+        matches = self.lookup(key, label)
+        if not matches and self.recache(key):
+            # The object may have been created since the cache was saved.
+            matches = self.lookup(key, label)
         allmatch = sum(matches, [])
         if matches:
             if multiple:
@@ -93,11 +271,25 @@ class Cache(object):
         else:
             return [] if multiple else None
 
+    def lookup(self, key, label):
+        grouped = self.caches[key]
+        matches = []
+        for attr in self.groupby[key]:
+            if attr == "id":
+                try:
+                    idno = int(label)
+                except ValueError:
+                    continue
+                else:
+                    matches.append(grouped[attr][idno])
+            else:
+                matches.append(grouped[attr][label])
+        return [m for m in matches if m != []]
+
     def cache_sshkeys(self):
         self.cache(self.client.fetch_all_ssh_keys(), "sshkey")
 
     def get_sshkey(self, label, multiple=True, mandatory=True, hasM=False):
-        self.cache_sshkeys()
         return self.get("sshkey", label, multiple, mandatory, hasM)
 
     def get_sshkeys(self, labels, multiple=True):
@@ -113,12 +305,13 @@ class Cache(object):
             value = key.get(attr)
             if value is not None:
                 cache[attr][value].append(key)
+        if self.store is not None:
+            self.store.invalidate("sshkey")
 
     def cache_droplets(self):
         self.cache(self.client.fetch_all_droplets(), "droplet")
 
     def get_droplet(self, label, multiple=True, mandatory=True, hasM=False):
-        self.cache_droplets()
         return self.get("droplet", label, multiple, mandatory, hasM)
 
     def get_droplets(self, labels, multiple=True):
@@ -132,7 +325,6 @@ class Cache(object):
         self.cache(self.client.fetch_all_images(), "image")
 
     def get_image(self, label, multiple=True, mandatory=True, hasM=False):
-        self.cache_images()
         return self.get("image", label, multiple, mandatory, hasM)
 
     def get_images(self, labels, multiple=True):
@@ -149,6 +341,9 @@ class Cache(object):
             self.cache_droplets()
         elif key == "image":
             self.cache_images()
+        if fatal:
+            # Don't refuse (or allow) a name based on stale data.
+            self.recache(key)
         if name in self.caches[key]["name"] or \
                 (key == "image" and name in self.caches[key]["slug"]):
             msg = 'There is already another {0} named {1!r}'.format(key, name)
@@ -158,7 +353,14 @@ class Cache(object):
                 print('Warning:', msg, file=sys.stderr)
 
 
-def mkclient(args):
+def mkclient(args, destructive=False):
+    """
+    Construct a `doapi` client and `Cache` from the parsed command-line
+    arguments ``args``.  If ``destructive`` is true, resource lists saved by
+    earlier invocations are not used to resolve identifiers, so that a
+    command that deletes or overwrites resources can't act on a resource that
+    was renamed or replaced since the list was saved.
+    """
     if args.api_token is not None:
         api_token = args.api_token
     elif args.api_token_file is not None:
@@ -183,33 +385,154 @@ Specify your API token via one of the following (in order of precedence):
                                  for param in "timeout endpoint wait_interval"
                                               " wait_time".split()
                                  if getattr(args, param, None) is not None})
-    return (client, Cache(client))
-
-def dump(obj, fp=sys.stdout):
-    if isinstance(obj, Iterator):
-        fp.write('[')
-        first = True
-        for o in obj:
-            if first:
-                fp.write('\n')
-                first = False
-            else:
-                fp.write(',\n')
-            s = json.dumps(o, cls=DOEncoder, sort_keys=True, indent=4,
-                           separators=(',', ': '))
-            fp.write(re.sub(r'^', '    ', s, flags=re.M))
-            fp.flush()
-        if not first:
-            fp.write('\n')
-        fp.write(']\n')
+    ttl = getattr(args, "cache_ttl", None)
+    if ttl is None:
+        try:
+            ttl = float(os.environ.get("DOAPI_CACHE_TTL", 0))
+        except ValueError:
+            die('DOAPI_CACHE_TTL must be a number')
+    store = DiskCache(client, ttl) if ttl > 0 else None
+    refresh = destructive or getattr(args, "refresh_cache", False)
+    return (client, Cache(client, store, refresh))
+
+def default_cache_dir():
+    if "DOAPI_CACHE_DIR" in os.environ:
+        return os.environ["DOAPI_CACHE_DIR"]
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser('~/.cache')
+    return os.path.join(base, 'doapi')
+
+#: The maximum number of seconds that `dump` leaves streamed output buffered
+#: before flushing it
+FLUSH_INTERVAL = 0.5
+
+class _PeriodicWriter(object):
+    """
+    A context manager that buffers the text written to it and writes it out to
+    ``fp`` (and flushes ``fp``) from a background thread every
+    `FLUSH_INTERVAL` seconds, so that output produced in bursts costs one
+    write per interval rather than one per element, yet nothing sits in the
+    buffer for longer than that while the producer is blocked (e.g., on a
+    request).  On exit, including on exit by an exception, whatever is still
+    buffered is written out.
+    """
+
+    def __init__(self, fp):
+        self.fp = fp
+        self._buf = []
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._error = None
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._done.set()
+        self._thread.join()
+        if self._error is None:
+            self._flush()
+        elif exc_type is None:
+            reraise(*self._error)
+        return False
+
+    def write(self, s):
+        if self._error is not None:
+            reraise(*self._error)
+        with self._lock:
+            self._buf.append(s)
+
+    def _flush(self):
+        with self._lock:
+            buf, self._buf = self._buf, []
+            if buf:
+                self.fp.write(''.join(buf))
+                self.fp.flush()
+
+    def _run(self):
+        try:
+            while not self._done.wait(FLUSH_INTERVAL):
+                self._flush()
+        except Exception:  # pylint: disable=broad-except
+            # E.g., a broken pipe; raise it in the main thread instead
+            self._error = sys.exc_info()
+
+def dump(obj, fmt='json', fp=sys.stdout):
+    """
+    Write ``obj`` to ``fp`` in the format ``fmt`` (``'json'`` or
+    ``'ndjson'``, as chosen with the ``--format`` option).
+
+    In ``'ndjson'`` format, ``obj`` is written as a single line of compact
+    JSON, unless it is an iterator or list, in which case each of its elements
+    is written on its own line instead.  See `dump_ndjson`.
+
+    In ``'json'`` format, ``obj`` is written as pretty-printed JSON.  An
+    iterator is written as a JSON array one element at a time as it is
+    consumed.  The elements are buffered by a `_PeriodicWriter`, which writes
+    them out every `FLUSH_INTERVAL` seconds however long the iterator takes to
+    produce each one, and which writes out any elements still buffered if
+    the iterator raises an exception.
+    """
+    if fmt == 'ndjson':
+        if not isinstance(obj, (Iterator, list)):
+            obj = [obj]
+        dump_ndjson(obj, fp)
+    elif isinstance(obj, Iterator):
+        with _PeriodicWriter(fp) as out:
+            out.write('[')
+            sep = '\n    '
+            for o in obj:
+                # Newlines in the pretty-printed JSON are always structural
+                # (those in strings are escaped), so this indents every line.
+                out.write(sep + _codec.dumps_pretty(o).replace('\n', '\n    '))
+                sep = ',\n    '
+            out.write('\n]\n' if sep != '\n    ' else ']\n')
     else:
-        json.dump(obj, fp, cls=DOEncoder, sort_keys=True, indent=4,
-                  separators=(',', ': '))
+        fp.write(_codec.dumps_pretty(obj))
         fp.write('\n')
 
+def dump_ndjson(objs, fp=sys.stdout):
+    """
+    Write each element of the iterable ``objs`` to ``fp`` as a line of compact
+    JSON.  The lines are buffered by a `_PeriodicWriter`, so each page of a
+    listing reaches the reader within `FLUSH_INTERVAL` seconds of its arrival
+    without a write for every line.
+    """
+    with _PeriodicWriter(fp) as out:
+        for o in objs:
+            out.write(_codec.dumps(o).decode('utf-8') + '\n')
+
 def die(msg):
     raise SystemExit(sys.argv[0] + ': ' + msg)
 
+def bulk_act(client, objects, action):
+    """
+    Perform ``action`` on all ``objects`` concurrently and return the
+    `BulkResult`.  Failures are reported on stderr; if no actions could be
+    started at all, the first error is raised.  After outputting the
+    successfully started actions, callers should pass the result to
+    `exit_if_failed`.
+    """
+    result = client.bulk_act(objects, action)
+    if result.errors and not result.actions:
+        result.raise_for_error()
+    for obj, e in result.errors:
+        label = obj.get("id", obj.get("ip"))
+        print('Warning: could not act on {0} {1}: {2}'.format(obj._class(),
+                                                             label, e),
+              file=sys.stderr)
+    return result
+
+def exit_if_failed(result):
+    """
+    Exit with a status of 1 if acting on any of the resources in the
+    `BulkResult` ``result`` failed
+    """
+    if result is not None and result.errors:
+        sys.exit(1)
+
 def currentActions(objs, withnulls=False):
     for o in objs:
         act = o.fetch_current_action()
@@ -283,17 +606,20 @@ def do_actioncmd(args, client, objects):
                 die('--params must be a JSON dictionary/object')
         else:
             params = {}
-        actions = [obj.act(type=args.type, **params) for obj in objects]
+        result = bulk_act(client, objects,
+                          lambda obj: obj.act(type=args.type, **params))
+        actions = result.actions
         if args.wait:
             actions = catch_timeout(client.wait_actions(actions))
-        dump(actions)
+        dump(actions, args.format)
+        exit_if_failed(result)
     elif args.cmd == 'actions':
         if args.in_progress:
-            dump(currentActions(objects, withnulls=True))
+            dump(currentActions(objects, withnulls=True), args.format)
         elif args.last:
-            dump(obj.fetch_last_action() for obj in objects)
+            dump((obj.fetch_last_action() for obj in objects), args.format)
         else:
-            dump(obj.fetch_all_actions() for obj in objects)
+            dump((obj.fetch_all_actions() for obj in objects), args.format)
     elif args.cmd == 'wait':
         if getattr(args, "status", None) is not None:
             waiter = client.wait_droplets(objects, status=args.status)
@@ -304,7 +630,7 @@ def do_actioncmd(args, client, objects):
         else:
             actions = list(currentActions(objects))
             waiter = client.wait_actions(actions)
-        dump(catch_timeout(waiter))
+        dump(catch_timeout(waiter), args.format)
     else:
         assert False, 'do_actioncmd called with invalid command'
 
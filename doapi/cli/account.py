@@ -13,9 +13,9 @@ def main(argv=None, parsed=None):
     client, _ = util.mkclient(args)
     me = client.fetch_account()
     if args.rate_limit:
-        util.dump(client.last_rate_limit)
+        util.dump(client.last_rate_limit, args.format)
     else:
-        util.dump(me)
+        util.dump(me, args.format)
 
 if __name__ == '__main__':
     main()
@@ -1,5 +1,4 @@
 import argparse
-from   itertools import chain
 from   six.moves import map  # pylint: disable=redefined-builtin
 from   .         import _util as util
 from   ..action  import Action
@@ -11,24 +10,33 @@ def main(argv=None, parsed=None):
                                                  ' actions')
     cmds = parser.add_subparsers(title='command', dest='cmd')
 
-    cmd_show = cmds.add_parser('show', help='List actions',
+    ageopts = argparse.ArgumentParser(add_help=False)
+    ageopts.add_argument('--max-age', type=float, metavar='SECONDS',
+                         help='only look for in-progress actions started within'
+                              ' the past SECONDS seconds; this takes only a'
+                              ' few requests, but actions running for longer'
+                              ' are missed [default: scan the entire action'
+                              ' history, one request per 200 actions]')
+
+    cmd_show = cmds.add_parser('show', parents=[ageopts],
+                               help='List actions',
                                description='List actions')
     showopts = cmd_show.add_mutually_exclusive_group()
     showopts.add_argument('--last', action='store_true',
                           help='Show only the most recent action')
     showopts.add_argument('--in-progress', action='store_true',
-                          help='Show all in-progress actions')
+                          help='Show all in-progress actions (see --max-age)')
     cmd_show.add_argument('action', nargs='*', type=int,
                           help='ID of an action; omit to list all')
 
-    cmd_wait = cmds.add_parser('wait', parents=[util.waitbase],
+    cmd_wait = cmds.add_parser('wait', parents=[util.waitbase, ageopts],
                                help='Wait for an action to complete',
                                description='Wait for an action to complete')
     cmd_wait.add_argument('action', nargs='*', type=int,
                           help='ID of an action; omit to wait on all in'
-                               ' progress')
+                               ' progress (see --max-age)')
 
-    cmd_resource = cmds.add_parser('resource',
+    cmd_resource = cmds.add_parser('resource', parents=[ageopts],
                                    help='Show the resource that an action'
                                         ' operated on',
                                    description='''\
@@ -38,7 +46,7 @@ are shown as `null`.''')
     resopts.add_argument('--last', action='store_true',
                          help='Show only the most recent action')
     resopts.add_argument('--in-progress', action='store_true',
-                         help='Show all in-progress actions')
+                         help='Show all in-progress actions (see --max-age)')
     cmd_resource.add_argument('action', nargs='*', type=int,
                               help='ID of an action; omit to list all')
 
@@ -49,56 +57,49 @@ are shown as `null`.''')
         if args.last:
             if args.action:
                 util.die('--last and action arguments are mutually exclusive')
-            util.dump(client.fetch_last_action())
+            util.dump(client.fetch_last_action(), args.format)
         elif args.in_progress:
             if args.action:
                 util.die('--in-progress and action arguments are mutually'
                          ' exclusive')
-            util.dump(all_in_progress(client))
+            util.dump(client.fetch_all_in_progress_actions(args.max_age),
+                      args.format)
         elif args.action:
             util.dump(util.rmdups(map(client.fetch_action, args.action),
-                                  'action'))
+                                  'action'), args.format)
         else:
-            util.dump(client.fetch_all_actions())
+            util.dump(client.fetch_all_actions(), args.format)
 
     elif args.cmd == 'wait':
         if args.action:
             acts = util.rmdups(map(client.fetch_action, args.action), 'action')
         else:
-            acts = all_in_progress(client)
-        util.dump(util.catch_timeout(client.wait_actions(acts)))
+            acts = client.fetch_all_in_progress_actions(args.max_age)
+        util.dump(util.catch_timeout(client.wait_actions(acts)), args.format)
 
     elif args.cmd == 'resource':
         if args.last:
             if args.action:
                 util.die('--last and action arguments are mutually exclusive')
             act = client.fetch_last_action()
-            util.dump(None if act is None else act.fetch_resource())
+            util.dump(None if act is None else act.fetch_resource(),
+                      args.format)
         else:
             if args.in_progress:
                 if args.action:
                     util.die('--in-progress and action arguments are mutually'
                              ' exclusive')
-                acts = all_in_progress(client)
+                acts = client.fetch_all_in_progress_actions(args.max_age)
             elif args.action:
                 acts = util.rmdups(map(client.fetch_action, args.action),
                                    'action')
             else:
                 util.die('You must specify one of --last, --in-progress, or'
                          ' one or more actions')
-            util.dump(map(Action.fetch_resource, acts))
+            util.dump(map(Action.fetch_resource, acts), args.format)
 
     else:
         assert False, 'No path defined for command {0!r}'.format(args.cmd)
 
-def all_in_progress(client):
-    return util.currentActions(chain(client.fetch_all_droplets(),
-                                     ### TODO: This assumes that only private
-                                     ### images can be acted on.  Confirm this.
-                                     client.fetch_all_private_images(),
-                                     client.fetch_all_floating_ips()))
-    ### TODO: If an object is in the process of being deleted,
-    ### `fetch_current_action` may error out.  Handle this.
-
 if __name__ == '__main__':
     main()
@@ -86,12 +86,13 @@ def main(argv=None, parsed=None):
     if args.cmd == 'show':
         if args.domain:
             util.dump(util.rmdups(map(client.fetch_domain, args.domain),
-                                  'domain', 'name'))
+                                  'domain', 'name'), args.format)
         else:
-            util.dump(client.fetch_all_domains())
+            util.dump(client.fetch_all_domains(), args.format)
 
     elif args.cmd == 'new':
-        util.dump(client.create_domain(args.domain, args.ip_address))
+        util.dump(client.create_domain(args.domain, args.ip_address),
+                  args.format)
 
     elif args.cmd == 'delete':
         domains = util.rmdups(map(client.fetch_domain, args.domain), 'domain',
@@ -103,9 +104,9 @@ def main(argv=None, parsed=None):
         domain = client.fetch_domain(args.domain)
         if args.record_id:
             util.dump(util.rmdups(map(domain.fetch_record, args.record_id),
-                                  'record'))
+                                  'record'), args.format)
         else:
-            util.dump(domain.fetch_all_records())
+            util.dump(domain.fetch_all_records(), args.format)
 
     elif args.cmd == 'new-record':
         domain = client.fetch_domain(args.domain)
@@ -117,7 +118,7 @@ def main(argv=None, parsed=None):
                          r.id != newrec.id]
             for r in recs:
                 r.delete()
-        util.dump(newrec)
+        util.dump(newrec, args.format)
 
     elif args.cmd == 'update-record':
         rec = client.fetch_domain(args.domain).fetch_record(args.record_id)
@@ -130,7 +131,7 @@ def main(argv=None, parsed=None):
                 attrs[a] = None
         if not attrs:
             util.die('No fields to update specified')
-        util.dump(rec.update_record(**attrs))
+        util.dump(rec.update_record(**attrs), args.format)
 
     elif args.cmd == 'delete-record':
         domain = client.fetch_domain(args.domain)
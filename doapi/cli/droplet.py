@@ -31,6 +31,11 @@ unary_cmds = {
     "shutdown":                  UnaryCmd('Attempt to gracefully shut down a droplet', 'shutdown',                  True,  True),
 }
 
+# Subcommands that irreversibly delete or overwrite droplets or their data.
+# Power operations and other reversible actions are not included, so that they
+# can still resolve names from the disk cache.
+destructive_cmds = {"delete", "rebuild", "resize", "restore"}
+
 create_rate = 10  # maximum number of droplets to create at once
 
 def main(argv=None, parsed=None):
@@ -182,17 +187,18 @@ def main(argv=None, parsed=None):
     cmd_untag.add_argument('droplet', nargs='+', help='ID or name of a droplet')
 
     args = parser.parse_args(argv, parsed)
-    client, cache = util.mkclient(args)
+    client, cache = util.mkclient(args, args.cmd in destructive_cmds)
     if args.cmd == 'show':
         if args.tag is not None:
             if args.droplet:
                 util.die('--tag and droplets are mutually exclusive')
             tag = client.fetch_tag(args.tag)
-            util.dump(tag.fetch_all_droplets())
+            util.dump(tag.fetch_all_droplets(), args.format)
         elif args.droplet:
-            util.dump(cache.get_droplets(args.droplet, multiple=args.multiple))
+            drops = cache.get_droplets(args.droplet, multiple=args.multiple)
+            util.dump(cache.fresh("droplet", drops), args.format)
         else:
-            util.dump(client.fetch_all_droplets())
+            util.dump(client.fetch_all_droplets(), args.format)
 
     elif args.cmd == 'new':
         params = {
@@ -230,9 +236,9 @@ def main(argv=None, parsed=None):
                                           for i in range(0, len(fprint), 2))
                     except (IndexError, TypeError):
                         util.die('{0}: no such SSH key'.format(kname))
-                    try:
-                        key = cache.caches["sshkey"]["fingerprint"][fprint][0]
-                    except LookupError:
+                    key = cache.get_sshkey(fprint, multiple=False,
+                                           mandatory=False)
+                    if key is None:
                         if len(keyparts) > 2 and keyparts[2] != '':
                             newname = keyparts[2]
                         else:
@@ -249,6 +255,7 @@ def main(argv=None, parsed=None):
         drops = []
         for i in range(0, len(args.name), create_rate):
             drops.extend(client.create_multiple_droplets(args.name[i:i+create_rate], **params))
+        cache.invalidate("droplet")
         if args.wait:
             drops = util.catch_timeout(client.wait_droplets(
                 drops,
@@ -256,7 +263,7 @@ def main(argv=None, parsed=None):
             ))
             ### Note: This will cause problems when fetching a pre-existing
             ###       droplet that isn't active.
-        util.dump(drops)
+        util.dump(drops, args.format)
 
     elif args.cmd == 'act' and (args.tag is not None or args.droplet == []):
         if (args.tag is not None) == (args.droplet != []):
@@ -271,7 +278,7 @@ def main(argv=None, parsed=None):
         actions = tag.act_on_droplets(type=args.type, **params)
         if args.wait:
             actions = util.catch_timeout(client.wait_actions(actions))
-        util.dump(actions)
+        util.dump(actions, args.format)
 
     elif args.cmd in ('act', 'actions', 'wait'):
         drops = cache.get_droplets(args.droplet, multiple=args.multiple)
@@ -287,11 +294,13 @@ def main(argv=None, parsed=None):
             drops = cache.get_droplets(args.droplet, multiple=args.multiple)
             for d in drops:
                 d.delete()
+        cache.invalidate("droplet")
 
     elif args.cmd in unary_cmds:
         # Fetch all of the droplets first so that an invalid droplet
         # specification won't cause some actions to start and others not.
         about = unary_cmds[args.cmd]
+        result = None
         if about.taggable:
             if (args.tag is not None) == (args.droplet != []):
                 util.die('Specify either a --tag or droplets, but not both')
@@ -300,10 +309,16 @@ def main(argv=None, parsed=None):
                 output = getattr(tag, about.method)()
         if not about.taggable or args.tag is None:
             drops = cache.get_droplets(args.droplet, multiple=args.multiple)
-            output = map(methodcaller(about.method), drops)
+            if about.waitable:
+                result = util.bulk_act(client, drops,
+                                       methodcaller(about.method))
+                output = result.actions
+            else:
+                output = map(methodcaller(about.method), drops)
         if about.waitable and args.wait:
             output = util.catch_timeout(client.wait_actions(output))
-        util.dump(output)
+        util.dump(output, args.format)
+        util.exit_if_failed(result)
 
     elif args.cmd == 'restore':
         drop = cache.get_droplet(args.droplet, multiple=False)
@@ -314,36 +329,45 @@ def main(argv=None, parsed=None):
                 act = act.wait()
             except WaitTimeoutError as e:
                 act = e.in_progress[0]
-        util.dump(act)
+        util.dump(act, args.format)
 
     elif args.cmd == 'resize':
         drops = cache.get_droplets(args.droplet, multiple=args.multiple)
-        acts = [d.resize(args.size, disk=args.disk) for d in drops]
+        result = util.bulk_act(client, drops,
+                               methodcaller('resize', args.size,
+                                            disk=args.disk))
+        acts = result.actions
         if args.wait:
             acts = util.catch_timeout(client.wait_actions(acts))
-        util.dump(acts)
+        util.dump(acts, args.format)
+        util.exit_if_failed(result)
 
     elif args.cmd == 'rebuild':
         drops = cache.get_droplets(args.droplet, multiple=args.multiple)
         if args.image is not None:
             img = cache.get_image(args.image, multiple=False)
-            acts = [d.rebuild(img) for d in drops]
+            result = util.bulk_act(client, drops,
+                                   methodcaller('rebuild', img))
         else:
-            acts = [d.rebuild(d.image) for d in drops]
+            result = util.bulk_act(client, drops,
+                                   lambda d: d.rebuild(d.image))
+        acts = result.actions
         if args.wait:
             acts = util.catch_timeout(client.wait_actions(acts))
-        util.dump(acts)
+        util.dump(acts, args.format)
+        util.exit_if_failed(result)
 
     elif args.cmd == 'rename':
         cache.check_name_dup("droplet", args.name, args.unique)
         drop = cache.get_droplet(args.droplet, multiple=False)
         act = drop.rename(args.name)
+        cache.invalidate("droplet")
         if args.wait:
             try:
                 act = act.wait()
             except WaitTimeoutError as e:
                 act = e.in_progress[0]
-        util.dump(act)
+        util.dump(act, args.format)
 
     elif args.cmd == 'snapshot':
         cache.check_name_dup("image", args.name, args.unique)
@@ -352,27 +376,36 @@ def main(argv=None, parsed=None):
         elif args.tag is not None:
             tag = client.fetch_tag(args.tag)
             acts = tag.snapshot(args.name)
+            result = None
         else:
             drops = cache.get_droplets(args.droplet, multiple=args.multiple)
-            acts = map(methodcaller('snapshot', args.name), drops)
+            result = util.bulk_act(client, drops,
+                                   methodcaller('snapshot', args.name))
+            acts = result.actions
+        cache.invalidate("image")
         if args.wait:
             acts = util.catch_timeout(client.wait_actions(acts))
-        util.dump(acts)
+        util.dump(acts, args.format)
+        util.exit_if_failed(result)
 
     elif args.cmd == 'change-kernel':
         drops = cache.get_droplets(args.droplet, multiple=args.multiple)
-        acts = [d.change_kernel(args.kernel) for d in drops]
+        result = util.bulk_act(client, drops,
+                               methodcaller('change_kernel', args.kernel))
+        acts = result.actions
         if args.wait:
             acts = util.catch_timeout(client.wait_actions(acts))
-        util.dump(acts)
+        util.dump(acts, args.format)
+        util.exit_if_failed(result)
 
     elif args.cmd == 'neighbors':
         if args.droplet:
             util.dump(map(methodcaller('fetch_all_neighbors'),
                           cache.get_droplets(args.droplet,
-                                             multiple=args.multiple)))
+                                             multiple=args.multiple)),
+                      args.format)
         else:
-            util.dump(client.fetch_all_droplet_neighbors())
+            util.dump(client.fetch_all_droplet_neighbors(), args.format)
 
     elif args.cmd == 'tag':
         tag = client.fetch_tag(args.tag_name)
@@ -1,4 +1,5 @@
 import argparse
+from   operator  import methodcaller
 from   six.moves import map  # pylint: disable=redefined-builtin
 from   .         import _util as util
 from   ..        import WaitTimeoutError
@@ -45,9 +46,9 @@ def main(argv=None, parsed=None):
 
     if args.cmd == 'show':
         if args.ip:
-            util.dump(util.rmdups(map(client.fetch_floating_ip, map(maybeInt, args.ip)), 'floating IP', 'ip'))
+            util.dump(util.rmdups(map(client.fetch_floating_ip, map(maybeInt, args.ip)), 'floating IP', 'ip'), args.format)
         else:
-            util.dump(client.fetch_all_floating_ips())
+            util.dump(client.fetch_all_floating_ips(), args.format)
 
     elif args.cmd == 'new':
         if args.droplet is not None:
@@ -61,7 +62,7 @@ def main(argv=None, parsed=None):
             except WaitTimeoutError:
                 pass
             newip = newip.fetch()
-        util.dump(newip)
+        util.dump(newip, args.format)
 
     elif args.cmd == 'assign':
         floip = client.fetch_floating_ip(maybeInt(args.ip))
@@ -72,14 +73,16 @@ def main(argv=None, parsed=None):
                 act = act.wait()
             except WaitTimeoutError as e:
                 act = e.in_progress[0]
-        util.dump(act)
+        util.dump(act, args.format)
 
     elif args.cmd == 'unassign':
         floips = util.rmdups(map(client.fetch_floating_ip, map(maybeInt, args.ip)), 'floating IP', 'ip')
-        acts = [fi.unassign() for fi in floips]
+        result = util.bulk_act(client, floips, methodcaller('unassign'))
+        acts = result.actions
         if args.wait:
             acts = util.catch_timeout(client.wait_actions(acts))
-        util.dump(acts)
+        util.dump(acts, args.format)
+        util.exit_if_failed(result)
 
     elif args.cmd == 'delete':
         floips = util.rmdups(map(client.fetch_floating_ip, map(maybeInt, args.ip)), 'floating IP', 'ip')
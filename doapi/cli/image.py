@@ -1,8 +1,11 @@
 import argparse
-from   six.moves import map  # pylint: disable=redefined-builtin
+from   operator  import methodcaller
 from   .         import _util as util
 from   ..image   import Image
 
+# Subcommands that irreversibly delete or overwrite images
+destructive_cmds = {"convert", "delete"}
+
 def main(argv=None, parsed=None):
     parser = argparse.ArgumentParser(parents=[util.universal],
                                      prog='doapi-image',
@@ -68,45 +71,55 @@ def main(argv=None, parsed=None):
     util.add_actioncmds(cmds, 'image')
 
     args = parser.parse_args(argv, parsed)
-    client, cache = util.mkclient(args)
+    client, cache = util.mkclient(args, args.cmd in destructive_cmds)
 
     if args.cmd == 'show':
         if args.type is not None:
             if args.image:
                 util.die('--type and image arguments are mutually exclusive')
-            util.dump(client.fetch_all_images(type=args.type))
+            util.dump(client.fetch_all_images(type=args.type), args.format)
         elif args.private:
             if args.image:
                 util.die('--private and image arguments are mutually exclusive')
-            util.dump(client.fetch_all_private_images())
+            util.dump(client.fetch_all_private_images(), args.format)
         elif args.image:
-            util.dump(cache.get_images(args.image, multiple=args.multiple))
+            imgs = cache.get_images(args.image, multiple=args.multiple)
+            util.dump(cache.fresh("image", imgs), args.format)
         else:
-            util.dump(client.fetch_all_images())
+            util.dump(client.fetch_all_images(), args.format)
 
     elif args.cmd == 'delete':
         imgs = cache.get_images(args.image, multiple=args.multiple)
         for i in imgs:
             i.delete()
+        cache.invalidate("image")
 
     elif args.cmd == 'update':
         cache.check_name_dup("image", args.name, args.unique)
         img = cache.get_image(args.image, multiple=False)
-        util.dump(img.update_image(args.name))
+        img = img.update_image(args.name)
+        cache.invalidate("image")
+        util.dump(img, args.format)
 
     elif args.cmd == 'transfer':
         imgs = cache.get_images(args.image, multiple=args.multiple)
-        acts = (i.transfer(args.region) for i in imgs)
+        result = util.bulk_act(client, imgs,
+                               methodcaller('transfer', args.region))
+        acts = result.actions
         if args.wait:
             acts = util.catch_timeout(client.wait_actions(acts))
-        util.dump(acts)
+        util.dump(acts, args.format)
+        util.exit_if_failed(result)
 
     elif args.cmd == 'convert':
         imgs = cache.get_images(args.image, multiple=args.multiple)
-        acts = map(Image.convert, imgs)
+        result = util.bulk_act(client, imgs, Image.convert)
+        acts = result.actions
+        cache.invalidate("image")
         if args.wait:
             acts = util.catch_timeout(client.wait_actions(acts))
-        util.dump(acts)
+        util.dump(acts, args.format)
+        util.exit_if_failed(result)
 
     elif args.cmd in ('act', 'actions', 'wait'):
         imgs = cache.get_images(args.image, multiple=args.multiple)
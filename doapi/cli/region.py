@@ -8,7 +8,7 @@ def main(argv=None, parsed=None):
                                                  ' droplet regions')
     args = parser.parse_args(argv, parsed)
     client, _ = util.mkclient(args)
-    util.dump(client.fetch_all_regions())
+    util.dump(client.fetch_all_regions(), args.format)
 
 if __name__ == '__main__':
     main()
@@ -31,9 +31,10 @@ def main(argv=None, parsed=None):
         # Using "with" would cause `args.dump_header` to close afterwards,
         # which would cause problems if it was stdout.  "with" technically
         # doesn't provide any benefit here anyway.
-        util.dump(dict(client.last_response.headers), fp=args.dump_header)
+        util.dump(dict(client.last_response.headers), args.format,
+                  fp=args.dump_header)
     if response is not None:
-        util.dump(response)
+        util.dump(response, args.format)
 
 if __name__ == '__main__':
     main()
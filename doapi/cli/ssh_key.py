@@ -46,27 +46,33 @@ def main(argv=None, parsed=None):
     cmd_update.add_argument('name', help='new name for the SSH key')
 
     args = parser.parse_args(argv, parsed)
-    client, cache = util.mkclient(args)
+    client, cache = util.mkclient(args, args.cmd == 'delete')
 
     if args.cmd == 'show':
         if args.ssh_key:
-            util.dump(cache.get_sshkeys(args.ssh_key, multiple=args.multiple))
+            keys = cache.get_sshkeys(args.ssh_key, multiple=args.multiple)
+            util.dump(cache.fresh("sshkey", keys), args.format)
         else:
-            util.dump(client.fetch_all_ssh_keys())
+            util.dump(client.fetch_all_ssh_keys(), args.format)
 
     elif args.cmd == 'new':
         cache.check_name_dup("sshkey", args.name, args.unique)
-        util.dump(client.create_ssh_key(args.name, args.pubkey.read().strip()))
+        key = client.create_ssh_key(args.name, args.pubkey.read().strip())
+        cache.invalidate("sshkey")
+        util.dump(key, args.format)
 
     elif args.cmd == 'delete':
         keys = cache.get_sshkeys(args.ssh_key, multiple=args.multiple)
         for k in keys:
             k.delete()
+        cache.invalidate("sshkey")
 
     elif args.cmd == 'update':
         cache.check_name_dup("sshkey", args.name, args.unique)
         key = cache.get_sshkey(args.ssh_key, multiple=False)
-        util.dump(key.update_ssh_key(args.name))
+        key = key.update_ssh_key(args.name)
+        cache.invalidate("sshkey")
+        util.dump(key, args.format)
 
     else:
         assert False, 'No path defined for command {0!r}'.format(args.cmd)
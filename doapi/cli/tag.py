@@ -30,12 +30,12 @@ def main(argv=None, parsed=None):
 
     if args.cmd == 'show':
         if args.tag:
-            util.dump(map(client.fetch_tag, args.tag))
+            util.dump(map(client.fetch_tag, args.tag), args.format)
         else:
-            util.dump(client.fetch_all_tags())
+            util.dump(client.fetch_all_tags(), args.format)
 
     elif args.cmd == 'new':
-        util.dump(map(client.create_tag, args.name))
+        util.dump(map(client.create_tag, args.name), args.format)
 
     elif args.cmd == 'delete':
         tags = list(map(client.fetch_tag, args.tag))
@@ -44,7 +44,7 @@ def main(argv=None, parsed=None):
 
     elif args.cmd == 'update':
         tag = client.fetch_tag(args.tag)
-        util.dump(tag.update_tag(args.name))
+        util.dump(tag.update_tag(args.name), args.format)
 
     else:
         assert False, 'No path defined for command {0!r}'.format(args.cmd)
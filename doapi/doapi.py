@@ -1,15 +1,23 @@
-import json
-from   time         import sleep, time
+from   collections  import OrderedDict
+from   concurrent.futures import ThreadPoolExecutor
+import threading
+from   time         import gmtime, sleep, strftime, time
 import requests
 from   six          import iteritems, string_types
 from   six.moves    import map  # pylint: disable=redefined-builtin
-from   .base        import Region, Size, Account, DOAPIError, DOEncoder, \
-                            WaitTimeoutError
+from   .            import _codec, _paging, _refresh
+from   .base        import Region, Size, Account, DOAPIError, \
+                            WaitTimeoutError, fromISO8601
 from   .action      import Action
+from   .bulk        import BulkItem, BulkResult
 from   .domain      import Domain
+from   .ratelimit   import RateLimiter
+from   .retry       import RetryPolicy
 from   .droplet     import Droplet
 from   .floating_ip import FloatingIP
 from   .image       import Image
+from   .poller      import ActionPoller
+from   .polling     import PollSchedule
 from   .ssh_key     import SSHKey
 from   .tag         import Tag
 
@@ -19,12 +27,24 @@ class doapi(object):
     creating and fetching resources.  The resource objects returned by these
     methods have methods of their own for manipulating them individually.
 
+    A single `doapi` object may be used by multiple threads at once; in
+    particular, :meth:`request`, :meth:`paginate`, the ``fetch_*`` methods,
+    and the "wait" methods can all be called concurrently.  The
+    :attr:`last_response`, :attr:`last_meta`, and :attr:`last_rate_limit`
+    attributes describe the most recent request made by the calling thread;
+    note that when :meth:`paginate` fetches pages concurrently or in the
+    background, those requests are made by other threads.
+
+    .. versionchanged:: 0.3.0
+        Made safe for concurrent use
+
     :param str api_token: the API token to use for authentication
     :param string endpoint: the URL relative to which requests will be made
     :param number timeout: the ``timeout`` value to use when making requests
     :type timeout: float, tuple, or `None`
     :param number wait_interval: the default number of seconds that "wait"
-        operations will sleep for between requests
+        operations will sleep for between requests (unless ``poll_schedule``
+        is set)
     :param wait_time: the default number of seconds after which "wait"
         operations will return, or `None` or a negative number to wait
         indefinitely
@@ -32,13 +52,65 @@ class doapi(object):
     :param per_page: the default number of objects that :meth:`paginate` will
         fetch on each request, or `None` to leave unspecified
     :type per_page: integer or `None`
+    :param page_workers: the default number of pages that :meth:`paginate`
+        will fetch concurrently once the total number of results is known, or
+        `None` to fetch pages one at a time
+    :type page_workers: integer or `None`
+    :param prefetch: the default number of pages that :meth:`paginate` will
+        fetch in the background ahead of the values being consumed, or `None`
+        to only fetch a page once the previous one has been consumed
+    :type prefetch: integer or `None`
+    :param rate_limiter: a `RateLimiter` for pacing requests to stay within
+        the API's rate limit, `True` to create a new one, or `None` to make
+        requests as fast as possible
+    :type rate_limiter: `RateLimiter`, `True`, or `None`
+    :param retry: a `RetryPolicy` describing how to retry requests that fail
+        with transient errors, `True` to use the default policy, or `None` to
+        never retry
+    :type retry: `RetryPolicy`, `True`, or `None`
+    :param int pool_connections: the number of per-host connection pools to
+        cache
+    :param pool_maxsize: the maximum number of connections to keep open to
+        the API endpoint at once; this should be at least the number of
+        threads that will use the `doapi` object concurrently.  Defaults to
+        the greater of 10 and ``page_workers``.
+    :type pool_maxsize: integer or `None`
+    :param bool pool_block: whether a thread that needs a connection when
+        ``pool_maxsize`` are already in use should wait for one to become
+        free rather than opening (and then discarding) an extra connection
+    :param bool keep_alive: whether to reuse connections between requests
+    :param session: a pre-configured :class:`requests.Session` to perform
+        requests through, in which case the ``pool_*`` and ``keep_alive``
+        parameters are ignored
+    :type session: `requests.Session` or `None`
+    :param poll_schedule: a `PollSchedule` for "wait" operations to follow
+        instead of polling every ``wait_interval`` seconds, `True` to use the
+        default schedule, or `None` to always use ``wait_interval``
+    :type poll_schedule: `PollSchedule`, `True`, or `None`
     """
 
     #: The official DigitalOcean API endpoint
     DEFAULT_ENDPOINT = 'https://api.digitalocean.com'
 
+    #: The largest number of objects that the API will return on one page
+    MAX_PER_PAGE = 200
+
+    #: The maximum number of times to send a request that keeps receiving 429
+    #: "Too Many Requests" responses when :attr:`rate_limiter` is set but
+    #: :attr:`retry` is not
+    MAX_RATE_LIMITED_ATTEMPTS = 5
+
+    #: The maximum number of distinct lists in nested `Region` and `Size`
+    #: values that are shared between resources (see :meth:`_intern`); once
+    #: this many have been seen, the least recently added are forgotten
+    MAX_INTERNED = 1024
+
     def __init__(self, api_token, endpoint=DEFAULT_ENDPOINT, timeout=None,
-                 wait_interval=2, wait_time=None, per_page=None):
+                 wait_interval=2, wait_time=None, per_page=None,
+                 page_workers=None, prefetch=None, rate_limiter=None,
+                 retry=None, pool_connections=10, pool_maxsize=None,
+                 pool_block=False, keep_alive=True, session=None,
+                 poll_schedule=None):
         #: The API token used for authentication
         self.api_token = api_token
         #: The API endpoint URL relative to which requests will be made
@@ -58,24 +130,99 @@ class doapi(object):
         #: The default number of objects that :meth:`paginate` will fetch on
         #: each request, or `None` to leave unspecified
         self.per_page = per_page
-        #: The :class:`requests.Response` object returned for the most recent
-        #: request, or `None` if no requests have been made yet
-        self.last_response = None
-        #: The ``meta`` field in the body of the most recent response, or
-        #: `None` if there was no such field, no requests have been made yet,
-        #: or the last response was an error
-        self.last_meta = None
+        #: The default number of pages that :meth:`paginate` will fetch
+        #: concurrently once the total number of results is known, or `None`
+        #: to fetch pages one at a time
+        self.page_workers = page_workers
+        #: The default number of pages that :meth:`paginate` will fetch in the
+        #: background ahead of the values being consumed, or `None` to only
+        #: fetch a page once the previous one has been consumed
+        self.prefetch = prefetch
+        if rate_limiter is True:
+            rate_limiter = RateLimiter()
+        #: The `RateLimiter` used to pace requests, or `None` if requests are
+        #: not paced
+        self.rate_limiter = rate_limiter
+        if retry is True:
+            retry = RetryPolicy()
+        #: The `RetryPolicy` for requests that fail with transient errors, or
+        #: `None` if requests are never retried
+        self.retry = retry
+        if poll_schedule is True:
+            poll_schedule = PollSchedule()
+        #: The `PollSchedule` that "wait" operations follow when not given an
+        #: explicit ``wait_interval``, or `None` to always poll every
+        #: :attr:`wait_interval` seconds
+        self.poll_schedule = poll_schedule
+        #: The `ActionPoller` that waits on actions in the background for
+        #: :meth:`Action.as_future`
+        self.poller = ActionPoller(self)
+        self._local = threading.local()
+        # Lists in nested `Region` and `Size` fields shared between
+        # resources; see `_intern`
+        self._interned = OrderedDict()
+        self._intern_lock = threading.Lock()
+        if session is None:
+            if pool_maxsize is None:
+                pool_maxsize = max(10, page_workers or 0)
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(
+                pool_connections=pool_connections,
+                pool_maxsize=pool_maxsize,
+                pool_block=pool_block,
+            )
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            if not keep_alive:
+                session.headers["Connection"] = "close"
         #: The :class:`requests.Session` object through which all requests are
         #: performed
-        self.session = requests.Session()
+        self.session = session
+
+    @property
+    def last_response(self):
+        """
+        The :class:`requests.Response` object returned for the most recent
+        request made by the current thread, or `None` if the thread has not
+        made any requests yet
+
+        .. versionchanged:: 0.3.0
+            Tracked separately for each thread
+        """
+        return getattr(self._local, 'response', None)
+
+    @last_response.setter
+    def last_response(self, value):
+        self._local.response = value
+
+    @property
+    def last_meta(self):
+        """
+        The ``meta`` field in the body of the most recent response received by
+        the current thread, or `None` if there was no such field, the thread
+        has not made any requests yet, or the last response was an error
+
+        .. versionchanged:: 0.3.0
+            Tracked separately for each thread
+        """
+        return getattr(self._local, 'meta', None)
+
+    @last_meta.setter
+    def last_meta(self, value):
+        self._local.meta = value
 
     def close(self):
         """
-        Close the session.  All API methods will be unusable after calling this
-        method.
+        Close the session and the :attr:`poller` (cancelling any futures it
+        has not resolved yet).  All API methods will be unusable after calling
+        this method.
+
+        .. versionchanged:: 0.3.0
+            Also closes :attr:`poller`
 
         :return: `None`
         """
+        self.poller.close()
         self.session.close()
 
     def request(self, url, params=None, data=None, method='GET'):
@@ -83,6 +230,20 @@ class doapi(object):
         Perform an HTTP request and return the response body as a decoded JSON
         value
 
+        If :attr:`rate_limiter` is set, the request is delayed as needed to
+        stay within the rate limit, and a 429 "Too Many Requests" response
+        causes the request to be retried after the rate limit resets, up to
+        the number of attempts allowed by :attr:`retry` (or
+        `MAX_RATE_LIMITED_ATTEMPTS` if that is `None`).
+
+        If :attr:`retry` is set, requests that fail with a transient error are
+        retried as specified by the `RetryPolicy`; only once the policy gives
+        up is the error raised.
+
+        .. versionchanged:: 0.3.0
+            Requests are paced by :attr:`rate_limiter` and retried according to
+            :attr:`retry`
+
         :param str url: the URL to make the request of.  If ``url`` begins with
             a forward slash, :attr:`endpoint` is prepended to it; otherwise,
             ``url`` is treated as an absolute URL.
@@ -109,40 +270,68 @@ class doapi(object):
             "timeout": self.timeout,
         }
         method = method.upper()
+        if method not in ('GET', 'POST', 'PUT', 'DELETE'):
+            raise ValueError('Unrecognized HTTP method: ' + repr(method))
         if data is not None:
             if not isinstance(data, string_types):
-                data = json.dumps(data, cls=DOEncoder)
+                data = _codec.dumps(data)
             attrs["data"] = data
             attrs["headers"]["Content-Type"] = "application/json"
-        if method == 'GET':
-            r = self.session.get(url, **attrs)
-        elif method == 'POST':
-            r = self.session.post(url, **attrs)
-        elif method == 'PUT':
-            r = self.session.put(url, **attrs)
-        elif method == 'DELETE':
-            r = self.session.delete(url, **attrs)
-        else:
-            raise ValueError('Unrecognized HTTP method: ' + repr(method))
+        limiter = self.rate_limiter
+        retry = self.retry
+        attempt = 0
+        while True:
+            attempt += 1
+            if limiter is not None:
+                limiter.acquire()
+            try:
+                r = self.session.request(method, url, **attrs)
+            except (requests.ConnectionError, requests.Timeout):
+                if retry is None or not retry.should_retry(method, attempt):
+                    raise
+                sleep(retry.delay(attempt))
+                continue
+            if limiter is not None:
+                limiter.update(r.headers, exhausted=r.status_code == 429)
+                if r.status_code == 429:
+                    # The limiter makes the next attempt wait for the reset.
+                    if self._retry_rate_limited(retry, method, attempt):
+                        continue
+                    break
+            if retry is not None and \
+                    retry.should_retry(method, attempt, r.status_code):
+                sleep(retry.delay(attempt, r.status_code, r.headers))
+                continue
+            break
         self.last_response = r
         self.last_meta = None
         if not r.ok:
             raise DOAPIError(r)
-        if r.text.strip():
+        if r.content.strip():
             # Even when returning "no content", the API can still return
             # whitespace.
-            response = r.json()
+            response = _codec.loads(r.content)
             try:
                 self.last_meta = response["meta"]
             except (KeyError, TypeError):
                 pass
             return response
 
+    @classmethod
+    def _retry_rate_limited(cls, retry, method, attempt):
+        # Whether to resend a request that got a 429 while a rate limiter is
+        # in use; limited by the `RetryPolicy` if there is one, or else by
+        # `MAX_RATE_LIMITED_ATTEMPTS`
+        if retry is None:
+            return attempt < cls.MAX_RATE_LIMITED_ATTEMPTS
+        return retry.should_retry(method, attempt, 429)
+
     @property
     def last_rate_limit(self):
         """
         A `dict` of the rate limit information returned in the most recent
-        response, or `None` if no requests have been made yet.  The `dict`
+        response received by the current thread, or `None` if the thread has
+        not made any requests yet.  The `dict`
         consists of all headers whose names begin with ``"RateLimit"`` (case
         insensitive).
 
@@ -161,7 +350,8 @@ class doapi(object):
             return {k:v for k,v in iteritems(self.last_response.headers)
                         if k.lower().startswith('ratelimit')}
 
-    def paginate(self, url, key, params=None):
+    def paginate(self, url, key, params=None, page_workers=None,
+                 prefetch=None, fields=None):
         """
         Fetch a sequence of paginated resources from the API endpoint.  The
         initial request to ``url`` and all subsequent requests must respond
@@ -170,6 +360,29 @@ class doapi(object):
         the URL in the ``.links.pages.next`` field until the responses no
         longer contain that field.
 
+        If ``page_workers`` is greater than 1 and the first response reports
+        the total number of results in its ``.meta.total`` field, the URLs of
+        the remaining pages are computed up front and up to ``page_workers`` of
+        them are fetched concurrently.  Values are still yielded in the order
+        in which the API lists them.
+
+        Otherwise, if ``prefetch`` is positive, the ``next`` links are followed
+        in a background thread that stays up to ``prefetch`` pages ahead of
+        the values being consumed, so that the next page is downloaded while
+        the caller is still processing the current one.
+
+        Each page is requested with :meth:`request`, so when :attr:`retry` is
+        set, a transient failure partway through is retried for just the page
+        that failed.
+
+        If ``fields`` is given, each value that is a JSON object is replaced by
+        a `dict` containing only those of its fields listed in ``fields``
+        before any values from its page are yielded, so that the rest of the
+        page's data can be freed immediately.
+
+        .. versionchanged:: 0.3.0
+            ``page_workers``, ``prefetch``, and ``fields`` parameters added
+
         :param str url: the URL to make the initial request of.  If ``url``
             begins with a forward slash, :attr:`endpoint` is prepended to it;
             otherwise, ``url`` is treated as an absolute URL.
@@ -178,6 +391,16 @@ class doapi(object):
         :param dict params: parameters to add to the initial URL's query
             string.  A ``"per_page"`` parameter may be included to override
             the default :attr:`per_page` setting.
+        :param page_workers: the maximum number of pages to fetch at once;
+            defaults to :attr:`page_workers` if not specified or `None`
+        :type page_workers: integer or `None`
+        :param prefetch: the maximum number of pages to fetch ahead of the
+            consumer in the background; defaults to :attr:`prefetch` if not
+            specified or `None`
+        :type prefetch: integer or `None`
+        :param fields: the names of the fields to keep in each value, or `None`
+            to keep all fields
+        :type fields: iterable of strings or `None`
         :rtype: generator of decoded JSON values
         :raises ValueError: if a response body is not an object or ``key`` is
             not one of its keys
@@ -187,20 +410,50 @@ class doapi(object):
             params = {}
         if self.per_page is not None and "per_page" not in params:
             params = dict(params, per_page=self.per_page)
+        if page_workers is None:
+            page_workers = self.page_workers
+        if prefetch is None:
+            prefetch = self.prefetch
+        if fields is not None:
+            fields = frozenset(fields)
         page = self.request(url, params=params)
-        while True:
-            try:
-                objects = page[key]
-            except (KeyError, TypeError):
-                raise ValueError('{0!r}: not a key of the response body'\
-                                 .format(key))
+        objects = self._page_objects(page, key, fields)
+        pages = None
+        if page_workers is not None and page_workers > 1:
+            urls = _paging.page_urls(page, len(objects))
+            if urls is not None:
+                pages = _paging.ParallelPages(self.request, urls, page_workers)
+        if pages is None:
+            if prefetch is not None and prefetch > 0:
+                pages = _paging.PrefetchPages(self.request, page, prefetch)
+            else:
+                pages = _paging.SequentialPages(self.request, page)
+        try:
             for obj in objects:
                 yield obj
-            try:
-                url = page["links"]["pages"]["next"]
-            except KeyError:
-                break
-            page = self.request(url)
+            for page in pages:
+                for obj in self._page_objects(page, key, fields):
+                    yield obj
+        finally:
+            pages.close()
+
+    @staticmethod
+    def _page_objects(page, key, fields=None):
+        try:
+            objects = page[key]
+        except (KeyError, TypeError):
+            raise ValueError('{0!r}: not a key of the response body'\
+                             .format(key))
+        if fields is not None:
+            objects = [{k:v for k,v in iteritems(obj) if k in fields}
+                       if isinstance(obj, dict) else obj
+                       for obj in objects]
+        return objects
+
+    def _listing(self, wrap, url, key, params, raw, fields):
+        # Common implementation of the `fetch_all_*` methods
+        objects = self.paginate(url, key, params=params, fields=fields)
+        return objects if raw else map(wrap, objects)
 
     def _droplet(self, obj):
         """
@@ -227,7 +480,7 @@ class doapi(object):
         """
         return self._droplet(obj).fetch()
 
-    def fetch_all_droplets(self, tag_name=None):
+    def fetch_all_droplets(self, tag_name=None, raw=False, fields=None):
         r"""
         Returns a generator that yields all of the droplets belonging to the
         account
@@ -235,17 +488,25 @@ class doapi(object):
         .. versionchanged:: 0.2.0
             ``tag_name`` parameter added
 
+        .. versionchanged:: 0.3.0
+            ``raw`` and ``fields`` parameters added
+
         :param tag_name: if non-`None`, only droplets with the given tag are
             returned
         :type tag_name: string or `Tag`
-        :rtype: generator of `Droplet`\ s
+        :param bool raw: whether to yield the `dict`\ s returned by the API
+            instead of constructing `Droplet` objects from them
+        :param fields: if non-`None`, only these fields of each result are
+            kept (see :meth:`paginate`)
+        :type fields: iterable of strings or `None`
+        :rtype: generator of `Droplet`\ s or `dict`\ s
         :raises DOAPIError: if the API endpoint replies with an error
         """
         params = {}
         if tag_name is not None:
             params["tag_name"] = str(tag_name)
-        return map(self._droplet, self.paginate('/v2/droplets', 'droplets',
-                                                params=params))
+        return self._listing(self._droplet, '/v2/droplets', 'droplets', params,
+                             raw, fields)
 
     def create_droplet(self, name, image, size, region, ssh_keys=None,
                        backups=None, ipv6=None, private_networking=None,
@@ -404,6 +665,11 @@ class doapi(object):
         .. versionchanged:: 0.2.0
             No longer waits for actions to complete
 
+        .. versionchanged:: 0.3.0
+            When waiting on many droplets, each round of polling lists all of
+            the account's droplets at once if that takes fewer requests than
+            fetching the droplets individually
+
         :param iterable droplets: an iterable of `Droplet`\ s and/or other
             values that are acceptable arguments to :meth:`fetch_droplet`
         :param status: When non-`None`, the desired value for the ``status``
@@ -432,13 +698,14 @@ class doapi(object):
             ### TODO: Is TypeError the right type of error?
             raise TypeError('Exactly one of "status" and "locked" must be'
                             ' specified')
-        droplets = map(self._droplet, droplets)
+        droplets = list(map(self._droplet, droplets))
+        refresh = _refresh.DropletSweep(self, droplets)
         if status is not None:
             return self._wait(droplets, "status", status, wait_interval,
-                              wait_time)
+                              wait_time, refresh)
         if locked is not None:
             return self._wait(droplets, "locked", bool(locked), wait_interval,
-                              wait_time)
+                              wait_time, refresh)
 
     def _action(self, obj):
         """
@@ -480,15 +747,69 @@ class doapi(object):
         # Slow yet guaranteed-correct implementation:
         #return max(self.fetch_all_actions(), key=lambda a: a.started_at)
 
-    def fetch_all_actions(self):
+    def fetch_all_actions(self, raw=False, fields=None):
         r"""
         Returns a generator that yields all of the actions associated with the
         account
 
+        .. versionchanged:: 0.3.0
+            ``raw`` and ``fields`` parameters added
+
+        :param bool raw: whether to yield the `dict`\ s returned by the API
+            instead of constructing `Action` objects from them
+        :param fields: if non-`None`, only these fields of each result are
+            kept (see :meth:`paginate`)
+        :type fields: iterable of strings or `None`
+        :rtype: generator of `Action`\ s or `dict`\ s
+        :raises DOAPIError: if the API endpoint replies with an error
+        """
+        return self._listing(self._action, '/v2/actions', 'actions', None,
+                             raw, fields)
+
+    def fetch_all_in_progress_actions(self, max_age=None):
+        r"""
+        .. versionadded:: 0.3.0
+
+        Returns a generator that yields all of the account's actions that are
+        currently in progress.  Rather than querying each resource's actions
+        separately, this scans the account-wide action listing from newest to
+        oldest.  By default, the entire listing is scanned; if ``max_age`` is
+        given, the scan stops at the first action that started more than
+        ``max_age`` seconds ago, on the assumption that any action older than
+        that has finished, which typically takes only a handful of requests.
+        Actions that have been running for longer than ``max_age`` are then
+        missed.
+
+        :param max_age: how many seconds into the past to look for in-progress
+            actions, or `None` (the default) to scan the account's entire
+            action history
+        :type max_age: number or `None`
         :rtype: generator of `Action`\ s
         :raises DOAPIError: if the API endpoint replies with an error
         """
-        return map(self._action, self.paginate('/v2/actions', 'actions'))
+        cutoff = self._action_cutoff(max_age)
+        # Fetching pages concurrently would mean fetching every page, so pages
+        # are requested one at a time, as many results at once as possible.
+        objects = self.paginate('/v2/actions', 'actions',
+                                params={"per_page": self.MAX_PER_PAGE},
+                                page_workers=0)
+        try:
+            for obj in objects:
+                if obj.get("status") == 'in-progress':
+                    yield self._action(obj)
+                if cutoff is not None and obj.get("started_at") and \
+                        fromISO8601(obj["started_at"]) < cutoff:
+                    break
+        finally:
+            objects.close()
+
+    @staticmethod
+    def _action_cutoff(max_age):
+        # The start time before which actions are assumed to have finished
+        if max_age is None:
+            return None
+        return fromISO8601(strftime('%Y-%m-%dT%H:%M:%SZ',
+                                    gmtime(time() - max_age)))
 
     def wait_actions(self, actions, wait_interval=None, wait_time=None):
         r"""
@@ -505,6 +826,11 @@ class doapi(object):
         .. versionchanged:: 0.2.0
             Raises `WaitTimeoutError` on timeout
 
+        .. versionchanged:: 0.3.0
+            When waiting on many actions, each round of polling first scans
+            the account's most recent actions, fetching individually only
+            those actions not found
+
         :param iterable actions: an iterable of `Action`\ s and/or other values
             that are acceptable arguments to :meth:`fetch_action`
         :param number wait_interval: how many seconds to sleep between
@@ -519,7 +845,52 @@ class doapi(object):
         :raises WaitTimeoutError: if ``wait_time`` is exceeded
         """
         return self._wait(map(self._action, actions), "done", True,
-                          wait_interval, wait_time)
+                          wait_interval, wait_time,
+                          _refresh.ActionSweep(self))
+
+    def bulk_act(self, resources, action, workers=10):
+        r"""
+        .. versionadded:: 0.3.0
+
+        Perform an action on each of the given resources, using up to
+        ``workers`` threads to make the requests concurrently.  A failure to
+        act on one resource does not prevent acting on the others; instead,
+        any exceptions raised are collected in the returned `BulkResult`, whose
+        :meth:`~BulkResult.wait` method can then be used to wait for the
+        started actions to finish.
+
+        For best results, ``workers`` should not exceed the ``pool_maxsize``
+        that the `doapi` object was constructed with.
+
+        :param iterable resources: the resources (e.g., `Droplet`\ s) to act
+            on
+        :param action: either the type of action to perform (which will be
+            passed to each resource's :meth:`~Droplet.act` method) or a
+            function that takes a resource, performs an action on it, and
+            returns the resulting `Action` (e.g.,
+            ``operator.methodcaller('resize', 's-2vcpu-4gb')``)
+        :type action: string or callable
+        :param int workers: the maximum number of requests to make at once
+        :rtype: BulkResult
+        """
+        if isinstance(action, string_types):
+            act_type = action
+            action = lambda r: r.act(type=act_type)
+        def run(resource):
+            try:
+                return BulkItem(resource, action(resource), None)
+            except (DOAPIError, requests.RequestException) as e:
+                return BulkItem(resource, None, e)
+        resources = list(resources)
+        if len(resources) <= 1 or workers <= 1:
+            items = list(map(run, resources))
+        else:
+            pool = ThreadPoolExecutor(max_workers=workers)
+            try:
+                items = list(pool.map(run, resources))
+            finally:
+                pool.shutdown()
+        return BulkResult(self, items)
 
     def wait_actions_on_objects(self, objects, wait_interval=None,
                                                wait_time=None):
@@ -586,15 +957,24 @@ class doapi(object):
         """
         return self._ssh_key(obj).fetch()
 
-    def fetch_all_ssh_keys(self):
+    def fetch_all_ssh_keys(self, raw=False, fields=None):
         r"""
         Returns a generator that yields all of the SSH public keys belonging to
         the account
 
-        :rtype: generator of `SSHKey`\ s
+        .. versionchanged:: 0.3.0
+            ``raw`` and ``fields`` parameters added
+
+        :param bool raw: whether to yield the `dict`\ s returned by the API
+            instead of constructing `SSHKey` objects from them
+        :param fields: if non-`None`, only these fields of each result are
+            kept (see :meth:`paginate`)
+        :type fields: iterable of strings or `None`
+        :rtype: generator of `SSHKey`\ s or `dict`\ s
         :raises DOAPIError: if the API endpoint replies with an error
         """
-        return map(self._ssh_key, self.paginate('/v2/account/keys', 'ssh_keys'))
+        return self._listing(self._ssh_key, '/v2/account/keys', 'ssh_keys',
+                             None, raw, fields)
 
     def create_ssh_key(self, name, public_key, **kwargs):
         """
@@ -648,18 +1028,27 @@ class doapi(object):
         """
         return self._image(self.request('/v2/images/' + slug)["image"])
 
-    def fetch_all_images(self, type=None, private=None):
+    def fetch_all_images(self, type=None, private=None, raw=False,
+                         fields=None):
         # pylint: disable=redefined-builtin
         r"""
         Returns a generator that yields all of the images available to the
         account
 
+        .. versionchanged:: 0.3.0
+            ``raw`` and ``fields`` parameters added
+
         :param type: the type of images to fetch: ``"distribution"``,
             ``"application"``, or all (`None`); default: `None`
         :type type: string or None
         :param bool private: whether to only return the user's private images;
             default: return all images
-        :rtype: generator of `Image`\ s
+        :param bool raw: whether to yield the `dict`\ s returned by the API
+            instead of constructing `Image` objects from them
+        :param fields: if non-`None`, only these fields of each result are
+            kept (see :meth:`paginate`)
+        :type fields: iterable of strings or `None`
+        :rtype: generator of `Image`\ s or `dict`\ s
         :raises DOAPIError: if the API endpoint replies with an error
         """
         params = {}
@@ -667,8 +1056,8 @@ class doapi(object):
             params["type"] = type
         if private is not None:
             params["private"] = 'true' if private else 'false'
-        return map(self._image, self.paginate('/v2/images', 'images',
-                                              params=params))
+        return self._listing(self._image, '/v2/images', 'images', params,
+                             raw, fields)
 
     def fetch_all_distribution_images(self):
         r"""
@@ -712,15 +1101,24 @@ class doapi(object):
         """
         return Region(obj, doapi_manager=self)
 
-    def fetch_all_regions(self):
+    def fetch_all_regions(self, raw=False, fields=None):
         r"""
         Returns a generator that yields all of the regions available to the
         account
 
-        :rtype: generator of `Region`\ s
+        .. versionchanged:: 0.3.0
+            ``raw`` and ``fields`` parameters added
+
+        :param bool raw: whether to yield the `dict`\ s returned by the API
+            instead of constructing `Region` objects from them
+        :param fields: if non-`None`, only these fields of each result are
+            kept (see :meth:`paginate`)
+        :type fields: iterable of strings or `None`
+        :rtype: generator of `Region`\ s or `dict`\ s
         :raises DOAPIError: if the API endpoint replies with an error
         """
-        return map(self._region, self.paginate('/v2/regions', 'regions'))
+        return self._listing(self._region, '/v2/regions', 'regions', None,
+                             raw, fields)
 
     def _size(self, obj):
         """
@@ -735,15 +1133,55 @@ class doapi(object):
         """
         return Size(obj, doapi_manager=self)
 
-    def fetch_all_sizes(self):
+    def _intern(self, obj):
+        """
+        Return a shallow copy of the `dict` ``obj`` in which each list value
+        is replaced by an equal list shared with other resources.  Resources
+        call this on their nested region & size fields when they are
+        constructed so that many droplets in the same region share a single
+        copy of the region's ``sizes`` and ``features`` (and the size's
+        ``regions``), which make up most of the nested data.  The copy itself
+        belongs to the calling resource alone.
+        """
+        obj = dict(obj)
+        interned = self._interned
+        for k, v in iteritems(obj):
+            if not isinstance(v, list) or not v:
+                continue
+            key = tuple(v)
+            try:
+                # Lookups are atomic, so the lock is only needed for updates.
+                shared = interned.get(key)
+            except TypeError:
+                # The list contains unhashable values, which aren't expected
+                # here; leave it unshared.
+                continue
+            if shared is None:
+                with self._intern_lock:
+                    shared = interned.setdefault(key, list(v))
+                    if len(interned) > self.MAX_INTERNED:
+                        interned.popitem(last=False)
+            obj[k] = shared
+        return obj
+
+    def fetch_all_sizes(self, raw=False, fields=None):
         r"""
         Returns a generator that yields all of the sizes available to the
         account
 
-        :rtype: generator of `Size`\ s
+        .. versionchanged:: 0.3.0
+            ``raw`` and ``fields`` parameters added
+
+        :param bool raw: whether to yield the `dict`\ s returned by the API
+            instead of constructing `Size` objects from them
+        :param fields: if non-`None`, only these fields of each result are
+            kept (see :meth:`paginate`)
+        :type fields: iterable of strings or `None`
+        :rtype: generator of `Size`\ s or `dict`\ s
         :raises DOAPIError: if the API endpoint replies with an error
         """
-        return map(self._size, self.paginate('/v2/sizes', 'sizes'))
+        return self._listing(self._size, '/v2/sizes', 'sizes', None,
+                             raw, fields)
 
     def fetch_account(self):
         """
@@ -780,15 +1218,24 @@ class doapi(object):
         """
         return self._domain(obj).fetch()
 
-    def fetch_all_domains(self):
+    def fetch_all_domains(self, raw=False, fields=None):
         r"""
         Returns a generator that yields all of the domains belonging to the
         account
 
-        :rtype: generator of `Domain`\ s
+        .. versionchanged:: 0.3.0
+            ``raw`` and ``fields`` parameters added
+
+        :param bool raw: whether to yield the `dict`\ s returned by the API
+            instead of constructing `Domain` objects from them
+        :param fields: if non-`None`, only these fields of each result are
+            kept (see :meth:`paginate`)
+        :type fields: iterable of strings or `None`
+        :rtype: generator of `Domain`\ s or `dict`\ s
         :raises DOAPIError: if the API endpoint replies with an error
         """
-        return map(self._domain, self.paginate('/v2/domains', 'domains'))
+        return self._listing(self._domain, '/v2/domains', 'domains', None,
+                             raw, fields)
 
     def create_domain(self, name, ip_address, **kwargs):
         """
@@ -842,16 +1289,24 @@ class doapi(object):
         """
         return self._floating_ip(obj).fetch()
 
-    def fetch_all_floating_ips(self):
+    def fetch_all_floating_ips(self, raw=False, fields=None):
         r"""
         Returns a generator that yields all of the floating IPs belonging to
         the account
 
-        :rtype: generator of `FloatingIP`\ s
+        .. versionchanged:: 0.3.0
+            ``raw`` and ``fields`` parameters added
+
+        :param bool raw: whether to yield the `dict`\ s returned by the API
+            instead of constructing `FloatingIP` objects from them
+        :param fields: if non-`None`, only these fields of each result are
+            kept (see :meth:`paginate`)
+        :type fields: iterable of strings or `None`
+        :rtype: generator of `FloatingIP`\ s or `dict`\ s
         :raises DOAPIError: if the API endpoint replies with an error
         """
-        return map(self._floating_ip, self.paginate('/v2/floating_ips',
-                                                    'floating_ips'))
+        return self._listing(self._floating_ip, '/v2/floating_ips',
+                             'floating_ips', None, raw, fields)
 
     def create_floating_ip(self, droplet_id=None, region=None, **kwargs):
         """
@@ -920,17 +1375,26 @@ class doapi(object):
         """
         return self._tag(obj).fetch()
 
-    def fetch_all_tags(self):
+    def fetch_all_tags(self, raw=False, fields=None):
         r"""
         .. versionadded:: 0.2.0
 
         Returns a generator that yields all of the tags belonging to the
         account
 
-        :rtype: generator of `Tag`\ s
+        .. versionchanged:: 0.3.0
+            ``raw`` and ``fields`` parameters added
+
+        :param bool raw: whether to yield the `dict`\ s returned by the API
+            instead of constructing `Tag` objects from them
+        :param fields: if non-`None`, only these fields of each result are
+            kept (see :meth:`paginate`)
+        :type fields: iterable of strings or `None`
+        :rtype: generator of `Tag`\ s or `dict`\ s
         :raises DOAPIError: if the API endpoint replies with an error
         """
-        return map(self._tag, self.paginate('/v2/tags', 'tags'))
+        return self._listing(self._tag, '/v2/tags', 'tags', None,
+                             raw, fields)
 
     def create_tag(self, name):
         """
@@ -947,19 +1411,41 @@ class doapi(object):
         })["tag"])
 
     def __eq__(self, other):
-        return type(self) is type(other) and vars(self) == vars(other)
+        if type(self) is not type(other):
+            return False
+        ours = dict(vars(self))
+        theirs = dict(vars(other))
+        # Per-thread state and caches don't affect equality
+        for attr in ("_local", "_interned", "_intern_lock", "poller"):
+            del ours[attr], theirs[attr]
+        return ours == theirs
 
     def __ne__(self, other):
         return not (self == other)  # pylint: disable=unneeded-not
 
-    def _wait(self, objects, attr, value, wait_interval=None, wait_time=None):
+    def _wait(self, objects, attr, value, wait_interval=None, wait_time=None,
+              refresh=None):
         r"""
         Calls the ``fetch`` method of each object in ``objects`` periodically
         until the ``attr`` attribute of each one equals ``value``, yielding the
         final state of each object as soon as it satisfies the condition.
 
-        If ``wait_time`` is exceeded, a `WaitTimeoutError` (containing any
-        remaining in-progress objects) is raised.
+        If ``wait_interval`` is not given and :attr:`poll_schedule` is set,
+        each object is instead polled on its own schedule as determined by the
+        `PollSchedule`.
+
+        If ``refresh`` is given, it is called on each round with the list of
+        objects that are due to be polled and must return an iterable of their
+        current states in the same order; this allows the objects to be
+        re-fetched in bulk when that is cheaper.  If ``refresh`` has a
+        ``would_sweep`` method (see `_refresh`) that reports that the objects
+        due to be polled would be re-fetched in bulk, all of the outstanding
+        objects are passed to ``refresh`` instead.
+
+        Polls are never scheduled past the end of ``wait_time``, so every
+        remaining object is polled one last time when it runs out.  If any
+        objects are still in progress after that, a `WaitTimeoutError`
+        (containing them) is raised.
 
         If a `KeyboardInterrupt` is caught, any remaining objects are returned
         immediately without waiting for completion.
@@ -967,17 +1453,22 @@ class doapi(object):
         .. versionchanged:: 0.2.0
             Raises `WaitTimeoutError` on timeout
 
+        .. versionchanged:: 0.3.0
+            Polls on :attr:`poll_schedule`'s schedule when set
+
         :param iterable objects: an iterable of `Resource`\ s with ``fetch``
             methods
         :param string attr: the attribute to watch
         :param value: the value of ``attr`` to wait for
         :param number wait_interval: how many seconds to sleep between
-            requests; defaults to :attr:`wait_interval` if not specified or
-            `None`
+            requests; defaults to following :attr:`poll_schedule` if set or
+            else sleeping for :attr:`wait_interval` if not specified or `None`
         :param number wait_time: the total number of seconds after which the
             method will raise an error if any objects have not yet completed,
             or a negative number to wait indefinitely; defaults to
             :attr:`wait_time` if not specified or `None`
+        :param callable refresh: a function for re-fetching the objects;
+            defaults to calling each object's ``fetch`` method
         :rtype: generator
         :raises DOAPIError: if the API endpoint replies with an error
         :raises WaitTimeoutError: if ``wait_time`` is exceeded
@@ -986,33 +1477,59 @@ class doapi(object):
         objects = list(objects)
         if not objects:
             return
+        schedule = self.poll_schedule if wait_interval is None else None
         if wait_interval is None:
             wait_interval = self.wait_interval
-        if wait_time < 0:
+        if wait_time is None:
+            wait_time = self.wait_time
+        start_time = time()
+        if wait_time is None or wait_time < 0:
             end_time = None
         else:
-            if wait_time is None:
-                wait_time = self.wait_time
-            if wait_time is None or wait_time < 0:
-                end_time = None
-            else:
-                end_time = time() + wait_time
-        while end_time is None or time() < end_time:
+            end_time = start_time + wait_time
+        if refresh is None:
+            refresh = _refresh.fetch_each
+        # The time at which each object is next due to be polled
+        if schedule is None:
+            due = [start_time] * len(objects)
+        else:
+            due = [start_time + schedule.initial_delay(o) for o in objects]
+        if end_time is not None:
+            due = [min(t, end_time) for t in due]
+        would_sweep = getattr(refresh, 'would_sweep', None)
+        while True:
             loop_start = time()
-            next_objs = []
-            for o in objects:
-                obj = o.fetch()
+            polled = [i for i,t in enumerate(due) if t <= loop_start]
+            if would_sweep is not None and 0 < len(polled) < len(objects) \
+                    and would_sweep([objects[i] for i in polled]) \
+                    and would_sweep(objects):
+                # The objects that are due will be refreshed with a listing,
+                # which covers the rest of them too at no extra cost.
+                polled = list(range(len(objects)))
+            finished = set()
+            for i, obj in zip(polled, refresh([objects[i] for i in polled])):
                 if getattr(obj, attr, None) == value:
+                    finished.add(i)
+                    if schedule is not None:
+                        schedule.finished(obj)
                     yield obj
                 else:
-                    next_objs.append(obj)
-            objects = next_objs
-            if not objects:
+                    objects[i] = obj
+                    if schedule is None:
+                        due[i] = loop_start + wait_interval
+                    else:
+                        due[i] = loop_start + \
+                                 schedule.delay(obj, loop_start - start_time)
+                    if end_time is not None:
+                        # Poll everything one last time at the deadline
+                        due[i] = min(due[i], end_time)
+            if finished:
+                objects = [o for i,o in enumerate(objects) if i not in finished]
+                due = [t for i,t in enumerate(due) if i not in finished]
+            if not objects or \
+                    (end_time is not None and loop_start >= end_time):
                 break
-            loop_end = time()
-            time_left = wait_interval - (loop_end - loop_start)
-            if end_time is not None:
-                time_left = min(time_left, end_time - loop_end)
+            time_left = min(due) - time()
             if time_left > 0:
                 try:
                     sleep(time_left)
@@ -23,6 +23,9 @@ class Domain(Resource):
     :vartype zone_file: string
     """
 
+    __slots__ = ()
+    _field_names = ("name", "ttl", "zone_file")
+
     def __init__(self, state=None, **extra):
         if isinstance(state, string_types):
             state = {"name": state}
@@ -172,6 +175,8 @@ class DomainRecord(ResourceWithID):
        The `Domain` to which the record belongs
     """
 
+    __slots__ = ('domain',)
+    _field_names = ("id", "type", "name", "data", "priority", "port", "weight")
     _meta_attrs = ResourceWithID._meta_attrs + ('domain',)
 
     @property
@@ -1,6 +1,7 @@
 from six.moves import map  # pylint: disable=redefined-builtin
 from .base     import Actionable, ResourceWithID, Region, Size, Kernel, \
-                        Networks, BackupWindow, Taggable, fromISO8601
+                        Networks, BackupWindow, Taggable, resource_field, \
+                        timestamp_field
 from .image    import Image
 
 class Droplet(Actionable, ResourceWithID, Taggable):
@@ -77,6 +78,12 @@ class Droplet(Actionable, ResourceWithID, Taggable):
     :vartype vcpus: int
     """
 
+    __slots__ = ()
+    _field_names = ("id", "backup_ids", "created_at", "disk", "features",
+                    "image", "kernel", "locked", "memory", "name", "networks",
+                    "next_backup_window", "region", "size", "size_slug",
+                    "snapshot_ids", "status", "tags", "vcpus")
+
     #: The status of droplets that are powered on and operating
     STATUS_ACTIVE = 'active'
 
@@ -89,14 +96,21 @@ class Droplet(Actionable, ResourceWithID, Taggable):
     #: The status of droplets that are powered off
     STATUS_OFF = 'off'
 
+    _conversions = {
+        "created_at": timestamp_field,
+        "image": resource_field(Image),
+        "region": resource_field(Region),
+        "size": resource_field(Size),
+        "kernel": resource_field(Kernel),
+        "networks": resource_field(Networks),
+        "next_backup_window": resource_field(BackupWindow),
+    }
+
+    _shared_fields = ("region", "size")
+
     def __init__(self, state=None, **extra):
         super(Droplet, self).__init__(state, **extra)
-        for attr, cls in [('image', Image), ('region', Region), ('size', Size),
-                          ('kernel', Kernel), ('networks', Networks),
-                          ('next_backup_window', BackupWindow)]:
-            if self.get(attr) is not None and not isinstance(self[attr], cls):
-                self[attr] = cls(self[attr], doapi_manager=self.doapi_manager)
-        self.created_at = fromISO8601(self.get('created_at'))
+        self.fields.setdefault('created_at', None)
 
     @property
     def active(self):
@@ -2,7 +2,7 @@ import numbers
 import socket
 import struct
 from   six      import string_types
-from   .base    import Actionable, Region, int2ipv4
+from   .base    import Actionable, Region, int2ipv4, resource_field
 from   .droplet import Droplet
 
 class FloatingIP(Actionable):
@@ -28,15 +28,22 @@ class FloatingIP(Actionable):
     :vartype region: `Region`
     """
 
+    __slots__ = ()
+    _field_names = ("ip", "droplet", "region")
+
+    _conversions = {
+        "region": resource_field(Region),
+        "droplet": resource_field(Droplet),
+    }
+
+    _shared_fields = ("region",)
+
     def __init__(self, state=None, **extra):
         if isinstance(state, numbers.Integral):
             state = {"ip": int2ipv4(state)}
         elif isinstance(state, string_types):
             state = {"ip": state}
         super(FloatingIP, self).__init__(state, **extra)
-        for attr, cls in [('region', Region), ('droplet', Droplet)]:
-            if self.get(attr) is not None and not isinstance(self[attr], cls):
-                self[attr] = cls(self[attr], doapi_manager=self.doapi_manager)
 
     def __str__(self):
         """ Convert the floating IP to just the actual IP address """
@@ -1,4 +1,4 @@
-from .base    import Actionable, ResourceWithID, fromISO8601
+from .base    import Actionable, ResourceWithID, timestamp_field
 
 class Image(Actionable, ResourceWithID):
     """
@@ -46,9 +46,16 @@ class Image(Actionable, ResourceWithID):
     :vartype type: string
     """
 
+    __slots__ = ()
+    _field_names = ("id", "created_at", "distribution", "min_disk_size",
+                    "name", "public", "regions", "size_gigabytes", "slug",
+                    "type")
+
+    _conversions = {"created_at": timestamp_field}
+
     def __init__(self, state=None, **extra):
         super(Image, self).__init__(state, **extra)
-        self.created_at = fromISO8601(self.get('created_at'))
+        self.fields.setdefault('created_at', None)
 
     def __str__(self):
         """
@@ -0,0 +1,256 @@
+from   concurrent.futures import Future
+import threading
+from   time        import time
+import requests
+from   .           import _refresh
+from   .base       import DOAPIError
+from   .retry      import RetryPolicy
+
+class _Watch(object):
+    """ An action being polled on behalf of a future """
+
+    def __init__(self, action, future, due, start):
+        self.action = action
+        self.future = future
+        #: The time at which the action is next due to be polled
+        self.due = due
+        #: The time at which polling the action began
+        self.start = start
+        #: The number of consecutive polls of the action that have failed
+        self.failures = 0
+
+
+class ActionPoller(object):
+    """
+    .. versionadded:: 0.3.0
+
+    A background thread that waits on any number of actions at once, returning
+    a :class:`concurrent.futures.Future` for each action submitted.  Each round,
+    all of the outstanding actions that are due to be polled are re-fetched
+    together (by scanning the account's action listing when that takes fewer
+    requests than fetching each action), and the futures of the actions that
+    have completed or errored out are resolved with the actions' final states.
+
+    Actions are polled every ``wait_interval`` seconds, or according to the
+    `doapi` object's :attr:`~doapi.poll_schedule` if it is set and
+    ``wait_interval`` is `None`.  The thread is started when an action is
+    submitted and exits whenever there are no actions left to poll.  Futures
+    that are cancelled are no longer polled.
+
+    If a round fails with a transient error (a connection error, a 429, or a
+    5xx response, as decided by the ``retry`` policy), the actions involved
+    are polled again after the policy's backoff, and their futures are only
+    resolved with the error once the policy gives up on them.  Any other
+    error in a round that refreshes several actions at once is attributed to
+    the individual actions by fetching each one separately, so that, e.g., an
+    action that no longer exists fails only its own future.  Likewise, an
+    exception raised while scheduling an action's next poll (e.g., because its
+    timestamps can't be parsed) fails only that action's future.
+
+    Every `doapi` object has an `ActionPoller` of its own, shared by all of its
+    actions' :meth:`~Action.as_future` methods, in its :attr:`~doapi.poller`
+    attribute.
+
+    :param doapi doapi_manager: the `doapi` object to make requests with
+    :param wait_interval: how many seconds to sleep between polls of the same
+        action; defaults to following the `doapi` object's
+        :attr:`~doapi.poll_schedule` or else sleeping for its
+        :attr:`~doapi.wait_interval` if `None`
+    :type wait_interval: number or `None`
+    :param retry: the policy for re-polling actions after failed requests;
+        defaults to the `doapi` object's :attr:`~doapi.retry` policy or else
+        to a `RetryPolicy` with default settings if `None`
+    :type retry: `RetryPolicy` or `None`
+    """
+
+    def __init__(self, doapi_manager, wait_interval=None, retry=None):
+        #: The `doapi` object with which requests are made
+        self.doapi_manager = doapi_manager
+        #: How many seconds to sleep between polls of the same action, or
+        #: `None` to use the `doapi` object's settings
+        self.wait_interval = wait_interval
+        #: The policy for re-polling actions after failed requests, or `None`
+        #: to use the `doapi` object's policy or the default one
+        self.retry = retry
+        self._watches = []
+        self._cond = threading.Condition()
+        self._thread = None
+        self._closed = False
+
+    def submit(self, action):
+        """
+        Start waiting for ``action`` to complete or error out in the
+        background.  If ``action`` is already known to have ended, the
+        returned future is resolved immediately.
+
+        :param Action action: the action to wait for
+        :return: a future that will be resolved with the action's final state,
+            or with the exception raised while fetching it
+        :rtype: concurrent.futures.Future
+        :raises RuntimeError: if the poller has been closed
+        """
+        future = Future()
+        status = action.get("status")
+        if status is not None and status != action.STATUS_IN_PROGRESS:
+            future.set_running_or_notify_cancel()
+            future.set_result(action)
+            return future
+        schedule = self._schedule()
+        now = time()
+        due = now if schedule is None else now + schedule.initial_delay(action)
+        with self._cond:
+            if self._closed:
+                raise RuntimeError('cannot submit actions to a closed poller')
+            self._watches.append(_Watch(action, future, due, now))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run)
+                self._thread.daemon = True
+                self._thread.start()
+            self._cond.notify()
+        return future
+
+    def close(self):
+        """
+        Stop polling and cancel the futures of all outstanding actions
+
+        :return: `None`
+        """
+        with self._cond:
+            self._closed = True
+            watches, self._watches = self._watches, []
+            self._cond.notify()
+        for w in watches:
+            w.future.cancel()
+
+    def _schedule(self):
+        if self.wait_interval is None:
+            return self.doapi_manager.poll_schedule
+        return None
+
+    def _interval(self):
+        if self.wait_interval is None:
+            return self.doapi_manager.wait_interval
+        return self.wait_interval
+
+    def _retry_policy(self):
+        if self.retry is not None:
+            return self.retry
+        return self.doapi_manager.retry or RetryPolicy()
+
+    @staticmethod
+    def _failure(exc):
+        # Returns the status code (`None` for a connection error) and headers
+        # of the failed request that raised `exc`, or `None` if `exc` isn't a
+        # request failure
+        if isinstance(exc, DOAPIError):
+            return (exc.response.status_code, exc.response.headers)
+        elif isinstance(exc, requests.RequestException):
+            return (None, None)
+        else:
+            return None
+
+    @staticmethod
+    def _fetch(action):
+        try:
+            return action.fetch()
+        except Exception as e:  # pylint: disable=broad-except
+            return e
+
+    def _run(self):
+        refresh = _refresh.ActionSweep(self.doapi_manager)
+        try:
+            while True:
+                polled = self._due()
+                if polled is None:
+                    return
+                try:
+                    resolved = self._poll(refresh, polled)
+                except Exception as e:  # pylint: disable=broad-except
+                    # Don't leave the futures hanging because of, e.g., a
+                    # broken retry policy
+                    resolved = [(w, None, e) for w in polled]
+                self._resolve(resolved)
+        finally:
+            with self._cond:
+                # If the thread is dying from an uncaught exception, let the
+                # next `submit` start a new one to poll whatever is left.
+                if self._thread is threading.current_thread():
+                    self._thread = None
+
+    def _due(self):
+        # Waits until some actions are due to be polled and returns their
+        # watches, or returns `None` (after marking the thread as finished) if
+        # there is nothing left to poll
+        with self._cond:
+            while True:
+                self._watches = [w for w in self._watches
+                                   if not w.future.cancelled()]
+                if self._closed or not self._watches:
+                    self._thread = None
+                    return None
+                now = time()
+                polled = [w for w in self._watches if w.due <= now]
+                if polled:
+                    return polled
+                self._cond.wait(min(w.due for w in self._watches) - now)
+
+    def _poll(self, refresh, polled):
+        # Polls the actions in `polled`, reschedules those that are still in
+        # progress, and returns a list of ``(watch, action, exception)``
+        # triples for those whose futures should be resolved
+        policy = self._retry_policy()
+        try:
+            states = list(refresh([w.action for w in polled]))
+        except Exception as e:  # pylint: disable=broad-except
+            failure = self._failure(e)
+            if failure is not None and \
+                    policy.should_retry('GET', 1, failure[0]):
+                states = [e] * len(polled)
+            else:
+                # The error may concern only one of the actions (e.g., a 404
+                # for an action that no longer exists).
+                states = [self._fetch(w.action) for w in polled]
+        resolved = []
+        schedule = self._schedule()
+        now = time()
+        for w, state in zip(polled, states):
+            try:
+                if isinstance(state, Exception):
+                    failure = self._failure(state)
+                    w.failures += 1
+                    if failure is not None and \
+                            policy.should_retry('GET', w.failures, failure[0]):
+                        w.due = now + policy.delay(w.failures, *failure)
+                    else:
+                        resolved.append((w, None, state))
+                elif state.done:
+                    if schedule is not None:
+                        schedule.finished(state)
+                    resolved.append((w, state, None))
+                else:
+                    w.action = state
+                    w.failures = 0
+                    if schedule is None:
+                        w.due = now + self._interval()
+                    else:
+                        w.due = now + schedule.delay(state, now - w.start)
+            except Exception as e:  # pylint: disable=broad-except
+                # E.g., the schedule couldn't parse the action's timestamps;
+                # fail only this action's future.
+                resolved.append((w, None, e))
+        return resolved
+
+    def _resolve(self, resolved):
+        if not resolved:
+            return
+        with self._cond:
+            done = set(id(w) for w, _, _ in resolved)
+            self._watches = [w for w in self._watches if id(w) not in done]
+        # Futures are resolved outside of the lock, as resolving them runs
+        # their callbacks.
+        for w, act, exc in resolved:
+            if w.future.set_running_or_notify_cancel():
+                if exc is None:
+                    w.future.set_result(act)
+                else:
+                    w.future.set_exception(exc)
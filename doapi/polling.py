@@ -0,0 +1,307 @@
+from   __future__ import division
+from   calendar   import timegm
+from   collections import deque
+import os
+import os.path
+import tempfile
+import threading
+from   time       import time
+from   six        import iteritems
+from   .          import _codec
+from   .action    import Action
+
+class PollSchedule(object):
+    """
+    .. versionadded:: 0.3.0
+
+    An adaptive schedule for the "wait" methods of `doapi`.  Instead of
+    re-fetching every outstanding object every ``wait_interval`` seconds, each
+    object is polled on its own schedule based on how long it has been running:
+
+    - An action whose type has an entry in ``expected`` is polled rarely while
+      it is far from its expected completion time and more and more often as
+      that time approaches: each wait is half of the time remaining.
+
+    - Once an action has run longer than expected (or immediately, for an
+      action of unknown type or for a droplet), the waits grow with the
+      overrun: each wait is ``backoff`` times how long the object has been
+      overdue, so the polls back off exponentially.
+
+    Every wait is kept between ``min_interval`` and ``max_interval`` seconds.
+    An action's running time is measured from its ``started_at`` timestamp;
+    that of any other object is measured from the start of the wait.
+
+    :param number min_interval: the minimum number of seconds between polls
+        of the same object
+    :param number max_interval: the maximum number of seconds between polls
+        of the same object
+    :param number backoff: the fraction of an object's overrun to wait before
+        polling it again
+    :param dict expected: a mapping from action types to the number of seconds
+        that actions of those types are expected to take; defaults to
+        `EXPECTED_DURATIONS`
+    :param stats: an `ActionStats` in which to record the durations of the
+        actions waited on.  Once enough actions of a given type (and region)
+        have been recorded, the median of their durations replaces the entry
+        in ``expected``, and the first poll of an action of that type is
+        delayed until the action has been running that long.
+    :type stats: `ActionStats` or `None`
+    """
+
+    #: Typical running times in seconds of common action types, used by
+    #: default
+    EXPECTED_DURATIONS = {
+        "assign": 5,
+        "change_kernel": 10,
+        "convert": 120,
+        "create": 40,
+        "destroy": 5,
+        "disable_backups": 5,
+        "enable_backups": 5,
+        "enable_ipv6": 10,
+        "enable_private_networking": 10,
+        "password_reset": 20,
+        "power_cycle": 15,
+        "power_off": 10,
+        "power_on": 10,
+        "reboot": 15,
+        "rebuild": 60,
+        "rename": 5,
+        "reserve_ip": 3,
+        "resize": 60,
+        "restore": 120,
+        "shutdown": 15,
+        "snapshot": 300,
+        "transfer": 300,
+        "unassign": 5,
+    }
+
+    def __init__(self, min_interval=1, max_interval=60, backoff=0.25,
+                 expected=None, stats=None):
+        #: The minimum number of seconds between polls of the same object
+        self.min_interval = min_interval
+        #: The maximum number of seconds between polls of the same object
+        self.max_interval = max_interval
+        #: The fraction of an object's overrun to wait before polling it again
+        self.backoff = backoff
+        #: A mapping from action types to their expected running times in
+        #: seconds
+        self.expected = dict(self.EXPECTED_DURATIONS if expected is None
+                             else expected)
+        #: The `ActionStats` recording the durations of the actions waited on,
+        #: or `None`
+        self.stats = stats
+
+    def expected_duration(self, obj):
+        """
+        Return the number of seconds that the action ``obj`` is expected to
+        take in total, or `None` if unknown (including when ``obj`` is not an
+        action)
+        """
+        if isinstance(obj, Action):
+            learned = self._learned(obj)
+            if learned is not None:
+                return learned
+            return self.expected.get(obj.get("type"))
+        return None
+
+    def _learned(self, action):
+        if self.stats is None:
+            return None
+        return self.stats.median(action.get("type"), action.get("region_slug"))
+
+    def initial_delay(self, obj):
+        """
+        Compute the number of seconds to wait before polling ``obj`` for the
+        first time.  This is zero unless ``obj`` is an action whose typical
+        duration has been learned by :attr:`stats`, in which case it is
+        however much longer the action is expected to run.
+
+        :param obj: the initial state of the object being waited on
+        :rtype: float
+        """
+        if not isinstance(obj, Action) or obj.get("status") != 'in-progress':
+            return 0
+        learned = self._learned(obj)
+        if learned is None:
+            return 0
+        return max(0, learned - self._elapsed(obj, 0))
+
+    def finished(self, obj):
+        """
+        Called by the "wait" methods when ``obj`` reaches its final state;
+        records the durations of actions in :attr:`stats`
+
+        :return: `None`
+        """
+        if self.stats is not None and isinstance(obj, Action):
+            self.stats.record(obj)
+
+    def delay(self, obj, waited):
+        """
+        Compute the number of seconds to wait before polling ``obj`` again
+
+        :param obj: the current state of the object being waited on
+        :param number waited: the number of seconds since the wait began
+        :rtype: float
+        """
+        elapsed = self._elapsed(obj, waited)
+        expected = self.expected_duration(obj)
+        if expected is not None and elapsed < expected:
+            wait = (expected - elapsed) / 2
+        else:
+            wait = (elapsed - (expected or 0)) * self.backoff
+        return min(self.max_interval, max(self.min_interval, wait))
+
+    @staticmethod
+    def _elapsed(obj, waited):
+        # How long `obj` has been running, as best as can be determined
+        if isinstance(obj, Action) and obj.get("started_at") is not None:
+            started = timegm(obj.started_at.utctimetuple())
+            return max(waited, time() - started)
+        return waited
+
+
+class ActionStats(object):
+    """
+    .. versionadded:: 0.3.0
+
+    A record of how long completed actions took, grouped by action type and
+    region, for use by a `PollSchedule`.  Only the most recent ``max_samples``
+    durations for each type & region are kept.  If ``path`` is given, the
+    durations are loaded from that file (if it exists and is valid; otherwise,
+    no durations are loaded) and can be written back to it with :meth:`save`,
+    so that they accumulate across runs.
+
+    :param path: the file in which to store the durations, or `None` to keep
+        them in memory only
+    :type path: string or `None`
+    :param int max_samples: the maximum number of durations to keep for each
+        action type & region
+    :param int min_samples: the minimum number of recorded durations needed
+        before :meth:`median` will report a value
+    """
+
+    def __init__(self, path=None, max_samples=100, min_samples=3):
+        #: The file in which the durations are stored, or `None`
+        self.path = path
+        #: The maximum number of durations to keep for each action type &
+        #: region
+        self.max_samples = max_samples
+        #: The minimum number of durations needed for a median
+        self.min_samples = min_samples
+        # Maps action types to dicts mapping region slugs to deques of
+        # durations in seconds
+        self._durations = {}
+        self._lock = threading.Lock()
+        if path is not None and os.path.exists(path):
+            try:
+                self.load()
+            except (IOError, OSError, ValueError):
+                # A corrupt or unreadable file shouldn't prevent waiting on
+                # actions; start over, and let `save` replace the file.
+                self._durations = {}
+
+    def record(self, action):
+        """
+        Record the duration of ``action`` if it has completed successfully;
+        otherwise, do nothing
+
+        :param Action action: an action
+        :return: `None`
+        """
+        if action.get("status") != 'completed' or \
+                action.get("started_at") is None or \
+                action.get("completed_at") is None:
+            return
+        duration = (action.completed_at - action.started_at).total_seconds()
+        self.add(action.get("type"), action.get("region_slug"), duration)
+
+    def add(self, action_type, region, duration):
+        """
+        Record that an action of type ``action_type`` in ``region`` took
+        ``duration`` seconds
+
+        :return: `None`
+        """
+        with self._lock:
+            byregion = self._durations.setdefault(action_type, {})
+            if region not in byregion:
+                byregion[region] = deque(maxlen=self.max_samples)
+            byregion[region].append(duration)
+
+    def median(self, action_type, region=None):
+        """
+        Return the median recorded duration in seconds of actions of type
+        ``action_type`` in ``region``.  If fewer than :attr:`min_samples`
+        durations are recorded for that region, the durations for all regions
+        are used instead.  If there still aren't enough, `None` is returned.
+
+        :rtype: float or `None`
+        """
+        with self._lock:
+            byregion = self._durations.get(action_type)
+            if not byregion:
+                return None
+            samples = list(byregion.get(region, ()))
+            if len(samples) < self.min_samples:
+                samples = [d for ds in byregion.values() for d in ds]
+        if not samples or len(samples) < self.min_samples:
+            return None
+        samples.sort()
+        return samples[len(samples) // 2]
+
+    def load(self):
+        """
+        Replace the recorded durations with those stored in :attr:`path`
+
+        :return: `None`
+        :raises IOError: if the file cannot be read
+        :raises ValueError: if the file does not contain valid durations
+        """
+        with open(self.path, 'rb') as fp:
+            data = _codec.loads(fp.read())
+        durations = {}
+        try:
+            for action_type, byregion in iteritems(data):
+                durations[action_type] = {
+                    (region or None): deque(map(float, ds),
+                                            maxlen=self.max_samples)
+                    for region, ds in iteritems(byregion)
+                }
+        except (AttributeError, TypeError):
+            raise ValueError('{0}: not a valid durations file'
+                             .format(self.path))
+        with self._lock:
+            self._durations = durations
+
+    def save(self):
+        """
+        Write the recorded durations to :attr:`path`
+
+        :return: `None`
+        :raises IOError: if the file cannot be written; the file is then left
+            unchanged
+        """
+        with self._lock:
+            data = {
+                action_type: {(region or ''): list(ds)
+                              for region, ds in iteritems(byregion)}
+                for action_type, byregion in iteritems(self._durations)
+            }
+        dirname = os.path.dirname(os.path.abspath(self.path))
+        # Write to a temporary file and then move it into place so that
+        # concurrent processes never see a partial file
+        fd, tmp = tempfile.mkstemp(dir=dirname, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as fp:
+                fp.write(_codec.dumps(data))
+            if os.name == 'nt' and os.path.exists(self.path):
+                os.remove(self.path)
+            os.rename(tmp, self.path)
+        except BaseException:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            raise
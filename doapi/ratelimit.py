@@ -0,0 +1,143 @@
+from   __future__ import division
+import threading
+import time
+
+class RateLimiter(object):
+    """
+    .. versionadded:: 0.3.0
+
+    A token bucket for pacing requests so that they stay within the API's rate
+    limit.  The bucket's refill rate is recomputed from the
+    :mailheader:`RateLimit-Remaining` and :mailheader:`RateLimit-Reset`
+    headers of every response so that the remaining budget is spread out
+    until the reset time; when the budget runs out, requests wait for the
+    reset instead of failing.
+
+    A single `RateLimiter` may be used by multiple threads at once and may be
+    shared between multiple `doapi` objects that use the same API token.
+
+    :param int burst: the maximum number of requests that may be made back to
+        back before pacing takes effect
+    :param int reserve: the number of requests to leave unused at the end of
+        each rate limit window (e.g., for use by other clients)
+    """
+
+    def __init__(self, burst=10, reserve=0):
+        #: The maximum number of requests that may be made back to back before
+        #: pacing takes effect
+        self.burst = burst
+        #: The number of requests to leave unused at the end of each rate limit
+        #: window
+        self.reserve = reserve
+        #: The number of requests that can be made per hour, as last reported
+        #: by the API, or `None` if not yet known
+        self.limit = None
+        #: The number of requests remaining until the limit is reached, as
+        #: last reported by the API and decremented for each request made
+        #: since, or `None` if not yet known
+        self.remaining = None
+        #: The Unix timestamp at which the oldest request will expire from
+        #: rate limit consideration, or `None` if not yet known
+        self.reset = None
+        self._lock = threading.Lock()
+        self._tokens = float(burst)
+        self._rate = None
+        self._last = time.time()
+
+    @property
+    def budget(self):
+        """
+        A `dict` describing the limiter's current view of the rate limit, for
+        monitoring purposes
+
+        :var limit: :attr:`limit`
+        :var remaining: :attr:`remaining`
+        :var reset: :attr:`reset`
+        :var rate: the number of requests per second currently allowed, or
+            `None` if unrestricted
+        """
+        with self._lock:
+            return {
+                "limit": self.limit,
+                "remaining": self.remaining,
+                "reset": self.reset,
+                "rate": self._rate,
+            }
+
+    def update(self, headers, exhausted=False):
+        """
+        Update the limiter's state from the rate limit headers of a response.
+        Headers that are absent or malformed are ignored.
+
+        :param headers: a case-insensitive mapping of response headers
+        :param bool exhausted: whether the response reported that the rate
+            limit has been exceeded (i.e., was a 429), in which case no more
+            requests will be permitted until the reset time (or for one minute,
+            if no future reset time is known)
+        :return: `None`
+        """
+        values = {}
+        for name in ('Limit', 'Remaining', 'Reset'):
+            try:
+                values[name] = int(headers['RateLimit-' + name])
+            except (KeyError, TypeError, ValueError):
+                pass
+        with self._lock:
+            self.limit = values.get('Limit', self.limit)
+            self.remaining = values.get('Remaining', self.remaining)
+            self.reset = values.get('Reset', self.reset)
+            now = time.time()
+            if exhausted:
+                self.remaining = 0
+                if self.reset is None or self.reset <= now:
+                    self.reset = now + 60
+            self._refill(now)
+
+    def reserve_slot(self):
+        """
+        Claim permission to make one request, returning the number of seconds
+        the caller must wait before making it
+
+        :rtype: float
+        """
+        with self._lock:
+            now = time.time()
+            self._refill(now)
+            if self.remaining is not None:
+                self.remaining -= 1
+            if self._rate == 0:
+                # No budget left; wait for the window to reset.
+                delay = max(0, (self.reset or now) - now)
+                self._tokens = 0
+                return delay
+            if self._rate is None:
+                return 0
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0
+            return -self._tokens / self._rate
+
+    def acquire(self):
+        """
+        Wait (by sleeping the current thread) until a request may be made
+
+        :return: `None`
+        """
+        delay = self.reserve_slot()
+        if delay > 0:
+            time.sleep(delay)
+
+    def _refill(self, now):
+        # Must be called with the lock held
+        if self._rate is not None:
+            self._tokens = min(self.burst,
+                               self._tokens + (now - self._last) * self._rate)
+        self._last = now
+        if self.remaining is None or self.reset is None:
+            self._rate = None
+        else:
+            budget = self.remaining - self.reserve
+            if budget <= 0:
+                self._rate = 0
+            else:
+                self._rate = budget / max(self.reset - now, 1)
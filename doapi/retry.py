@@ -0,0 +1,128 @@
+from   __future__  import division
+from   email.utils import mktime_tz, parsedate_tz
+import random
+import time
+
+class RetryPolicy(object):
+    """
+    .. versionadded:: 0.3.0
+
+    A policy for automatically retrying requests that fail with a transient
+    error: a connection error or timeout, a 429 "Too Many Requests" response,
+    or a 5xx response in ``statuses``.  Between attempts, the client sleeps
+    for an exponentially increasing length of time with random jitter, or for
+    however long the server asks via a :mailheader:`Retry-After` header.
+
+    Because a request that fails with a connection error or 5xx response may
+    still have been carried out by the server, only requests using one of the
+    ``methods`` are retried after such failures.  Requests rejected with a 429
+    are retried regardless of method.
+
+    :param int max_attempts: the maximum number of times to send a request,
+        including the first attempt
+    :param number backoff_base: the number of seconds to sleep after the first
+        failed attempt; each subsequent failure doubles the sleep time
+    :param number backoff_max: the maximum number of seconds to sleep between
+        attempts (not counting :mailheader:`Retry-After` delays)
+    :param number jitter: the fraction (from 0 to 1) by which each sleep time
+        may be randomly shortened, in order to keep multiple clients from
+        retrying in lockstep
+    :param bool honor_retry_after: whether to sleep for the length of time
+        given in a response's :mailheader:`Retry-After` header (or until its
+        :mailheader:`RateLimit-Reset` time, for 429 responses) when longer than
+        the backoff
+    :param iterable methods: the HTTP methods that may be retried after a
+        connection error or 5xx response
+    :param iterable statuses: the HTTP status codes (other than 429) that
+        cause a retry
+    """
+
+    #: The HTTP methods that are retried by default
+    IDEMPOTENT_METHODS = frozenset(['GET', 'PUT', 'DELETE'])
+
+    #: The HTTP status codes (other than 429) that are retried by default
+    RETRY_STATUSES = frozenset([500, 502, 503, 504])
+
+    def __init__(self, max_attempts=5, backoff_base=0.5, backoff_max=60,
+                 jitter=0.5, honor_retry_after=True,
+                 methods=IDEMPOTENT_METHODS, statuses=RETRY_STATUSES):
+        #: The maximum number of times to send a request
+        self.max_attempts = max_attempts
+        #: The number of seconds to sleep after the first failed attempt
+        self.backoff_base = backoff_base
+        #: The maximum number of seconds to sleep between attempts
+        self.backoff_max = backoff_max
+        #: The fraction by which each sleep time may be randomly shortened
+        self.jitter = jitter
+        #: Whether to honor :mailheader:`Retry-After` headers
+        self.honor_retry_after = honor_retry_after
+        #: The HTTP methods that may be retried after a connection error or
+        #: 5xx response
+        self.methods = frozenset(m.upper() for m in methods)
+        #: The HTTP status codes (other than 429) that cause a retry
+        self.statuses = frozenset(statuses)
+
+    def should_retry(self, method, attempt, status=None):
+        """
+        Decide whether a failed request should be sent again
+
+        :param str method: the request's (uppercase) HTTP method
+        :param int attempt: the number of times the request has been sent so
+            far
+        :param status: the response's HTTP status code, or `None` if the
+            request failed with a connection error or timeout
+        :type status: integer or `None`
+        :rtype: bool
+        """
+        if attempt >= self.max_attempts:
+            return False
+        elif status == 429:
+            return True
+        elif status is None or status in self.statuses:
+            return method in self.methods
+        else:
+            return False
+
+    def delay(self, attempt, status=None, headers=None):
+        """
+        Compute the number of seconds to sleep before resending a request
+
+        :param int attempt: the number of times the request has been sent so
+            far
+        :param status: the failed response's HTTP status code, or `None` if the
+            request failed with a connection error or timeout
+        :type status: integer or `None`
+        :param headers: the failed response's headers, if any
+        :rtype: float
+        """
+        backoff = min(self.backoff_max, self.backoff_base * 2 ** (attempt-1))
+        backoff *= 1 - self.jitter * random.random()
+        if self.honor_retry_after and headers is not None:
+            wait = retry_after(headers, status == 429)
+            if wait is not None:
+                backoff = max(backoff, wait)
+        return backoff
+
+
+def retry_after(headers, use_reset=False):
+    """
+    Return the number of seconds that a response's :mailheader:`Retry-After`
+    header (or, if ``use_reset`` is true and there is no such header, its
+    :mailheader:`RateLimit-Reset` header) asks the client to wait, or `None` if
+    there is no usable header
+    """
+    now = time.time()
+    value = headers.get('Retry-After')
+    if value is not None:
+        try:
+            return max(0, float(value))
+        except ValueError:
+            when = parsedate_tz(value)
+            if when is not None:
+                return max(0, mktime_tz(when) - now)
+    if use_reset:
+        try:
+            return max(0, int(headers['RateLimit-Reset']) - now)
+        except (KeyError, TypeError, ValueError):
+            pass
+    return None
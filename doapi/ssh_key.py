@@ -27,6 +27,9 @@ class SSHKey(ResourceWithID):
     :vartype public_key: string
     """
 
+    __slots__ = ()
+    _field_names = ("id", "fingerprint", "name", "public_key")
+
     def __init__(self, state=None, **extra):
         if isinstance(state, string_types):
             state = {"fingerprint": state}
@@ -34,6 +34,9 @@ class Tag(Resource):
         of the given type to which the tag was most recently applied)
     """
 
+    __slots__ = ()
+    _field_names = ("name", "resources")
+
     def __init__(self, state=None, **extra):
         if isinstance(state, string_types):
             state = {"name": state}
@@ -27,11 +27,17 @@ setup(
     url='https://github.com/jwodder/doapi',
 
     install_requires=[
+        'futures>=3.0,<4; python_version < "3.2"',
         'pyRFC3339>=1.0,<2',
         'requests>=2.2.0,<3',
         'six>=1.5.0,<2',
     ],
 
+    extras_require={
+        'async': ['aiohttp>=3.3,<4; python_version >= "3.6"'],
+        'fastjson': ['orjson; python_version >= "3.7"'],
+    },
+
     classifiers=[
         'Development Status :: 4 - Beta',
         #'Development Status :: 5 - Production/Stable',
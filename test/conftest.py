@@ -0,0 +1,124 @@
+import json
+import sys
+import threading
+import pytest
+from   six.moves.urllib.parse import parse_qsl, urlencode, urlparse
+from   doapi import doapi
+
+ENDPOINT = 'https://api.example.test'
+
+if sys.version_info < (3, 6):
+    # The asyncio client's tests use syntax that older Pythons can't parse.
+    collect_ignore = ['test_aio.py']
+
+class FakeResponse(object):
+    """ The parts of a `requests.Response` that `doapi` uses """
+
+    def __init__(self, body=None, status_code=200, headers=None, url=''):
+        self.status_code = status_code
+        self.reason = 'OK' if status_code < 400 else 'Error'
+        self.headers = dict(headers or {})
+        self.url = url
+        self.text = '' if body is None else json.dumps(body)
+        self.content = self.text.encode('utf-8')
+
+    @property
+    def ok(self):
+        return self.status_code < 400
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class FakeClock(object):
+    """
+    A stand-in for the `time` module whose clock only advances when `sleep`
+    is called
+    """
+
+    def __init__(self, now=1000000000.0):
+        self.now = now
+        self.sleeps = []
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class FakeSession(object):
+    """
+    A stand-in for a `requests.Session` that answers requests from a table of
+    routes.  A route is either a list of responses (returned in order, with
+    the last one repeated) or a function taking the request's method, path,
+    and query parameters and returning a response or raising an exception.
+    """
+
+    def __init__(self):
+        self.routes = {}
+        self.requests = []
+        self.lock = threading.Lock()
+
+    def add(self, path, *responses, **kwargs):
+        method = kwargs.pop('method', 'GET')
+        assert not kwargs
+        self.routes[(method, path)] = list(responses)
+
+    def listing(self, path, key, values):
+        """
+        Serve ``values`` at ``path`` as a paginated listing under ``key``,
+        with ``links`` and ``meta`` fields like the API's
+        """
+        def handler(method, path_, params):
+            per_page = int(params.get("per_page", 20))
+            page = int(params.get("page", 1))
+            last = max(1, -(-len(values) // per_page))
+            body = {
+                key: values[(page-1)*per_page : page*per_page],
+                "links": {"pages": {}},
+                "meta": {"total": len(values)},
+            }
+            def link(n):
+                q = dict(params, page=n, per_page=per_page)
+                return ENDPOINT + path + '?' + urlencode(sorted(q.items()))
+            if page < last:
+                body["links"]["pages"]["next"] = link(page+1)
+                body["links"]["pages"]["last"] = link(last)
+            return FakeResponse(body)
+        self.routes[('GET', path)] = handler
+
+    def request(self, method, url, params=None, **_):
+        parts = urlparse(url)
+        query = dict(parse_qsl(parts.query))
+        query.update(params or {})
+        with self.lock:
+            self.requests.append((method, parts.path, query))
+        route = self.routes[(method, parts.path)]
+        if callable(route):
+            return route(method, parts.path, query)
+        with self.lock:
+            resp = route.pop(0) if len(route) > 1 else route[0]
+        if isinstance(resp, Exception):
+            raise resp
+        resp.url = url
+        return resp
+
+    def paths(self):
+        return [path for _, path, _ in self.requests]
+
+    def mount(self, prefix, adapter):
+        pass
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def session():
+    return FakeSession()
+
+@pytest.fixture
+def client(session):
+    return doapi('hunter2', endpoint=ENDPOINT, session=session)
@@ -0,0 +1,78 @@
+from   time     import gmtime, strftime, time
+
+def ago(seconds):
+    return strftime('%Y-%m-%dT%H:%M:%SZ', gmtime(time() - seconds))
+
+def history(n, in_progress):
+    """
+    Return ``n`` actions, newest first, one started every minute, of which
+    those at the indices in ``in_progress`` are still in progress
+    """
+    return [{
+        "id": 1000 - i,
+        "status": "in-progress" if i in in_progress else "completed",
+        "started_at": ago(60 * i),
+    } for i in range(n)]
+
+def test_in_progress_scans_everything(client, session):
+    session.listing('/v2/actions', 'actions', history(450, {0, 3, 449}))
+    acts = list(client.fetch_all_in_progress_actions())
+    assert [a.id for a in acts] == [1000, 997, 551]
+    # All three pages of 200, one at a time
+    assert session.paths() == ['/v2/actions'] * 3
+    assert all(str(q["per_page"]) == '200' for _,_,q in session.requests)
+
+def test_in_progress_max_age(client, session):
+    session.listing('/v2/actions', 'actions', history(450, {0, 3, 449}))
+    acts = list(client.fetch_all_in_progress_actions(max_age=600))
+    # The action started 449 minutes ago is missed, and the scan stops on
+    # the first page.
+    assert [a.id for a in acts] == [1000, 997]
+    assert session.paths() == ['/v2/actions']
+
+def test_in_progress_max_age_later_page(client, session):
+    session.listing('/v2/actions', 'actions', history(450, {250}))
+    acts = list(client.fetch_all_in_progress_actions(max_age=300 * 60))
+    assert [a.id for a in acts] == [750]
+    assert session.paths() == ['/v2/actions'] * 2
+
+def test_in_progress_none(client, session):
+    session.listing('/v2/actions', 'actions', [])
+    assert list(client.fetch_all_in_progress_actions()) == []
+
+def droplet_history(session, acts):
+    session.listing('/v2/droplets/1/actions', 'actions', acts)
+
+def test_current_action_first_page(client, session):
+    acts = history(100, {0})
+    droplet_history(session, acts)
+    drop = client._droplet({"id": 1})
+    assert drop.fetch_current_action().id == 1000
+    assert session.requests == [('GET', '/v2/droplets/1/actions',
+                                 {"per_page": 5})]
+
+def test_current_action_stops_at_older_action(client, session):
+    # Nothing is in progress, and the second action is older than the first,
+    # so only the first small page is requested.
+    droplet_history(session, history(100, {50}))
+    drop = client._droplet({"id": 1})
+    assert drop.fetch_current_action() is None
+    assert len(session.requests) == 1
+
+def test_current_action_simultaneous(client, session):
+    # Several actions started at the same time as the most recent one (e.g.,
+    # a floating IP's reserve and assign); the in-progress one may be listed
+    # after the others, even on a later page.
+    acts = history(100, set())
+    for a in acts[:7]:
+        a["started_at"] = acts[0]["started_at"]
+    acts[6]["status"] = "in-progress"
+    droplet_history(session, acts)
+    drop = client._droplet({"id": 1})
+    assert drop.fetch_current_action().id == 994
+    assert len(session.requests) == 2
+
+def test_current_action_none(client, session):
+    droplet_history(session, [])
+    assert client._droplet({"id": 1}).fetch_current_action() is None
+    assert len(session.requests) == 1
@@ -0,0 +1,146 @@
+import asyncio
+import pytest
+from   doapi import DOAPIError, RetryPolicy, WaitTimeoutError
+from   conftest import ENDPOINT, FakeResponse
+from   test_actions import history
+
+aiohttp = pytest.importorskip('aiohttp')
+from   doapi.aio import AsyncDoapi  # noqa: E402
+
+class FakeAioResponse(object):
+    """ The parts of an `aiohttp.ClientResponse` that `AsyncDoapi` uses """
+
+    def __init__(self, response):
+        self._response = response
+        self.status = response.status_code
+        self.reason = response.reason
+        self.url = response.url
+        self.headers = response.headers
+
+    async def text(self):
+        return self._response.text
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        pass
+
+
+class FakeAioSession(object):
+    """
+    A stand-in for an `aiohttp.ClientSession` that answers requests from a
+    `FakeSession`'s routes
+    """
+
+    def __init__(self, session):
+        self.session = session
+        self.closed = False
+
+    def request(self, method, url, params=None, **_):
+        return FakeAioResponse(self.session.request(method, url, params))
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def aclient(session):
+    return AsyncDoapi('hunter2', endpoint=ENDPOINT,
+                      session=FakeAioSession(session))
+
+def run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+async def collect(agen):
+    return [x async for x in agen]
+
+VALUES = [{"id": i} for i in range(1, 48)]
+
+@pytest.mark.parametrize('page_workers', [None, 3])
+def test_paginate(aclient, session, page_workers):
+    session.listing('/v2/things', 'things', VALUES)
+    objs = run(collect(aclient.paginate('/v2/things', 'things',
+                                        params={"per_page": 10},
+                                        page_workers=page_workers)))
+    assert objs == VALUES
+    pages = sorted(int(q.get("page", 1)) for _,_,q in session.requests)
+    assert pages == [1, 2, 3, 4, 5]
+
+def test_request_error(aclient, session):
+    session.add('/v2/droplets/1', FakeResponse({"id": "not_found",
+                                                "message": "Nope"},
+                                               status_code=404))
+    with pytest.raises(DOAPIError) as excinfo:
+        run(aclient.fetch_droplet(1))
+    assert excinfo.value.response.status_code == 404
+    assert aclient.last_response.status_code == 404
+
+def test_request_retries_server_errors(aclient, session, monkeypatch):
+    async def nosleep(_):
+        pass
+    monkeypatch.setattr(asyncio, 'sleep', nosleep)
+    aclient.retry = RetryPolicy()
+    session.add(
+        '/v2/droplets/1',
+        FakeResponse({"id": "server_error", "message": "Oops"},
+                     status_code=503),
+        FakeResponse({"droplet": {"id": 1, "status": "active"}}),
+    )
+    drop = run(aclient.fetch_droplet(1))
+    assert drop.id == 1
+    assert session.paths() == ['/v2/droplets/1', '/v2/droplets/1']
+
+def test_fetch_all_droplets(aclient, session):
+    session.listing('/v2/droplets', 'droplets',
+                    [{"id": 1, "status": "active"},
+                     {"id": 2, "status": "off"}])
+    drops = run(collect(aclient.fetch_all_droplets()))
+    assert [d.id for d in drops] == [1, 2]
+    assert all(d.doapi_manager is aclient.manager for d in drops)
+
+def test_wait_actions(aclient, session, monkeypatch):
+    async def nosleep(_):
+        pass
+    monkeypatch.setattr(asyncio, 'sleep', nosleep)
+    session.add('/v2/actions/1',
+                FakeResponse({"action": {"id": 1, "status": "in-progress"}}),
+                FakeResponse({"action": {"id": 1, "status": "completed"}}))
+    session.add('/v2/actions/2',
+                FakeResponse({"action": {"id": 2, "status": "errored"}}))
+    acts = run(collect(aclient.wait_actions([
+        {"id": 1, "status": "in-progress"},
+        {"id": 2, "status": "in-progress"},
+    ], wait_interval=0)))
+    assert [(a.id, a.status) for a in acts] == [(2, "errored"),
+                                                (1, "completed")]
+    assert session.paths().count('/v2/actions/2') == 1
+
+def test_wait_droplets_timeout(aclient, session):
+    session.add('/v2/droplets/1',
+                FakeResponse({"droplet": {"id": 1, "status": "new"}}))
+    with pytest.raises(WaitTimeoutError) as excinfo:
+        run(collect(aclient.wait_droplets([{"id": 1, "status": "new"}],
+                                          status="active", wait_interval=0.01,
+                                          wait_time=0.05)))
+    assert [d.id for d in excinfo.value.in_progress] == [1]
+
+def test_close_keeps_given_session(aclient):
+    sess = aclient.session
+    run(aclient.close())
+    assert not sess.closed
+    assert aclient.session is sess
+
+def test_fetch_all_in_progress_actions(aclient, session):
+    session.listing('/v2/actions', 'actions', history(450, {0, 3, 449}))
+    acts = run(collect(aclient.fetch_all_in_progress_actions()))
+    assert [a.id for a in acts] == [1000, 997, 551]
+    assert session.paths() == ['/v2/actions'] * 3
+    del session.requests[:]
+    acts = run(collect(aclient.fetch_all_in_progress_actions(max_age=600)))
+    assert [a.id for a in acts] == [1000, 997]
+    assert session.paths() == ['/v2/actions']
@@ -0,0 +1,134 @@
+import threading
+import time
+import pytest
+import requests
+from   doapi     import BulkResult, DOAPIError
+from   doapi.cli import droplet as droplet_cli
+from   conftest  import ENDPOINT, FakeResponse
+
+def droplets(client, n):
+    return [client._droplet({"id": i, "status": "active"})
+            for i in range(1, n+1)]
+
+def act_on(drop):
+    if drop.id % 2 == 0:
+        raise DOAPIError(FakeResponse({"id": "unprocessable_entity",
+                                       "message": "Nope"},
+                                      status_code=422))
+    return drop.doapi_manager._action({"id": 100 + drop.id,
+                                       "status": "in-progress"})
+
+def test_bulk_act_results_in_order(client):
+    def slow(drop):
+        # Later droplets finish first
+        time.sleep(0.01 * (6 - drop.id))
+        return act_on(drop)
+    result = client.bulk_act(droplets(client, 5), slow)
+    assert isinstance(result, BulkResult)
+    assert [it.resource.id for it in result] == [1, 2, 3, 4, 5]
+    assert [a.id for a in result.actions] == [101, 103, 105]
+    assert [(d.id, e.response.status_code) for d, e in result.errors] == \
+        [(2, 422), (4, 422)]
+    assert not result.ok
+    with pytest.raises(DOAPIError):
+        result.raise_for_error()
+
+def test_bulk_act_all_ok(client):
+    result = client.bulk_act(droplets(client, 3)[::2], act_on)
+    assert result.ok
+    assert result.errors == []
+    result.raise_for_error()
+
+def test_bulk_act_connection_errors_collected(client):
+    def fail(drop):
+        raise requests.ConnectionError('Boom')
+    result = client.bulk_act(droplets(client, 2), fail)
+    assert [type(e) for _, e in result.errors] == [requests.ConnectionError] * 2
+
+def test_bulk_act_other_errors_propagate(client):
+    def buggy(drop):
+        raise ValueError('bug')
+    with pytest.raises(ValueError):
+        client.bulk_act(droplets(client, 3), buggy)
+
+def test_bulk_act_concurrent(client):
+    # Every call waits for all of the others to start, which can only happen
+    # if they run at the same time.
+    barrier = threading.Barrier(4, timeout=5)
+    def act(drop):
+        barrier.wait()
+        return act_on(drop)
+    result = client.bulk_act(droplets(client, 4), act, workers=4)
+    assert len(result.errors) == 2
+
+def test_bulk_act_one_worker_serial(client):
+    threads = set()
+    def act(drop):
+        threads.add(threading.current_thread())
+        return act_on(drop)
+    client.bulk_act(droplets(client, 4), act, workers=1)
+    assert threads == {threading.current_thread()}
+
+def test_bulk_act_string_action(client, session):
+    for i in (1, 2):
+        session.add('/v2/droplets/{0}/actions'.format(i),
+                    FakeResponse({"action": {"id": 100+i,
+                                             "status": "in-progress"}}),
+                    method='POST')
+    result = client.bulk_act(droplets(client, 2), 'power_on')
+    assert [a.id for a in result.actions] == [101, 102]
+    assert sorted(session.paths()) == ['/v2/droplets/1/actions',
+                                       '/v2/droplets/2/actions']
+
+def test_bulk_result_wait(client, session):
+    session.listing('/v2/actions', 'actions',
+                    [{"id": i, "status": "completed"}
+                     for i in (105, 104, 103, 102, 101)])
+    result = client.bulk_act(droplets(client, 5), act_on)
+    done = list(result.wait(wait_interval=0))
+    assert sorted(a.id for a in done) == [101, 103, 105]
+    assert all(a.status == "completed" for a in done)
+
+@pytest.fixture
+def cli_session(session, monkeypatch):
+    monkeypatch.delenv("DOAPI_CACHE_TTL", raising=False)
+    monkeypatch.setattr(requests, 'Session', lambda: session)
+    for i in (1, 2):
+        session.add('/v2/droplets/{0}'.format(i),
+                    FakeResponse({"droplet": {"id": i, "status": "active"}}))
+    return session
+
+def reboot(*ids):
+    droplet_cli.main(['--api-token', 'hunter2', '--endpoint', ENDPOINT,
+                      'reboot'] + list(ids))
+
+def test_cli_exits_1_on_partial_failure(cli_session, capsys):
+    session = cli_session
+    session.add('/v2/droplets/1/actions',
+                FakeResponse({"action": {"id": 101, "type": "reboot",
+                                         "status": "in-progress"}}),
+                method='POST')
+    session.add('/v2/droplets/2/actions',
+                FakeResponse({"id": "unprocessable_entity",
+                              "message": "Droplet is locked"},
+                             status_code=422),
+                method='POST')
+    with pytest.raises(SystemExit) as excinfo:
+        reboot('1', '2')
+    assert excinfo.value.code == 1
+    assert sorted(p for m, p, _ in session.requests if m == 'POST') == [
+        '/v2/droplets/1/actions',
+        '/v2/droplets/2/actions',
+    ]
+    assert 'could not act on Droplet 2' in capsys.readouterr().err
+
+def test_cli_raises_when_all_fail(cli_session):
+    for i in (1, 2):
+        cli_session.add('/v2/droplets/{0}/actions'.format(i),
+                        FakeResponse({"id": "unprocessable_entity",
+                                      "message": "Droplet is locked"},
+                                     status_code=422),
+                        method='POST')
+    with pytest.raises(DOAPIError) as excinfo:
+        reboot('1', '2')
+    assert excinfo.value.response.status_code == 422
@@ -0,0 +1,152 @@
+import argparse
+import os
+import pytest
+from   doapi import DOAPIError
+from   doapi.cli import _util
+from   doapi.cli._util import Cache, DiskCache, mkclient
+from   conftest import FakeResponse
+
+DROPLETS = [
+    {"id": 1, "name": "web", "status": "active"},
+    {"id": 2, "name": "db", "status": "active"},
+]
+
+@pytest.fixture
+def store(client, tmp_path):
+    return DiskCache(client, 60, directory=str(tmp_path))
+
+def test_disk_cache_round_trip(store):
+    assert store.load("droplet") is None
+    store.save("droplet", DROPLETS)
+    assert [d["id"] for d in store.load("droplet")] == [1, 2]
+
+def test_disk_cache_expires(store, monkeypatch):
+    store.save("droplet", DROPLETS)
+    now = _util.time()
+    monkeypatch.setattr(_util, 'time', lambda: now + 61)
+    assert store.load("droplet") is None
+
+def test_disk_cache_invalidate(store):
+    store.save("droplet", DROPLETS)
+    store.invalidate("droplet")
+    assert store.load("droplet") is None
+    store.invalidate("droplet")
+
+def test_disk_cache_corrupt(store):
+    store.save("droplet", DROPLETS)
+    with open(store.path("droplet"), 'w') as fp:
+        fp.write('{"timestamp": ')
+    assert store.load("droplet") is None
+
+def test_disk_cache_per_account(client, tmp_path):
+    other = type(client)('other-token', endpoint=client.endpoint)
+    store1 = DiskCache(client, 60, directory=str(tmp_path))
+    store2 = DiskCache(other, 60, directory=str(tmp_path))
+    assert store1.directory != store2.directory
+    store1.save("droplet", DROPLETS)
+    assert store2.load("droplet") is None
+
+def test_cache_uses_store(client, session, store):
+    store.save("droplet", DROPLETS)
+    cache = Cache(client, store)
+    assert cache.get_droplet("db", multiple=False).id == 2
+    assert session.requests == []
+
+def test_cache_saves_to_store(client, session, store):
+    session.listing('/v2/droplets', 'droplets', DROPLETS)
+    cache = Cache(client, store)
+    assert [d.id for d in cache.get_droplet("web")] == [1]
+    assert [d["id"] for d in store.load("droplet")] == [1, 2]
+
+def test_cache_refresh_ignores_store(client, session, store):
+    store.save("droplet", [{"id": 3, "name": "web", "status": "off"}])
+    session.listing('/v2/droplets', 'droplets', DROPLETS)
+    cache = Cache(client, store, refresh=True)
+    assert [d.id for d in cache.get_droplet("web")] == [1]
+    assert session.paths() == ['/v2/droplets']
+    assert [d["id"] for d in store.load("droplet")] == [1, 2]
+
+def test_cache_refetches_on_miss(client, session, store):
+    # A droplet created since the list was saved is still found.
+    store.save("droplet", DROPLETS[:1])
+    session.listing('/v2/droplets', 'droplets', DROPLETS)
+    cache = Cache(client, store)
+    assert [d.id for d in cache.get_droplet("db")] == [2]
+    assert session.paths() == ['/v2/droplets']
+
+def test_cache_fresh(client, session, store):
+    store.save("droplet", DROPLETS)
+    session.add('/v2/droplets/1',
+                FakeResponse({"droplet": dict(DROPLETS[0], status="off")}))
+    cache = Cache(client, store)
+    drops = cache.fresh("droplet", cache.get_droplet("web"))
+    assert [d.status for d in drops] == ["off"]
+
+@pytest.mark.parametrize('destructive,refresh', [(False, False),
+                                                 (True, True)])
+def test_mkclient_destructive(tmp_path, monkeypatch, destructive, refresh):
+    monkeypatch.setenv("DOAPI_CACHE_DIR", str(tmp_path))
+    args = argparse.Namespace(api_token='hunter2', api_token_file=None,
+                              cache_ttl=60, refresh_cache=False)
+    _, cache = mkclient(args, destructive=destructive)
+    assert cache.store is not None
+    assert os.path.dirname(cache.store.directory) == str(tmp_path)
+    assert cache.refresh is refresh
+
+def test_mkclient_no_ttl(monkeypatch):
+    monkeypatch.delenv("DOAPI_CACHE_TTL", raising=False)
+    args = argparse.Namespace(api_token='hunter2', api_token_file=None,
+                              cache_ttl=None, refresh_cache=False)
+    _, cache = mkclient(args)
+    assert cache.store is None
+
+FINGERPRINT = '3b:16:bf:e4:8b:00:8b:b8:59:8c:a9:d3:f0:19:45:fa'
+
+def not_found():
+    return FakeResponse({"id": "not_found", "message": "Nope"},
+                        status_code=404)
+
+def test_fetch_direct_id(client, session):
+    session.add('/v2/droplets/2', FakeResponse({"droplet": DROPLETS[1]}))
+    cache = Cache(client)
+    assert cache.get_droplet("2", multiple=False).name == "db"
+    assert session.paths() == ['/v2/droplets/2']
+    # The result is remembered.
+    assert cache.get_droplet("2", multiple=False).name == "db"
+    assert len(session.requests) == 1
+
+def test_fetch_direct_fingerprint(client, session):
+    session.add('/v2/account/keys/' + FINGERPRINT,
+                FakeResponse({"ssh_key": {"id": 5, "name": "me",
+                                          "fingerprint": FINGERPRINT}}))
+    key = Cache(client).get_sshkey(FINGERPRINT, multiple=False)
+    assert key.id == 5
+    assert session.paths() == ['/v2/account/keys/' + FINGERPRINT]
+
+def test_fetch_direct_slug(client, session):
+    session.add('/v2/images/ubuntu-16-04-x64',
+                FakeResponse({"image": {"id": 7, "slug": "ubuntu-16-04-x64"}}))
+    image = Cache(client).get_image("ubuntu-16-04-x64", multiple=False)
+    assert image.id == 7
+    assert session.paths() == ['/v2/images/ubuntu-16-04-x64']
+
+def test_fetch_direct_not_found_falls_back(client, session):
+    # A label that looks like a slug may just be an image's name.
+    session.add('/v2/images/backup', not_found())
+    session.listing('/v2/images', 'images',
+                    [{"id": 8, "slug": None, "name": "backup"}])
+    image = Cache(client).get_image("backup", multiple=False)
+    assert image.id == 8
+    assert session.paths() == ['/v2/images/backup', '/v2/images']
+
+def test_fetch_direct_name_lists(client, session):
+    session.listing('/v2/droplets', 'droplets', DROPLETS)
+    assert Cache(client).fetch_direct("droplet", "web") is None
+    assert session.requests == []
+
+def test_fetch_direct_other_errors_raised(client, session):
+    session.add('/v2/droplets/2',
+                FakeResponse({"id": "server_error", "message": "Oops"},
+                             status_code=500))
+    with pytest.raises(DOAPIError):
+        Cache(client).fetch_direct("droplet", "2")
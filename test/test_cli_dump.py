@@ -0,0 +1,113 @@
+import json
+import threading
+import pytest
+from   six        import StringIO
+from   doapi.cli  import _util
+from   doapi.cli._util import dump
+
+OBJS = [{"id": 1, "name": "web", "tags": []}, {"id": 2, "name": "db\nx"}]
+
+@pytest.fixture(autouse=True)
+def fast_flush(monkeypatch):
+    monkeypatch.setattr(_util, 'FLUSH_INTERVAL', 0.01)
+
+class Failure(Exception):
+    pass
+
+def test_dump_json_iterator():
+    fp = StringIO()
+    dump(iter(OBJS), fp=fp)
+    assert json.loads(fp.getvalue()) == OBJS
+    assert fp.getvalue().endswith('\n]\n')
+    assert '\n    {\n        "id": 1,' in fp.getvalue()
+
+def test_dump_json_empty_iterator():
+    fp = StringIO()
+    dump(iter([]), fp=fp)
+    assert fp.getvalue() == '[]\n'
+
+def test_dump_json_non_iterator():
+    fp = StringIO()
+    dump(OBJS, fp=fp)
+    assert json.loads(fp.getvalue()) == OBJS
+
+def test_dump_json_written_on_error():
+    def objs():
+        yield OBJS[0]
+        raise Failure()
+    fp = StringIO()
+    with pytest.raises(Failure):
+        dump(objs(), fp=fp)
+    assert '"name": "web"' in fp.getvalue()
+
+def test_dump_json_flushes_while_blocked():
+    # The iterator doesn't produce its second element until the first has
+    # been written, which only a timed flush can do.
+    fp = StringIO()
+    written = threading.Event()
+    class Output(object):
+        def write(self, s):
+            fp.write(s)
+        def flush(self):
+            written.set()
+    def objs():
+        yield OBJS[0]
+        assert written.wait(5)
+        yield OBJS[1]
+    dump(objs(), fp=Output())
+    assert json.loads(fp.getvalue()) == OBJS
+
+def test_dump_json_write_errors_raised():
+    class Broken(object):
+        def write(self, s):
+            raise IOError('Broken pipe')
+        def flush(self):
+            pass
+    def objs():
+        while True:
+            yield OBJS[0]
+    with pytest.raises(IOError):
+        dump(objs(), fp=Broken())
+
+def test_dump_ndjson_iterator():
+    fp = StringIO()
+    dump(iter(OBJS), 'ndjson', fp=fp)
+    lines = fp.getvalue().splitlines()
+    assert [json.loads(l) for l in lines] == OBJS
+    assert fp.getvalue().endswith('\n')
+
+def test_dump_ndjson_single_object():
+    fp = StringIO()
+    dump(OBJS[0], 'ndjson', fp=fp)
+    assert fp.getvalue().count('\n') == 1
+    assert json.loads(fp.getvalue()) == OBJS[0]
+
+def test_dump_ndjson_list():
+    fp = StringIO()
+    dump(OBJS, 'ndjson', fp=fp)
+    assert [json.loads(l) for l in fp.getvalue().splitlines()] == OBJS
+
+def test_dump_ndjson_empty():
+    fp = StringIO()
+    dump(iter([]), 'ndjson', fp=fp)
+    assert fp.getvalue() == ''
+
+def test_dump_ndjson_written_on_error():
+    def objs():
+        yield OBJS[0]
+        raise Failure()
+    fp = StringIO()
+    with pytest.raises(Failure):
+        dump(objs(), 'ndjson', fp=fp)
+    assert [json.loads(l) for l in fp.getvalue().splitlines()] == OBJS[:1]
+
+def test_dump_ndjson_consumed_in_caller():
+    # Elements are produced by the calling thread, so the client's
+    # thread-local state (e.g., `last_response`) is seen by the caller.
+    threads = []
+    def objs():
+        for o in OBJS:
+            threads.append(threading.current_thread())
+            yield o
+    dump(objs(), 'ndjson', fp=StringIO())
+    assert threads == [threading.current_thread()] * 2
@@ -0,0 +1,113 @@
+from   datetime     import datetime
+import importlib
+import json
+import pytest
+from   doapi        import _codec
+from   doapi.base   import toISO8601
+
+BACKENDS = [b for b, mod in [('orjson', _codec.orjson),
+                             ('ujson', _codec.ujson),
+                             ('json', json)] if mod is not None]
+
+WHEN = datetime(2016, 5, 4, 3, 2, 1)
+
+@pytest.fixture(autouse=True)
+def restore_backend():
+    backend = _codec.backend
+    yield
+    _codec.use(backend)
+
+def value(client):
+    return {
+        "droplet": client._droplet({"id": 1, "name": "web/1",
+                                    "created_at": "2016-05-04T03:02:01Z"}),
+        "when": WHEN,
+        "ids": iter([1, 2, 3]),
+        "nested": [{"at": WHEN, "more": iter(["a", "b"])}],
+        "text": u"café \"quoted\" </slash>",
+        "float": 2.5,
+        "none": None,
+        "flag": True,
+    }
+
+EXPECTED = {
+    "droplet": {"id": 1, "name": "web/1",
+                "created_at": "2016-05-04T03:02:01Z"},
+    "when": toISO8601(WHEN),
+    "ids": [1, 2, 3],
+    "nested": [{"at": toISO8601(WHEN), "more": ["a", "b"]}],
+    "text": u"café \"quoted\" </slash>",
+    "float": 2.5,
+    "none": None,
+    "flag": True,
+}
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_dumps(client, backend):
+    _codec.use(backend)
+    assert _codec.backend == backend
+    s = _codec.dumps(value(client))
+    assert isinstance(s, bytes)
+    assert json.loads(s.decode('utf-8')) == EXPECTED
+    assert _codec.loads(s) == EXPECTED
+
+def test_dumps_same_across_backends(client):
+    outputs = set()
+    for backend in BACKENDS:
+        _codec.use(backend)
+        outputs.add(_codec.dumps({"when": WHEN, "ids": iter([1, 2])}))
+    assert outputs == {('{"when":"' + toISO8601(WHEN) + '","ids":[1,2]}')
+                       .encode('utf-8')}
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_dumps_unserializable(backend):
+    _codec.use(backend)
+    with pytest.raises(TypeError):
+        _codec.dumps({"obj": object()})
+
+@pytest.mark.skipif(_codec.orjson is None, reason='orjson not installed')
+def test_orjson_non_str_keys(client):
+    _codec.use('orjson')
+    obj = {1: client._droplet({"id": 1, "name": "web"}), "when": WHEN}
+    assert _codec.dumps(obj) == _codec._json_dumps(obj)
+    assert json.loads(_codec.dumps(obj).decode('utf-8')) == \
+        {"1": {"id": 1, "name": "web", "created_at": None},
+         "when": toISO8601(WHEN)}
+
+@pytest.mark.skipif(_codec.ujson is None, reason='ujson not installed')
+def test_ujson_pretty_matches_json(client):
+    assert _codec._ujson_dumps_pretty(value(client)) == \
+        _codec._json_dumps_pretty(value(client))
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_dumps_pretty(client, backend):
+    _codec.use(backend)
+    assert _codec.dumps_pretty(value(client)) == \
+        json.dumps(EXPECTED, sort_keys=True, indent=4, separators=(',', ': '))
+
+def test_use_default():
+    _codec.use()
+    assert _codec.backend == BACKENDS[0]
+
+def test_use_unknown():
+    with pytest.raises(ValueError):
+        _codec.use('simplejson')
+
+@pytest.mark.parametrize('backend', [b for b in ('orjson', 'ujson')
+                                     if b not in BACKENDS])
+def test_use_not_installed(backend):
+    with pytest.raises(ValueError):
+        _codec.use(backend)
+
+@pytest.mark.parametrize('setting,backend', [(b, b) for b in BACKENDS] + [
+    ('', BACKENDS[0]),
+    ('bogus', BACKENDS[0]),
+])
+def test_env_var(monkeypatch, setting, backend):
+    monkeypatch.setenv('DOAPI_JSON', setting)
+    try:
+        importlib.reload(_codec)
+        assert _codec.backend == backend
+    finally:
+        monkeypatch.delenv('DOAPI_JSON')
+        importlib.reload(_codec)
@@ -0,0 +1,121 @@
+import threading
+import time
+import pytest
+from   doapi import DOAPIError
+from   doapi._paging import page_urls
+from   conftest import ENDPOINT, FakeResponse
+
+VALUES = [{"id": i} for i in range(1, 48)]
+
+@pytest.mark.parametrize('kwargs', [
+    {},
+    {"page_workers": 4},
+    {"prefetch": 2},
+    {"page_workers": 4, "prefetch": 2},
+])
+def test_paginate_order(client, session, kwargs):
+    session.listing('/v2/things', 'things', VALUES)
+    objs = list(client.paginate('/v2/things', 'things',
+                                params={"per_page": 10}, **kwargs))
+    assert objs == VALUES
+    assert session.paths().count('/v2/things') == 5
+
+def test_paginate_parallel_pages_requested(client, session):
+    session.listing('/v2/things', 'things', VALUES)
+    list(client.paginate('/v2/things', 'things', params={"per_page": 10},
+                         page_workers=3))
+    pages = sorted(int(q.get("page", 1)) for _,_,q in session.requests)
+    assert pages == [1, 2, 3, 4, 5]
+
+def test_paginate_parallel_is_concurrent(client, session):
+    # Pages 2 and 3 each wait for the other to be requested, which can only
+    # happen if they're fetched at the same time.
+    arrived = {2: threading.Event(), 3: threading.Event()}
+    def handler(method, path, params):
+        page = int(params.get("page", 1))
+        body = {"things": [{"id": page}], "links": {"pages": {}},
+                "meta": {"total": 3}}
+        if page == 1:
+            body["links"]["pages"] = {
+                "next": ENDPOINT + '/v2/things?page=2&per_page=1',
+                "last": ENDPOINT + '/v2/things?page=3&per_page=1',
+            }
+        else:
+            arrived[page].set()
+            assert arrived[5 - page].wait(5)
+        return FakeResponse(body)
+    session.routes[('GET', '/v2/things')] = handler
+    objs = list(client.paginate('/v2/things', 'things',
+                                params={"per_page": 1}, page_workers=2))
+    assert objs == [{"id": 1}, {"id": 2}, {"id": 3}]
+
+def test_paginate_parallel_without_total_falls_back(client, session):
+    # Without a "last" link or a total, the page URLs can't be computed, so
+    # the "next" links are followed instead.
+    def handler(method, path, params):
+        page = int(params.get("page", 1))
+        body = {"things": [{"id": page}], "links": {"pages": {}}}
+        if page < 3:
+            body["links"]["pages"]["next"] = \
+                ENDPOINT + '/v2/things?page={0}'.format(page+1)
+        return FakeResponse(body)
+    session.routes[('GET', '/v2/things')] = handler
+    objs = list(client.paginate('/v2/things', 'things', page_workers=4))
+    assert objs == [{"id": 1}, {"id": 2}, {"id": 3}]
+
+@pytest.mark.parametrize('kwargs', [{"page_workers": 4}, {"prefetch": 2}])
+def test_paginate_error_midway(client, session, kwargs):
+    def handler(method, path, params):
+        page = int(params.get("page", 1))
+        if page == 3:
+            return FakeResponse({"id": "server_error", "message": "Oops"},
+                                status_code=500)
+        body = {"things": [{"id": page}], "meta": {"total": 4},
+                "links": {"pages": {
+                    "next": ENDPOINT + '/v2/things?page={0}'.format(page+1),
+                    "last": ENDPOINT + '/v2/things?page=4',
+                }}}
+        return FakeResponse(body)
+    session.routes[('GET', '/v2/things')] = handler
+    objs = client.paginate('/v2/things', 'things', **kwargs)
+    assert next(objs) == {"id": 1}
+    assert next(objs) == {"id": 2}
+    with pytest.raises(DOAPIError) as excinfo:
+        next(objs)
+    assert excinfo.value.response.status_code == 500
+
+def test_paginate_prefetch_stops_when_closed(client, session):
+    session.listing('/v2/things', 'things', VALUES)
+    objs = client.paginate('/v2/things', 'things', params={"per_page": 1},
+                           prefetch=2)
+    assert next(objs) == {"id": 1}
+    objs.close()
+    time.sleep(0.5)
+    # At most `prefetch` pages (plus one being fetched) get ahead of the
+    # consumer, and nothing more is fetched once it's closed.
+    assert len(session.requests) <= 4
+
+def test_page_urls_from_last_link():
+    page = {"links": {"pages": {
+        "next": ENDPOINT + '/v2/things?page=2&per_page=10',
+        "last": ENDPOINT + '/v2/things?page=4&per_page=10',
+    }}}
+    assert page_urls(page, 10) == [
+        ENDPOINT + '/v2/things?page={0}&per_page=10'.format(n)
+        for n in (2, 3, 4)
+    ]
+
+def test_page_urls_from_total():
+    page = {
+        "links": {"pages": {"next": ENDPOINT + '/v2/things?page=2'}},
+        "meta": {"total": 25},
+    }
+    assert page_urls(page, 10) == [ENDPOINT + '/v2/things?page=2',
+                                   ENDPOINT + '/v2/things?page=3']
+
+def test_page_urls_last_page():
+    assert page_urls({"links": {}, "meta": {"total": 3}}, 10) == []
+
+def test_page_urls_unknown():
+    page = {"links": {"pages": {"next": ENDPOINT + '/v2/things?page=2'}}}
+    assert page_urls(page, 10) is None
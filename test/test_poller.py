@@ -0,0 +1,149 @@
+import time
+import pytest
+from   doapi    import ActionPoller, DOAPIError, PollSchedule, RetryPolicy
+from   conftest import FakeResponse
+
+def action(i, status):
+    return {"id": i, "status": status, "type": "create"}
+
+def serve(session, i, *statuses):
+    session.add('/v2/actions/{0}'.format(i),
+                *[FakeResponse({"action": action(i, s)})
+                  if isinstance(s, str) else s
+                  for s in statuses])
+
+def error(status):
+    return FakeResponse({"id": "error", "message": "Oops"}, status_code=status)
+
+@pytest.fixture
+def poller(client):
+    poller = ActionPoller(client, wait_interval=0.01,
+                          retry=RetryPolicy(max_attempts=3, backoff_base=0.01,
+                                            jitter=0))
+    yield poller
+    poller.close()
+
+def test_done_action_resolves_immediately(client, session, poller):
+    act = client._action(action(1, "completed"))
+    future = poller.submit(act)
+    assert future.done()
+    assert future.result() is act
+    assert session.requests == []
+
+def test_polls_until_done(client, session, poller):
+    serve(session, 1, "in-progress", "in-progress", "completed")
+    future = poller.submit(client._action(action(1, "in-progress")))
+    assert future.result(5).status == "completed"
+    assert len(session.requests) == 3
+
+class Schedule(object):
+    """
+    A poll schedule that delays the first poll so that actions submitted
+    together are polled together
+    """
+
+    def __init__(self):
+        self.first_poll = time.time() + 0.2
+
+    def initial_delay(self, obj):
+        return self.first_poll - time.time()
+
+    def delay(self, obj, waited):
+        return 0.01
+
+    def finished(self, obj):
+        pass
+
+
+def test_several_actions(client, session):
+    client.poll_schedule = Schedule()
+    poller = ActionPoller(client)
+    session.listing('/v2/actions', 'actions',
+                    [action(3, "completed"), action(2, "errored"),
+                     action(1, "completed")])
+    futures = [poller.submit(client._action(action(i, "in-progress")))
+               for i in (1, 2, 3)]
+    assert [f.result(5).status for f in futures] == \
+        ["completed", "errored", "completed"]
+    # All three are refreshed by a single listing.
+    assert session.paths() == ['/v2/actions']
+    poller.close()
+
+def test_transient_error_retried(client, session, poller):
+    serve(session, 1, error(503), "completed")
+    future = poller.submit(client._action(action(1, "in-progress")))
+    assert future.result(5).status == "completed"
+    assert len(session.requests) == 2
+
+def test_transient_error_gives_up(client, session, poller):
+    serve(session, 1, error(503))
+    future = poller.submit(client._action(action(1, "in-progress")))
+    with pytest.raises(DOAPIError) as excinfo:
+        future.result(5)
+    assert excinfo.value.response.status_code == 503
+    assert len(session.requests) == 3
+
+def test_missing_action_fails_alone(client, session):
+    client.poll_schedule = Schedule()
+    poller = ActionPoller(client)
+    # Action 1 isn't in the listing, and fetching it gets a 404.
+    session.listing('/v2/actions', 'actions', [action(2, "completed")])
+    serve(session, 1, error(404))
+    serve(session, 2, "completed")
+    bad = poller.submit(client._action(action(1, "in-progress")))
+    good = poller.submit(client._action(action(2, "in-progress")))
+    with pytest.raises(DOAPIError) as excinfo:
+        bad.result(5)
+    assert excinfo.value.response.status_code == 404
+    assert good.result(5).status == "completed"
+    poller.close()
+
+def test_cancelled_future_not_polled(client, session):
+    serve(session, 1, "in-progress")
+    poller = ActionPoller(client, wait_interval=0.05)
+    future = poller.submit(client._action(action(1, "in-progress")))
+    assert future.cancel()
+    time.sleep(0.2)
+    assert len(session.requests) <= 1
+    poller.close()
+
+def test_close_cancels(client, session):
+    serve(session, 1, "in-progress")
+    poller = ActionPoller(client, wait_interval=0.05)
+    future = poller.submit(client._action(action(1, "in-progress")))
+    poller.close()
+    assert future.cancelled()
+    with pytest.raises(RuntimeError):
+        poller.submit(client._action(action(2, "in-progress")))
+
+def test_schedule_error_fails_only_its_future(client, session):
+    # The schedule can't parse a bogus started_at, but that shouldn't kill
+    # the poller.
+    client.poll_schedule = PollSchedule(min_interval=0.01, max_interval=0.05)
+    session.add('/v2/actions/1',
+                FakeResponse({"action": dict(action(1, "in-progress"),
+                                             started_at="bogus")}))
+    serve(session, 2, "in-progress", "completed")
+    poller = ActionPoller(client)
+    bad = poller.submit(client._action(dict(action(1, "in-progress"),
+                                            started_at="bogus")))
+    with pytest.raises(ValueError):
+        bad.result(5)
+    good = poller.submit(client._action(action(2, "in-progress")))
+    assert good.result(5).status == "completed"
+    poller.close()
+
+def test_round_error_fails_futures_and_recovers(client, session):
+    class BrokenPolicy(RetryPolicy):
+        def should_retry(self, method, attempt, status=None):
+            raise RuntimeError('Oops')
+    serve(session, 1, error(503))
+    serve(session, 2, "completed")
+    poller = ActionPoller(client, wait_interval=0.01, retry=BrokenPolicy())
+    future = poller.submit(client._action(action(1, "in-progress")))
+    with pytest.raises(RuntimeError):
+        future.result(5)
+    poller.retry = None
+    future = poller.submit(client._action(action(2, "in-progress")))
+    assert future.result(5).status == "completed"
+    poller.close()
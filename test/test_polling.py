@@ -0,0 +1,226 @@
+import os
+import sys
+from   time      import gmtime, strftime
+import pytest
+from   doapi     import ActionStats, PollSchedule, WaitTimeoutError
+import doapi.polling
+from   conftest  import FakeClock
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    # `doapi.doapi` is shadowed by the class of the same name
+    module = sys.modules['doapi.doapi']
+    monkeypatch.setattr(module, 'time', clock.time)
+    monkeypatch.setattr(module, 'sleep', clock.sleep)
+    monkeypatch.setattr(doapi.polling, 'time', clock.time)
+    return clock
+
+def action(client, clock, type_, running_for, **fields):
+    started = strftime('%Y-%m-%dT%H:%M:%SZ', gmtime(clock.now - running_for))
+    return client._action(dict(fields, id=1, type=type_, started_at=started,
+                               status="in-progress"))
+
+@pytest.mark.parametrize('running_for,delay', [
+    (0, 20),      # Half of the expected 40 seconds
+    (30, 5),      # Half of the remaining 10 seconds
+    (39, 1),      # Never less than min_interval
+    (80, 10),     # A quarter of the 40-second overrun
+    (1000, 60),   # Never more than max_interval
+])
+def test_delay_action(client, clock, running_for, delay):
+    schedule = PollSchedule()
+    act = action(client, clock, "create", running_for)
+    assert schedule.delay(act, 0) == pytest.approx(delay)
+
+def test_delay_unknown_type(client, clock):
+    act = action(client, clock, "frobnicate", 20)
+    assert PollSchedule().delay(act, 0) == pytest.approx(5)
+
+def test_delay_droplet(client):
+    drop = client._droplet({"id": 1, "status": "new"})
+    schedule = PollSchedule(min_interval=2, backoff=0.5)
+    assert schedule.delay(drop, 0) == 2
+    assert schedule.delay(drop, 10) == 5
+
+def test_delay_custom_expected(client, clock):
+    act = action(client, clock, "create", 0)
+    assert PollSchedule(expected={"create": 10}).delay(act, 0) == 5
+
+def test_initial_delay_without_stats(client, clock):
+    assert PollSchedule().initial_delay(action(client, clock, "create", 0)) \
+        == 0
+
+
+class Thing(object):
+    """ An object being waited on, which is done after ``polls`` polls """
+
+    def __init__(self, name, polls, interval=1):
+        self.name = name
+        self.polls = polls
+        self.interval = interval
+        self.status = "done" if polls <= 0 else "pending"
+
+    def fetch(self):
+        return Thing(self.name, self.polls - 1, self.interval)
+
+
+class Refresh(object):
+    """ A ``refresh`` strategy recording when each object is polled """
+
+    def __init__(self, clock, sweep_size=None):
+        self.clock = clock
+        self.sweep_size = sweep_size
+        self.rounds = []
+
+    def __call__(self, things):
+        things = list(things)
+        if things:
+                self.rounds.append((self.clock.now - 1000000000.0,
+                                [t.name for t in things]))
+        return [t.fetch() for t in things]
+
+    def would_sweep(self, things):
+        return self.sweep_size is not None and len(things) >= self.sweep_size
+
+
+class Schedule(object):
+    """ A poll schedule that polls each `Thing` every ``interval`` seconds """
+
+    def initial_delay(self, obj):
+        return 0
+
+    def delay(self, obj, waited):
+        return obj.interval
+
+    def finished(self, obj):
+        pass
+
+
+def test_wait_polls_at_deadline(client, clock):
+    refresh = Refresh(clock)
+    with pytest.raises(WaitTimeoutError) as excinfo:
+        list(client._wait([Thing("a", 10)], "status", "done",
+                          wait_interval=10, wait_time=25, refresh=refresh))
+    assert [t for t,_ in refresh.rounds] == [0, 10, 20, 25]
+    assert [t.name for t in excinfo.value.in_progress] == ["a"]
+
+def test_wait_finishes_at_deadline(client, clock):
+    refresh = Refresh(clock)
+    done = list(client._wait([Thing("a", 4)], "status", "done",
+                             wait_interval=10, wait_time=25, refresh=refresh))
+    assert [t.name for t in done] == ["a"]
+    assert [t for t,_ in refresh.rounds] == [0, 10, 20, 25]
+
+def test_wait_first_poll_capped_at_deadline(client, clock):
+    class SlowStart(Schedule):
+        def initial_delay(self, obj):
+            return 100
+    client.poll_schedule = SlowStart()
+    refresh = Refresh(clock)
+    with pytest.raises(WaitTimeoutError):
+        list(client._wait([Thing("a", 10)], "status", "done", wait_time=30,
+                          refresh=refresh))
+    assert [t for t,_ in refresh.rounds] == [30]
+
+def test_wait_sweeps_everything(client, clock):
+    client.poll_schedule = Schedule()
+    refresh = Refresh(clock, sweep_size=2)
+    things = [Thing("a", 3), Thing("b", 3), Thing("c", 2, interval=5)]
+    list(client._wait(things, "status", "done", refresh=refresh))
+    # "c" is due much later than "a" and "b", but a listing refreshes it for
+    # free whenever they're polled.
+    assert refresh.rounds == [(0, ["a", "b", "c"]), (1, ["a", "b", "c"]),
+                              (2, ["a", "b"])]
+
+def test_wait_no_sweep_polls_due_only(client, clock):
+    client.poll_schedule = Schedule()
+    refresh = Refresh(clock, sweep_size=3)
+    things = [Thing("a", 2), Thing("b", 2), Thing("c", 2, interval=5)]
+    list(client._wait(things, "status", "done", refresh=refresh))
+    assert refresh.rounds == [(0, ["a", "b", "c"]), (1, ["a", "b"]),
+                              (5, ["c"])]
+
+
+def test_stats_median():
+    stats = ActionStats(min_samples=3)
+    stats.add("create", "nyc3", 30)
+    stats.add("create", "nyc3", 50)
+    assert stats.median("create", "nyc3") is None
+    stats.add("create", "nyc3", 40)
+    assert stats.median("create", "nyc3") == 40
+    assert stats.median("reboot", "nyc3") is None
+
+def test_stats_median_region_fallback():
+    stats = ActionStats(min_samples=3)
+    stats.add("create", "nyc3", 30)
+    stats.add("create", "sfo1", 50)
+    stats.add("create", "sfo1", 60)
+    assert stats.median("create", "nyc3") == 50
+    assert stats.median("create", "ams2") == 50
+
+def test_stats_max_samples():
+    stats = ActionStats(max_samples=3, min_samples=1)
+    for d in (100, 100, 1, 2, 3):
+        stats.add("create", None, d)
+    assert stats.median("create") == 2
+
+def test_stats_record(client):
+    stats = ActionStats(min_samples=1)
+    act = client._action({"id": 1, "type": "create", "status": "completed",
+                          "region_slug": "nyc3",
+                          "started_at": "2016-01-01T00:00:00Z",
+                          "completed_at": "2016-01-01T00:00:42Z"})
+    stats.record(act)
+    stats.record(client._action(dict(act.fields, status="errored")))
+    assert stats.median("create", "nyc3") == 42
+
+def test_stats_initial_delay(client, clock):
+    stats = ActionStats(min_samples=1)
+    stats.add("create", None, 50)
+    schedule = PollSchedule(stats=stats)
+    act = action(client, clock, "create", 20)
+    assert schedule.initial_delay(act) == pytest.approx(30)
+    assert schedule.expected_duration(act) == 50
+
+def test_stats_save_load(tmp_path):
+    path = str(tmp_path / 'stats.json')
+    stats = ActionStats(path, min_samples=1)
+    stats.add("create", "nyc3", 40)
+    stats.add("snapshot", None, 200)
+    stats.save()
+    stats2 = ActionStats(path, min_samples=1)
+    assert stats2.median("create", "nyc3") == 40
+    assert stats2.median("snapshot") == 200
+    assert os.listdir(str(tmp_path)) == ['stats.json']
+
+@pytest.mark.parametrize('content', [
+    b'{"create": {"nyc3": [40',
+    b'[1, 2, 3]',
+    b'{"create": 5}',
+    b'{"create": {"nyc3": ["fast"]}}',
+])
+def test_stats_corrupt_file(tmp_path, content):
+    path = tmp_path / 'stats.json'
+    path.write_bytes(content)
+    stats = ActionStats(str(path), min_samples=1)
+    assert stats.median("create", "nyc3") is None
+    with pytest.raises(ValueError):
+        stats.load()
+    stats.add("create", "nyc3", 40)
+    stats.save()
+    assert ActionStats(str(path), min_samples=1).median("create", "nyc3") \
+        == 40
+
+def test_stats_save_failure_cleans_up(tmp_path, monkeypatch):
+    path = tmp_path / 'stats.json'
+    path.write_bytes(b'{"create": {"nyc3": [40]}}')
+    stats = ActionStats(str(path), min_samples=1)
+    stats.add("create", "nyc3", 50)
+    def fail(*args):
+        raise OSError('No space left on device')
+    monkeypatch.setattr(os, 'rename', fail)
+    with pytest.raises(OSError):
+        stats.save()
+    assert os.listdir(str(tmp_path)) == ['stats.json']
+    assert path.read_bytes() == b'{"create": {"nyc3": [40]}}'
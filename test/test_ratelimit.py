@@ -0,0 +1,89 @@
+import pytest
+from   doapi import DOAPIError, RateLimiter
+import doapi.ratelimit
+from   conftest import FakeClock, FakeResponse
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(doapi.ratelimit, 'time', clock)
+    return clock
+
+def headers(clock, remaining, reset_in, limit=5000):
+    return {
+        "RateLimit-Limit": str(limit),
+        "RateLimit-Remaining": str(remaining),
+        "RateLimit-Reset": str(int(clock.now + reset_in)),
+    }
+
+def test_unknown_limit_unrestricted(clock):
+    limiter = RateLimiter(burst=2)
+    assert [limiter.reserve_slot() for _ in range(10)] == [0] * 10
+    assert limiter.budget["rate"] is None
+
+def test_paces_after_burst(clock):
+    limiter = RateLimiter(burst=3)
+    limiter.update(headers(clock, 100, 100))
+    assert limiter.budget["rate"] == pytest.approx(1)
+    delays = [limiter.reserve_slot() for _ in range(5)]
+    assert delays[:3] == [0, 0, 0]
+    # Each request uses up some of the remaining budget, so the rate drops
+    # slightly below one request per second.
+    assert delays[3:] == [pytest.approx(1, rel=0.1), pytest.approx(2, rel=0.1)]
+
+def test_refills_over_time(clock):
+    limiter = RateLimiter(burst=2)
+    limiter.update(headers(clock, 100, 100))
+    limiter.reserve_slot()
+    limiter.reserve_slot()
+    clock.sleep(3)
+    assert limiter.reserve_slot() == 0
+    assert limiter.reserve_slot() == 0
+    assert limiter.reserve_slot() > 0
+
+def test_reserve_left_unused(clock):
+    limiter = RateLimiter(burst=1, reserve=50)
+    limiter.update(headers(clock, 150, 100))
+    assert limiter.budget["rate"] == pytest.approx(1)
+    limiter.update(headers(clock, 50, 100))
+    assert limiter.budget["rate"] == 0
+
+def test_exhausted_waits_for_reset(clock):
+    limiter = RateLimiter()
+    limiter.update(headers(clock, 0, 30), exhausted=True)
+    assert limiter.remaining == 0
+    assert limiter.reserve_slot() == pytest.approx(30, abs=1)
+
+def test_exhausted_without_reset_waits_a_minute(clock):
+    limiter = RateLimiter()
+    limiter.update({}, exhausted=True)
+    assert limiter.reserve_slot() == pytest.approx(60)
+
+def test_malformed_headers_ignored(clock):
+    limiter = RateLimiter()
+    limiter.update({"RateLimit-Remaining": "lots", "RateLimit-Reset": None})
+    assert limiter.budget == {"limit": None, "remaining": None, "reset": None,
+                              "rate": None}
+
+def test_client_waits_out_429(client, session, clock):
+    client.rate_limiter = RateLimiter()
+    session.add(
+        '/v2/account',
+        FakeResponse({"id": "too_many_requests", "message": "Slow down"},
+                     status_code=429, headers=headers(clock, 0, 20)),
+        FakeResponse({"account": {"uuid": "abc"}},
+                     headers=headers(clock, 4999, 3600)),
+    )
+    assert client.fetch_account().uuid == "abc"
+    assert session.paths() == ['/v2/account', '/v2/account']
+    assert clock.sleeps == [pytest.approx(20, abs=1)]
+
+def test_client_gives_up_on_429(client, session, clock):
+    client.rate_limiter = RateLimiter()
+    session.add('/v2/account',
+                FakeResponse({"id": "too_many_requests", "message": "Nope"},
+                             status_code=429))
+    with pytest.raises(DOAPIError) as excinfo:
+        client.fetch_account()
+    assert excinfo.value.response.status_code == 429
+    assert len(session.requests) == client.MAX_RATE_LIMITED_ATTEMPTS
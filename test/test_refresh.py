@@ -0,0 +1,101 @@
+from   doapi._refresh import ActionSweep, DropletSweep
+from   conftest import FakeResponse
+
+def droplets(client, ids, **fields):
+    return [client._droplet(dict(fields, id=i, status="new")) for i in ids]
+
+def actions(client, ids):
+    return [client._action({"id": i, "status": "in-progress"}) for i in ids]
+
+def serve_each(session, kind, ids, status):
+    for i in ids:
+        session.add('/v2/{0}s/{1}'.format(kind, i),
+                    FakeResponse({kind: {"id": i, "status": status}}))
+
+def test_droplet_sweep_few_fetches_each(client, session):
+    serve_each(session, 'droplet', [1, 2], 'active')
+    sweep = DropletSweep(client, droplets(client, [1, 2]))
+    assert not sweep.would_sweep(droplets(client, [1, 2]))
+    states = list(sweep(droplets(client, [1, 2])))
+    assert [(d.id, d.status) for d in states] == [(1, 'active'), (2, 'active')]
+    assert session.paths() == ['/v2/droplets/1', '/v2/droplets/2']
+
+def test_droplet_sweep_lists(client, session):
+    session.listing('/v2/droplets', 'droplets',
+                    [{"id": i, "status": "active"} for i in range(1, 11)])
+    drops = droplets(client, [2, 4, 6, 8])
+    sweep = DropletSweep(client, drops)
+    states = list(sweep(drops))
+    assert [(d.id, d.status) for d in states] == \
+        [(i, 'active') for i in (2, 4, 6, 8)]
+    # One request to count the droplets and one for the listing itself
+    assert session.paths() == ['/v2/droplets', '/v2/droplets']
+    assert sweep.pages == 1
+
+def test_droplet_sweep_missing_fetched(client, session):
+    session.listing('/v2/droplets', 'droplets',
+                    [{"id": i, "status": "active"} for i in range(1, 11)])
+    serve_each(session, 'droplet', [99], 'off')
+    drops = droplets(client, [2, 4, 99])
+    states = list(DropletSweep(client, drops)(drops))
+    assert [(d.id, d.status) for d in states] == \
+        [(2, 'active'), (4, 'active'), (99, 'off')]
+    assert session.paths()[-1] == '/v2/droplets/99'
+
+def test_droplet_sweep_shared_tag(client, session):
+    session.listing('/v2/droplets', 'droplets', [])
+    drops = droplets(client, [1, 2, 3], tags=["web", "prod"])
+    drops[0]["tags"] = ["web"]
+    sweep = DropletSweep(client, drops)
+    assert sweep.params["tag_name"] == "web"
+    sweep.would_sweep(drops)
+    assert session.requests[0][2]["tag_name"] == "web"
+
+def test_action_sweep_one_action_fetched(client, session):
+    serve_each(session, 'action', [5], 'completed')
+    sweep = ActionSweep(client)
+    assert not sweep.would_sweep(actions(client, [5]))
+    states = list(sweep(actions(client, [5])))
+    assert [a.status for a in states] == ['completed']
+    assert session.paths() == ['/v2/actions/5']
+
+def test_action_sweep_single_page(client, session):
+    session.listing('/v2/actions', 'actions',
+                    [{"id": i, "status": "completed"}
+                     for i in range(500, 250, -1)])
+    states = list(ActionSweep(client)(actions(client, [499, 450, 420])))
+    assert [(a.id, a.status) for a in states] == \
+        [(499, 'completed'), (450, 'completed'), (420, 'completed')]
+    assert session.paths() == ['/v2/actions']
+
+def test_action_sweep_gives_up(client, session):
+    # The actions are near the end of a long listing, so scanning for them
+    # would cost more than fetching them individually.
+    session.listing('/v2/actions', 'actions',
+                    [{"id": i, "status": "completed"}
+                     for i in range(1000, 0, -1)])
+    serve_each(session, 'action', [1, 2, 3], 'completed')
+    sweep = ActionSweep(client)
+    acts = actions(client, [1, 2, 3])
+    assert sweep.would_sweep(acts)
+    states = list(sweep(acts))
+    assert [a.id for a in states] == [1, 2, 3]
+    assert session.paths() == ['/v2/actions', '/v2/actions/1',
+                               '/v2/actions/2', '/v2/actions/3']
+    assert sweep.fell_short
+    assert sweep.reached == 801
+    # Later rounds don't scan for actions that far back...
+    assert not sweep.would_sweep(acts)
+    # ...but still scan for newer ones.
+    assert sweep.would_sweep(actions(client, [900, 950]))
+
+def test_action_sweep_scans_multiple_pages(client, session):
+    session.listing('/v2/actions', 'actions',
+                    [{"id": i, "status": "completed"}
+                     for i in range(1000, 0, -1)])
+    ids = [990, 980, 700, 650, 600, 550]
+    sweep = ActionSweep(client)
+    states = list(sweep(actions(client, ids)))
+    assert [a.id for a in states] == ids
+    assert session.paths() == ['/v2/actions'] * 3
+    assert not sweep.fell_short
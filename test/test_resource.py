@@ -0,0 +1,148 @@
+from   datetime   import datetime
+import pickle
+import pytest
+from   doapi      import Droplet, Image, Region, Size
+from   doapi.base import _Field
+
+STATE = {
+    "id": 3164494,
+    "name": "example.com",
+    "created_at": "2014-11-14T16:36:31Z",
+    "image": {"id": 6918990, "slug": "ubuntu-14-04-x64"},
+    "region": {"slug": "nyc3", "name": "New York 3"},
+    "size": {"slug": "512mb", "memory": 512},
+    "networks": {"v4": [], "v6": []},
+}
+
+def test_fields_raw_until_accessed(client):
+    drop = client._droplet(STATE)
+    assert drop.fields["created_at"] == "2014-11-14T16:36:31Z"
+    assert isinstance(drop.fields["image"], dict)
+    assert not isinstance(drop.fields["image"], Image)
+
+def test_attribute_converts(client):
+    drop = client._droplet(STATE)
+    assert isinstance(drop.created_at, datetime)
+    assert drop.created_at.year == 2014
+    # The converted value is stored back so that it's only converted once.
+    assert drop.fields["created_at"] is drop.created_at
+    assert isinstance(drop.image, Image)
+    assert drop.image.doapi_manager is client
+    assert drop.fields["image"] is drop.image
+
+def test_item_converts(client):
+    drop = client._droplet(STATE)
+    assert isinstance(drop["created_at"], datetime)
+    assert isinstance(drop.fields["created_at"], datetime)
+    assert isinstance(drop["region"], Region)
+
+def test_unconverted_fields_untouched(client):
+    drop = client._droplet(STATE)
+    drop.created_at  # pylint: disable=pointless-statement
+    assert isinstance(drop.fields["image"], dict)
+    assert not isinstance(drop.fields["image"], Image)
+
+def test_converted_values_kept(client):
+    when = datetime(2016, 1, 1)
+    drop = client._droplet(dict(STATE, created_at=when))
+    assert drop.created_at is when
+
+def test_none_fields(client):
+    drop = client._droplet(dict(STATE, image=None, created_at=None))
+    assert drop.image is None
+    assert drop.created_at is None
+
+def test_iteration_converts(client):
+    drop = client._droplet(STATE)
+    values = dict(drop.items())
+    assert isinstance(values["created_at"], datetime)
+    assert isinstance(values["size"], Size)
+
+def test_equality_ignores_conversion(client):
+    drop1 = client._droplet(STATE)
+    drop2 = client._droplet(STATE)
+    drop1.created_at, drop1.image  # pylint: disable=pointless-statement
+    assert drop1 == drop2
+
+def test_for_json_after_conversion(client):
+    drop = client._droplet(STATE)
+    drop.created_at, drop.image  # pylint: disable=pointless-statement
+    data = drop.for_json()
+    assert data["created_at"] == STATE["created_at"]
+    assert data["image"]["slug"] == STATE["image"]["slug"]
+    assert data["region"] == STATE["region"]
+
+def test_documented_fields_are_descriptors(client):
+    assert isinstance(vars(Droplet)["memory"], _Field)
+    assert isinstance(vars(Droplet)["created_at"], _Field)
+    # Properties aren't shadowed by fields of the same name.
+    assert not isinstance(vars(Droplet)["url"], _Field)
+    drop = client._droplet(dict(STATE, memory=512, extra=42))
+    assert drop.memory == 512
+    assert drop.extra == 42
+    drop.memory = 1024
+    assert drop.fields["memory"] == 1024
+    del drop.memory
+    assert not hasattr(drop, "memory")
+    with pytest.raises(AttributeError) as excinfo:
+        drop.memory  # pylint: disable=pointless-statement
+    assert "'Droplet' object has no attribute 'memory'" in str(excinfo.value)
+
+def test_pickle(client):
+    drop = Droplet(STATE)
+    drop.image  # pylint: disable=pointless-statement
+    copy = pickle.loads(pickle.dumps(drop))
+    assert copy == drop
+    assert copy.created_at == drop.created_at
+
+def region(**fields):
+    # Returns a new region `dict` with its own lists, as decoded from an API
+    # response
+    return dict({"slug": "nyc3", "name": "New York 3",
+                 "sizes": ["512mb", "1gb", "2gb"], "features": ["backups"]},
+                **fields)
+
+def test_nested_lists_shared(client):
+    drop1 = client._droplet(dict(STATE, region=region()))
+    drop2 = client._droplet(dict(STATE, id=1, region=region()))
+    assert drop1.fields["region"] is not drop2.fields["region"]
+    assert drop1.fields["region"]["sizes"] is drop2.fields["region"]["sizes"]
+    assert drop1.region is not drop2.region
+    assert drop1.region.sizes is drop2.region.sizes
+    assert drop1.region.features is drop2.region.features
+    act = client._action({"id": 1, "region": region()})
+    assert act.region.sizes is drop1.region.sizes
+
+def test_shared_regions_modified_separately(client):
+    drop1 = client._droplet(dict(STATE, region=region()))
+    drop2 = client._droplet(dict(STATE, id=1, region=region()))
+    drop1.region.name = "Elsewhere"
+    drop1.region.sizes = ["1gb"]
+    assert drop2.region.name == "New York 3"
+    assert drop2.region.sizes == ["512mb", "1gb", "2gb"]
+
+def test_given_dicts_not_shared(client):
+    state = dict(STATE, region=region())
+    drop = client._droplet(state)
+    assert drop.fields["region"] is not state["region"]
+    assert drop.fields["region"]["sizes"] is not state["region"]["sizes"]
+    state["region"]["sizes"].append("4gb")
+    assert drop.region.sizes == ["512mb", "1gb", "2gb"]
+
+def test_different_lists_not_shared(client):
+    drop1 = client._droplet(dict(STATE, region=region()))
+    drop2 = client._droplet(dict(STATE, region=region(sizes=["1gb"])))
+    assert drop1.region.sizes is not drop2.region.sizes
+    assert drop2.region.sizes == ["1gb"]
+    assert drop1.region.features is drop2.region.features
+
+def test_no_sharing_without_manager():
+    drop1 = Droplet(dict(STATE, region=region()))
+    drop2 = Droplet(dict(STATE, region=region()))
+    assert drop1.region.sizes is not drop2.region.sizes
+
+def test_interning_bounded(client):
+    client.MAX_INTERNED = 10
+    for i in range(25):
+        client._intern({"slug": "r{0}".format(i), "sizes": [str(i)]})
+    assert len(client._interned) == 10
@@ -0,0 +1,101 @@
+import sys
+import pytest
+import requests
+from   doapi import DOAPIError, RetryPolicy
+import doapi.retry
+from   conftest import FakeClock, FakeResponse
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(doapi.retry, 'time', clock)
+    # `doapi.doapi` is shadowed by the class of the same name
+    monkeypatch.setattr(sys.modules['doapi.doapi'], 'sleep', clock.sleep)
+    return clock
+
+def error(status, headers=None):
+    return FakeResponse({"id": "error", "message": "Oops"}, status_code=status,
+                        headers=headers)
+
+@pytest.mark.parametrize('method,attempt,status,expected', [
+    ('GET', 1, None, True),
+    ('GET', 1, 503, True),
+    ('GET', 1, 429, True),
+    ('GET', 1, 404, False),
+    ('GET', 1, 501, False),
+    ('POST', 1, None, False),
+    ('POST', 1, 503, False),
+    ('POST', 1, 429, True),
+    ('GET', 5, 503, False),
+    ('GET', 5, 429, False),
+])
+def test_should_retry(method, attempt, status, expected):
+    assert RetryPolicy().should_retry(method, attempt, status) is expected
+
+def test_delay_backs_off():
+    policy = RetryPolicy(backoff_base=1, backoff_max=5, jitter=0)
+    assert [policy.delay(n) for n in range(1, 6)] == [1, 2, 4, 5, 5]
+
+def test_delay_jitter():
+    policy = RetryPolicy(backoff_base=8, jitter=0.5)
+    for _ in range(100):
+        assert 4 <= policy.delay(1) <= 8
+
+def test_delay_retry_after_seconds():
+    policy = RetryPolicy(backoff_base=1, jitter=0)
+    assert policy.delay(1, 503, {"Retry-After": "30"}) == 30
+    # A shorter Retry-After doesn't shorten the backoff.
+    assert policy.delay(3, 503, {"Retry-After": "1"}) == 4
+
+def test_delay_retry_after_date(clock):
+    clock.now = 1445412480.0  # Wed, 21 Oct 2015 07:28:00 GMT
+    policy = RetryPolicy(backoff_base=1, jitter=0)
+    when = {"Retry-After": "Wed, 21 Oct 2015 07:29:00 GMT"}
+    assert policy.delay(1, 503, when) == 60
+
+def test_delay_429_until_reset(clock):
+    policy = RetryPolicy(backoff_base=1, jitter=0)
+    reset = {"RateLimit-Reset": str(int(clock.now) + 45)}
+    assert policy.delay(1, 429, reset) == 45
+    assert policy.delay(1, 503, reset) == 1
+
+def test_delay_ignores_headers_when_told():
+    policy = RetryPolicy(backoff_base=1, jitter=0, honor_retry_after=False)
+    assert policy.delay(1, 503, {"Retry-After": "30"}) == 1
+
+def test_client_retries_server_errors(client, session, clock):
+    client.retry = RetryPolicy(backoff_base=1, jitter=0)
+    session.add('/v2/account', error(502), error(503),
+                FakeResponse({"account": {"uuid": "abc"}}))
+    assert client.fetch_account().uuid == "abc"
+    assert len(session.requests) == 3
+    assert clock.sleeps == [1, 2]
+
+def test_client_retries_connection_errors(client, session, clock):
+    client.retry = RetryPolicy(backoff_base=1, jitter=0)
+    session.add('/v2/account', requests.ConnectionError('Boom'),
+                FakeResponse({"account": {"uuid": "abc"}}))
+    assert client.fetch_account().uuid == "abc"
+    assert clock.sleeps == [1]
+
+def test_client_gives_up(client, session, clock):
+    client.retry = RetryPolicy(max_attempts=3, backoff_base=1, jitter=0)
+    session.add('/v2/account', error(500))
+    with pytest.raises(DOAPIError) as excinfo:
+        client.fetch_account()
+    assert excinfo.value.response.status_code == 500
+    assert len(session.requests) == 3
+
+def test_client_doesnt_retry_post(client, session, clock):
+    client.retry = RetryPolicy()
+    session.add('/v2/droplets', error(503), method='POST')
+    with pytest.raises(DOAPIError):
+        client.request('/v2/droplets', method='POST', data={"name": "x"})
+    assert len(session.requests) == 1
+    assert clock.sleeps == []
+
+def test_client_without_policy_doesnt_retry(client, session, clock):
+    session.add('/v2/account', error(503))
+    with pytest.raises(DOAPIError):
+        client.fetch_account()
+    assert len(session.requests) == 1
@@ -0,0 +1,37 @@
+from   datetime  import datetime, timedelta
+import pyrfc3339
+import pytest
+from   doapi.base import fromISO8601, toISO8601
+
+@pytest.mark.parametrize('stamp', [
+    '2014-11-14T16:36:31Z',
+    '2000-01-01T00:00:00Z',
+    '2016-02-29T23:59:59Z',
+])
+def test_fast_path_matches_pyrfc3339(stamp):
+    dt = fromISO8601(stamp)
+    expected = pyrfc3339.parse(stamp)
+    assert dt == expected
+    assert dt.utcoffset() == timedelta(0)
+    assert dt.tzinfo == expected.tzinfo
+    assert toISO8601(dt) == stamp
+
+@pytest.mark.parametrize('stamp', [
+    '2014-11-14T16:36:31.123456Z',
+    '2014-11-14T11:36:31-05:00',
+    '2014-11-14T22:06:31+05:30',
+    '2014-11-14t16:36:31z',
+])
+def test_other_forms_fall_back(stamp):
+    dt = fromISO8601(stamp)
+    assert dt == pyrfc3339.parse(stamp)
+    assert dt.utcoffset() == pyrfc3339.parse(stamp).utcoffset()
+
+def test_invalid_date_rejected():
+    with pytest.raises(ValueError):
+        fromISO8601('2014-02-30T16:36:31Z')
+
+def test_none_and_datetimes_pass_through():
+    assert fromISO8601(None) is None
+    dt = datetime(2014, 11, 14, 16, 36, 31)
+    assert fromISO8601(dt) is dt